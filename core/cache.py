@@ -0,0 +1,18 @@
+"""
+Cache key function for settings.CACHES.
+
+The file cache in var/cache outlives the database it caches for: the test
+runner, a second checkout or a fresh DB_NAME all point at the same folder,
+and keys such as qbank:scope:{generation}:{user id} would be read back for
+other rows with the same ids. The active database name is folded into
+every key so each database only ever sees its own entries.
+"""
+import hashlib
+
+from django.db import connection
+
+
+def database_key(key, key_prefix, version):
+    name = str(connection.settings_dict.get("NAME") or "")
+    namespace = hashlib.md5(name.encode()).hexdigest()[:8]
+    return f"{key_prefix}:{namespace}:{version}:{key}"
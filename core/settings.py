@@ -127,6 +127,23 @@ LOCALE_PATHS = [
 
 STATIC_URL = 'static/'
 
+MEDIA_URL = 'media/'
+MEDIA_ROOT = Path(os.getenv("MEDIA_ROOT", BASE_DIR / "media"))
+
+# Exam export artifacts (Moodle XML, Aiken, ...) are written below this folder
+QBANK_EXPORT_DIR = Path(os.getenv("QBANK_EXPORT_DIR", BASE_DIR / "var" / "exports"))
+
+# Shared between worker processes (per-user access scopes, ...); keys are
+# namespaced by the database name so the test database never reads entries
+# written for the development one
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("CACHE_DIR", str(BASE_DIR / "var" / "cache")),
+        "KEY_FUNCTION": "core.cache.database_key",
+    }
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -9,6 +9,7 @@ from .models.committee import Committee
 from .models.fct_profile import FacultyProfile
 from .models.course_type import CourseType
 from .models.course_event import CourseEvent
+from .models.calendar_token import CalendarFeedToken
 
 admin.site.register(AcadYear)
 admin.site.register(Program)
@@ -55,3 +56,9 @@ class CourseEventAdmin(ImportExportModelAdmin):
     search_fields = ('course__name', 'faculty__user__username')
     ordering = ('-event_date',)
 
+
+@admin.register(CalendarFeedToken)
+class CalendarFeedTokenAdmin(admin.ModelAdmin):
+    list_display = ("user", "created_at")
+    search_fields = ("user__username", "user__first_name", "user__last_name")
+    readonly_fields = ("token", "created_at")
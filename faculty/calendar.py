@@ -0,0 +1,126 @@
+from __future__ import annotations
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, Iterable, Iterator
+
+from django.db.models import Count, Max, Sum
+from django.utils.http import quote_etag
+
+from .models import CourseEvent
+
+# Bump when the ICS output changes, so clients refetch once.
+ICS_FEED_VERSION = 1
+
+ICS_CHUNK_SIZE = 500
+
+ICS_FIELDS = (
+    "id", "start_date", "end_date", "updated_at",
+    "course__name", "course__committee__name",
+    "faculty__user__first_name", "faculty__user__last_name",
+)
+
+
+def committee_feed_queryset(committee):
+    return CourseEvent.objects.filter(course__committee=committee)
+
+
+def faculty_feed_queryset(profile):
+    """Events the lecturer teaches (CourseEvent.faculty)."""
+    return CourseEvent.objects.filter(faculty=profile)
+
+
+@dataclass(frozen=True)
+class FeedStamp:
+    # ETag only: a deleted event moves no timestamp, so Last-Modified would
+    # keep answering If-Modified-Since with 304.
+    digest: str
+
+    @property
+    def etag(self) -> str:
+        return quote_etag(self.digest)
+
+
+def feed_stamp(qs, key: str) -> FeedStamp:
+    """
+    One aggregate decides whether a feed changed: an added or deleted event
+    moves count / id sum, an edited event moves updated_at, and a renamed
+    course moves course__updated_at.
+    """
+    agg = qs.order_by().aggregate(
+        n=Count("id"),
+        id_sum=Sum("id"),
+        last_event=Max("updated_at"),
+        last_course=Max("course__updated_at"),
+    )
+    raw = "|".join(str(x) for x in (
+        ICS_FEED_VERSION, key, agg["n"], agg["id_sum"], agg["last_event"], agg["last_course"],
+    ))
+    return FeedStamp(digest=hashlib.sha256(raw.encode()).hexdigest()[:32])
+
+
+def feed_rows(qs) -> Iterator[Dict]:
+    return (qs.order_by("start_date", "id")
+            .values(*ICS_FIELDS)
+            .iterator(chunk_size=ICS_CHUNK_SIZE))
+
+
+def _ics_escape(s: str) -> str:
+    return (s or "").replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _ics_time(dt: datetime) -> str:
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(dt_timezone.utc)
+    return dt.strftime("%Y%m%dT%H%M%SZ")
+
+
+def _fold(line: str) -> str:
+    """RFC 5545 line folding: at most 75 octets per line, continuation starts with a space."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts, limit = [], 75
+    while data:
+        cut = min(limit, len(data))
+        # never split a UTF-8 sequence
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+        limit = 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _vevent(row: Dict, host: str) -> str:
+    lecturer = f"{row['faculty__user__first_name'] or ''} {row['faculty__user__last_name'] or ''}".strip()
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:courseevent-{row['id']}@{host}",
+        f"DTSTAMP:{_ics_time(row['updated_at'])}",
+        f"LAST-MODIFIED:{_ics_time(row['updated_at'])}",
+        f"DTSTART:{_ics_time(row['start_date'])}",
+        f"DTEND:{_ics_time(row['end_date'])}",
+        f"SUMMARY:{_ics_escape(row['course__name'])}",
+    ]
+    if row["course__committee__name"] or lecturer:
+        desc = "\n".join(x for x in (row["course__committee__name"], lecturer) if x)
+        lines.append(f"DESCRIPTION:{_ics_escape(desc)}")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+def iter_ics(rows: Iterable[Dict], *, name: str, host: str) -> Iterator[str]:
+    """Stream a VCALENDAR; every event is rendered from its row alone."""
+    yield "".join(_fold(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:-//{host}//TIPMYS Takvim//TR",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_ics_escape(name)}",
+        "X-PUBLISHED-TTL:PT15M",
+    ))
+    for row in rows:
+        yield _vevent(row, host)
+    yield "END:VCALENDAR\r\n"
@@ -0,0 +1,103 @@
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, Optional
+from datetime import datetime
+import csv
+
+import xlsxwriter
+
+from faculty.models import Committee
+from .models import CourseEvent
+
+EVENT_EXPORT_HEADERS = ["Type","Title","Date","Start","End","Lecturer","Department","DepartmentDivision","CourseType"]
+
+# Events are read from the database this many at a time.
+EVENT_EXPORT_CHUNK_SIZE = 500
+
+# Only the columns an export row needs; no model instances are built.
+EVENT_EXPORT_FIELDS = (
+    "id", "start_date", "end_date",
+    "course__name",
+    "course__lecturer__user__first_name", "course__lecturer__user__last_name",
+    "course__department__name", "course__department__division",
+    "course__type__name",
+)
+
+
+def committee_event_values(*, committee: Committee, start: Optional[datetime], end: Optional[datetime]):
+    qs = CourseEvent.objects.filter(course__committee=committee)
+    if start:
+        qs = qs.filter(start_date__gte=start)
+    if end:
+        qs = qs.filter(end_date__lte=end)
+    return qs.values(*EVENT_EXPORT_FIELDS)
+
+
+def fetch_committee_rows(*, committee: Committee, start: Optional[datetime], end: Optional[datetime]) -> Iterator[Dict]:
+    """Event rows of a committee, streamed from a values() projection in chunks."""
+    qs = committee_event_values(committee=committee, start=start, end=end)
+    for v in qs.iterator(chunk_size=EVENT_EXPORT_CHUNK_SIZE):
+        yield {
+            "Type": "CourseEvent",
+            "EventID": v["id"],
+            "Title": v["course__name"] or "",
+            "Start": v["start_date"],
+            "End": v["end_date"],
+            "Lecturer": f"{v['course__lecturer__user__first_name'] or ''} {v['course__lecturer__user__last_name'] or ''}".strip(),
+            "Department": v["course__department__name"] or "",
+            "DepartmentDivision": v["course__department__division"] or "",
+            "CourseType": v["course__type__name"] or "",
+        }
+
+
+def _export_values(r: Dict) -> list:
+    return [
+        r.get("Type",""), r.get("Title",""),
+        (r.get("Start").strftime("%Y-%m-%d") if r.get("Start") else ""),
+        (r.get("Start").strftime("%H:%M") if r.get("Start") else ""),
+        (r.get("End").strftime("%H:%M") if r.get("End") else ""),
+        r.get("Lecturer",""), r.get("Department",""),
+        r.get("DepartmentDivision",""), r.get("CourseType",""),
+    ]
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to the caller."""
+    def write(self, value):
+        return value
+
+
+def iter_events_csv(rows: Iterable[Dict]) -> Iterator[str]:
+    """Yield the CSV export one line at a time (for StreamingHttpResponse)."""
+    w = csv.writer(_Echo())
+    yield w.writerow(EVENT_EXPORT_HEADERS)
+    for r in rows:
+        yield w.writerow(_export_values(r))
+
+
+def write_events_csv(rows: Iterable[Dict], fh) -> None:
+    """Write event rows as CSV into a text file object."""
+    for line in iter_events_csv(rows):
+        fh.write(line)
+
+
+def write_events_excel(rows: Iterable[Dict], fh) -> None:
+    """
+    Write event rows as an .xlsx workbook into a binary file object.
+    xlsxwriter's constant_memory mode flushes every row to a temp file as
+    it is written; column widths are tracked on the way instead of
+    rescanning the cells afterwards.
+    """
+    wb = xlsxwriter.Workbook(fh, {"constant_memory": True})
+    ws = wb.add_worksheet("Events")
+    widths = [len(h) for h in EVENT_EXPORT_HEADERS]
+    ws.write_row(0, 0, EVENT_EXPORT_HEADERS)
+    for row_no, r in enumerate(rows, start=1):
+        values = _export_values(r)
+        ws.write_row(row_no, 0, values)
+        for i, v in enumerate(values):
+            if v and len(str(v)) > widths[i]:
+                widths[i] = len(str(v))
+    ws.freeze_panes(1, 0)
+    for i, max_len in enumerate(widths):
+        ws.set_column(i, i, min(max(12, max_len + 2), 50))
+    wb.close()
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:15
+
+from django.db import migrations, models
+
+from faculty.text import fold_tr
+
+
+def fill_name_norms(apps, schema_editor):
+    FacultyProfile = apps.get_model("faculty", "FacultyProfile")
+    batch = []
+    for fp in FacultyProfile.objects.select_related("user").iterator(chunk_size=1000):
+        fp.name_norm = fold_tr(f"{fp.user.first_name} {fp.user.last_name}")[:301]
+        fp.last_name_norm = fold_tr(fp.user.last_name)[:150]
+        batch.append(fp)
+        if len(batch) >= 1000:
+            FacultyProfile.objects.bulk_update(batch, ["name_norm", "last_name_norm"])
+            batch = []
+    FacultyProfile.objects.bulk_update(batch, ["name_norm", "last_name_norm"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('faculty', '0010_courseevent_updated_at_calendarfeedtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='facultyprofile',
+            name='last_name_norm',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=150),
+        ),
+        migrations.AddField(
+            model_name='facultyprofile',
+            name='name_norm',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=301),
+        ),
+        migrations.RunPython(fill_name_norms, migrations.RunPython.noop),
+    ]
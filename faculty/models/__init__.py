@@ -4,4 +4,5 @@ from .department import Department
 from .committee import Committee
 from .fct_profile import FacultyProfile
 from .course_type import CourseType
-from .course_event import CourseEvent
\ No newline at end of file
+from .course_event import CourseEvent
+from .calendar_token import CalendarFeedToken
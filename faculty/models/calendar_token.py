@@ -0,0 +1,37 @@
+import secrets
+
+from django.contrib.auth.models import User
+from django.db import models
+from django.utils import timezone
+
+
+def _new_token() -> str:
+    return secrets.token_urlsafe(32)
+
+
+class CalendarFeedToken(models.Model):
+    """
+    Secret that authenticates a user's calendar client on the .ics feeds.
+    Calendar apps cannot log in, so the token travels in the feed URL;
+    regenerating it revokes every URL handed out before.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="calendar_token")
+    token = models.CharField(max_length=64, unique=True, default=_new_token)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Takvim Anahtarı"
+        verbose_name_plural = "Takvim Anahtarları"
+
+    def __str__(self):
+        return f"{self.user} takvim anahtarı"
+
+    @classmethod
+    def for_user(cls, user) -> "CalendarFeedToken":
+        obj, _ = cls.objects.get_or_create(user=user)
+        return obj
+
+    def regenerate(self):
+        self.token = _new_token()
+        self.created_at = timezone.now()
+        self.save(update_fields=["token", "created_at"])
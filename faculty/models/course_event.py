@@ -18,6 +18,7 @@ class CourseEvent(models.Model):
     event_date = models.DateTimeField('Event Date')
     start_date = models.DateTimeField('Start Date')
     end_date = models.DateTimeField('End Date')
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.course.name} - {self.event_date.strftime('%Y-%m-%d')}"
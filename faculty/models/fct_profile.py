@@ -2,14 +2,43 @@ from django.db import models
 from django.urls import reverse
 from .department import Department
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 from django.utils.translation import gettext_lazy as _
 from django.dispatch import receiver
+from faculty.text import fold_tr
 
 class FacultyProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     faculty_id = models.IntegerField(null=True, blank=True)
     department = models.ForeignKey(Department, on_delete=models.DO_NOTHING, default=1)
+    # Turkish-folded copies of the user's names for indexed prefix search
+    name_norm = models.CharField(max_length=301, blank=True, default="", db_index=True, editable=False)
+    last_name_norm = models.CharField(max_length=150, blank=True, default="", db_index=True, editable=False)
 
     def __str__(self):
-        return self.user.first_name + " " + self.user.last_name
\ No newline at end of file
+        return self.user.first_name + " " + self.user.last_name
+
+
+def profile_name_norms(user) -> dict:
+    return {
+        "name_norm": fold_tr(f"{user.first_name} {user.last_name}")[:301],
+        "last_name_norm": fold_tr(user.last_name)[:150],
+    }
+
+@receiver(pre_save, sender=FacultyProfile)
+def fp_name_norms(sender, instance: FacultyProfile, **kwargs):
+    if instance.user_id:
+        for field, value in profile_name_norms(instance.user).items():
+            setattr(instance, field, value)
+
+@receiver(post_save, sender=User)
+def fp_user_renamed(sender, instance: User, created, **kwargs):
+    """Names live on auth.User; keep the profile's folded copies in step."""
+    if created:
+        return
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and not {"first_name", "last_name"} & set(update_fields):
+        # e.g. update_last_login on every sign-in
+        return
+    FacultyProfile.objects.filter(user=instance).update(**profile_name_norms(instance))
+
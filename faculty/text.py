@@ -0,0 +1,24 @@
+import re
+import unicodedata
+
+# Turkish case rules first (I -> ı, İ -> i), then the letters that should
+# match their ASCII look-alikes when searching.
+_TR_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+_TR_FOLD = str.maketrans({
+    "ı": "i", "ş": "s", "ç": "c", "ğ": "g", "ö": "o", "ü": "u",
+    "â": "a", "î": "i", "û": "u",
+})
+_SPACES = re.compile(r"\s+")
+
+
+def fold_tr(s) -> str:
+    """
+    Case- and diacritic-folded form for search columns:
+    "İsmail IŞIK" -> "ismail isik", "Çağrı" -> "cagri".
+    Apply it to both the stored value and the user's query.
+    """
+    if not s:
+        return ""
+    s = str(s).translate(_TR_LOWER).lower().translate(_TR_FOLD)
+    s = "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
+    return _SPACES.sub(" ", s).strip()
@@ -7,6 +7,7 @@ from .views.committee_detail_with_questions_v import CommitteeDetailWithQuestion
 from .views.committee_detail_courses_v import CommitteeDetailWithCoursesView
 from .views.committee_eventlist_light_v import (committee_detail_eventlist_view, committee_detail_eventlist_view, course_event_create,
                     course_event_edit, course_event_delete)
+from .views.calendar_feed_v import calendar_feeds, committee_calendar_feed, faculty_calendar_feed
 from qbank.views import CourseMasterDetailView
 
 app_name = 'faculty'
@@ -28,6 +29,10 @@ urlpatterns = [
     path("events/new/course/<int:committee_id>/", course_event_create, name="course_event_create"),
     path("events/course/<int:pk>/edit/", course_event_edit, name="course_event_edit"),
     path("events/course/<int:pk>/delete/", course_event_delete, name="course_event_delete"),    
+
+    path("calendar/", calendar_feeds, name="calendar_feeds"),
+    path("calendar/<str:token>/committee/<int:committee_id>.ics", committee_calendar_feed, name="committee_calendar_feed"),
+    path("calendar/<str:token>/faculty/<int:faculty_id>.ics", faculty_calendar_feed, name="faculty_calendar_feed"),
     ]
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
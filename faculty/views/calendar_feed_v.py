@@ -0,0 +1,95 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Q
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+
+from ..calendar import committee_feed_queryset, faculty_feed_queryset, feed_rows, feed_stamp, iter_ics
+from ..models import CalendarFeedToken, Committee, FacultyProfile
+
+
+def _token_user(token: str):
+    """User behind a feed token; unknown tokens look like missing feeds."""
+    obj = CalendarFeedToken.objects.select_related("user").filter(token=token).first()
+    if obj is None or not obj.user.is_active:
+        raise Http404
+    return obj.user
+
+
+def _feed_response(request, qs, *, key: str, name: str, filename: str):
+    """
+    Calendar clients poll often: a matching If-None-Match is answered with
+    304 after a single aggregate query, otherwise the feed is streamed.
+    """
+    stamp = feed_stamp(qs, key)
+    not_modified = get_conditional_response(request, etag=stamp.etag)
+    if not_modified is not None:
+        return not_modified
+
+    resp = StreamingHttpResponse(
+        iter_ics(feed_rows(qs), name=name, host=request.get_host().split(":")[0]),
+        content_type="text/calendar; charset=utf-8",
+    )
+    resp["Content-Disposition"] = f'inline; filename="{filename}"'
+    resp["ETag"] = stamp.etag
+    resp["Cache-Control"] = "private, no-cache"
+    return resp
+
+
+def committee_calendar_feed(request, token: str, committee_id: int):
+    _token_user(token)
+    committee = get_object_or_404(Committee, pk=committee_id)
+    return _feed_response(
+        request, committee_feed_queryset(committee),
+        key=f"committee-{committee.pk}", name=committee.name,
+        filename=f"committee_{committee.pk}.ics",
+    )
+
+
+def faculty_calendar_feed(request, token: str, faculty_id: int):
+    user = _token_user(token)
+    profile = get_object_or_404(FacultyProfile.objects.select_related("user"), pk=faculty_id)
+    if not (user.is_superuser or user.is_staff or profile.user_id == user.id):
+        raise Http404
+    return _feed_response(
+        request, faculty_feed_queryset(profile),
+        key=f"faculty-{profile.pk}", name=str(profile),
+        filename=f"faculty_{profile.pk}.ics",
+    )
+
+
+@login_required
+def calendar_feeds(request):
+    """Abone olunabilecek takvim adresleri; POST ile anahtar yenilenir."""
+    feed_token = CalendarFeedToken.for_user(request.user)
+    if request.method == "POST":
+        feed_token.regenerate()
+        messages.success(request, "Takvim anahtarı yenilendi; eski bağlantılar artık çalışmaz.")
+        return redirect("faculty:calendar_feeds")
+
+    try:
+        profile = request.user.facultyprofile
+    except ObjectDoesNotExist:
+        profile = None
+
+    committees = Committee.objects.order_by("name")
+    if profile is not None and not request.user.is_superuser:
+        committees = committees.filter(
+            Q(chair=profile) | Q(cmt_courses__lecturer=profile)
+            | Q(cmt_courses__cenroll_courseevents__faculty=profile)
+        ).distinct()
+    elif profile is None and not request.user.is_superuser:
+        committees = committees.none()
+
+    def feed_url(name, **kwargs):
+        return request.build_absolute_uri(reverse(name, kwargs={"token": feed_token.token, **kwargs}))
+
+    context = {
+        "own_feed": feed_url("faculty:faculty_calendar_feed", faculty_id=profile.pk) if profile else None,
+        "committee_feeds": [(c, feed_url("faculty:committee_calendar_feed", committee_id=c.pk)) for c in committees],
+        "title": "Takvim Beslemeleri",
+    }
+    return render(request, "faculty/calendar_feeds.html", context)
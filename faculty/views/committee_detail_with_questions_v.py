@@ -1,9 +1,10 @@
 # faculty/views/committee_detail_with_questions.py
 from django.views.generic import DetailView
 from django.core.paginator import Paginator
-from django.db.models import Q
 from qbank.models import CourseMaster
 from qbank.models import CourseQuestionDepot
+from qbank.search import search_questions
+from qbank.pagination import keyset_paginate
 from faculty.models import Committee
 
 class CommitteeDetailWithQuestionsView(DetailView):
@@ -31,13 +32,8 @@ class CommitteeDetailWithQuestionsView(DetailView):
 
         # ---- Filtre uygula ----
         if q:
-            qs = qs.filter(
-                Q(name__icontains=q) |
-                Q(question_text__icontains=q) |
-                Q(master__name__icontains=q) |
-                Q(lecturer__user__first_name__icontains=q) |
-                Q(lecturer__user__last_name__icontains=q)
-            )
+            # tam metin indeksi: ders adı (tag_1) ve öğretim üyesi (tag_2) dahil
+            qs = search_questions(qs, q).order_by("-search_rank", "-updated_at", "-id")
         if master_id:
             qs = qs.filter(master_id=master_id)
         if qtype:
@@ -46,9 +42,13 @@ class CommitteeDetailWithQuestionsView(DetailView):
             qs = qs.filter(active=(active == "1"))
 
         # ---- Sayfalama (DetailView içinde manuel) ----
-        page_number = req.GET.get("page") or 1
-        paginator = Paginator(qs, 20)
-        page_obj = paginator.get_page(page_number)
+        # aramada sıralama skora göre olduğu için sayfa numarası kullanılır
+        if q or "page" in req.GET:
+            paginator = Paginator(qs, 20)
+            page_obj = paginator.get_page(req.GET.get("page") or 1)
+        else:
+            paginator = None
+            page_obj = keyset_paginate(qs, ("-updated_at", "-id"), req.GET.get("cursor"), 20)
 
         # ---- Filtre seçenekleri (sadece bu komiteye ait dersler) ----
         masters = (CourseMaster.objects
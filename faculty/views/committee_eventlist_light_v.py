@@ -1,14 +1,12 @@
 from __future__ import annotations
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Optional
 from datetime import datetime
-import io, csv
-from openpyxl import Workbook
-from openpyxl.utils import get_column_letter
+import tempfile
 
 from django.conf import settings
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.forms import ModelForm, DateTimeInput, Select
-from django.http import HttpResponse, JsonResponse, HttpResponseBadRequest
+from django.http import FileResponse, HttpResponse, JsonResponse, HttpResponseBadRequest, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse
 from django.utils.dateparse import parse_datetime
@@ -19,6 +17,7 @@ from faculty.models import Committee, FacultyProfile
 from qbank.models import CourseMaster
 from ..models import CourseEvent
 from ..forms  import CourseEventForm    
+from ..exports import fetch_committee_rows, iter_events_csv, write_events_excel
 
 DATETIME_LOCAL_FMT = "%Y-%m-%dT%H:%M"
 
@@ -33,76 +32,22 @@ def _can_manage(user) -> bool:
 
     return user.is_superuser
 
-def _fetch_committee_rows(*, committee: Committee, start: Optional[datetime], end: Optional[datetime]) -> List[Dict]:
-    qs = (CourseEvent.objects
-          .select_related("course__lecturer__user", "course__department", "course__type", "faculty__user")
-          .filter(course__committee=committee))
-
-    if start:
-        qs = qs.filter(start_date__gte=start)
-    if end:
-        qs = qs.filter(end_date__lte=end)
-
-    rows: List[Dict] = []
-    for ev in qs:
-        course = ev.course
-        lec = getattr(course, "lecturer", None)
-        rows.append({
-            "Type": "CourseEvent",
-            "EventID": ev.pk,
-            "Title": course.name if course else "",
-            "Start": ev.start_date,
-            "End": ev.end_date,
-            "Lecturer": f"{getattr(lec.user, 'first_name', '')} {getattr(lec.user, 'last_name', '')}".strip() if lec else "",
-            "Department": getattr(course.department, "name", "") if getattr(course, "department", None) else "",
-            "DepartmentDivision": getattr(getattr(course, "department", None), "division", "") or "",
-            "CourseType": getattr(getattr(course, "type", None), "name", "") or "",
-        })
-    return rows
-
-def _export_rows(rows: List[Dict], *, export_format: str, filename: str) -> HttpResponse:
-    headers = ["Type","Title","Date","Start","End","Lecturer","Department","DepartmentDivision","CourseType"]
-
+def _export_rows(rows: Iterable[Dict], *, export_format: str, filename: str) -> HttpResponse:
     if export_format == "csv":
-        buf = io.StringIO()
-        w = csv.writer(buf)
-        w.writerow(headers)
-        for r in rows:
-            w.writerow([
-                r.get("Type",""), r.get("Title",""),
-                (r.get("Start").strftime("%Y-%m-%d") if r.get("Start") else ""),
-                (r.get("Start").strftime("%H:%M") if r.get("Start") else ""),
-                (r.get("End").strftime("%H:%M") if r.get("End") else ""),
-                r.get("Lecturer",""), r.get("Department",""),
-                r.get("DepartmentDivision",""), r.get("CourseType",""),
-            ])
-        resp = HttpResponse(buf.getvalue(), content_type="text/csv; charset=utf-8")
+        resp = StreamingHttpResponse(iter_events_csv(rows), content_type="text/csv; charset=utf-8")
         resp["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
         return resp
 
     if export_format == "excel":
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Events"
-        ws.append(headers)
-        for r in rows:
-            ws.append([
-                r.get("Type",""), r.get("Title",""),
-                (r.get("Start").strftime("%Y-%m-%d") if r.get("Start") else ""),
-                (r.get("Start").strftime("%H:%M") if r.get("Start") else ""),
-                (r.get("End").strftime("%H:%M") if r.get("End") else ""),
-                r.get("Lecturer",""), r.get("Department",""),
-                r.get("DepartmentDivision",""), r.get("CourseType",""),
-            ])
-        ws.freeze_panes = "A2"
-        for i in range(1, len(headers)+1):
-            col = get_column_letter(i)
-            max_len = max(len(str(c.value)) if c.value else 0 for c in ws[col])
-            ws.column_dimensions[col].width = min(max(12, max_len + 2), 50)
-        resp = HttpResponse(content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-        resp["Content-Disposition"] = f'attachment; filename="{filename}.xlsx"'
-        wb.save(resp)
-        return resp
+        # The workbook is assembled in a temp file and streamed from disk;
+        # the file is removed when the response closes it.
+        tmp = tempfile.TemporaryFile()
+        write_events_excel(rows, tmp)
+        tmp.seek(0)
+        return FileResponse(
+            tmp, as_attachment=True, filename=f"{filename}.xlsx",
+            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
 
     return HttpResponseBadRequest("Unsupported export format")
 
@@ -117,12 +62,13 @@ def committee_detail_eventlist_view(request, committee_id: int):
     if start and end and start > end:
         start, end = end, start
 
-    rows = _fetch_committee_rows(committee=committee, start=start, end=end)
+    rows = fetch_committee_rows(committee=committee, start=start, end=end)
 
     export_kind = request.GET.get("export")
     if export_kind in {"csv","excel"}:
         fname = f"committee_{committee_id}_events"
         return _export_rows(rows, export_format=export_kind, filename=fname)
+    rows = list(rows)
 
     context = {
         "committee": committee,
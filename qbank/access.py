@@ -0,0 +1,85 @@
+"""
+Per-user access scope: which CourseMaster rows a user may see.
+
+  - superuser: everything (scope is None, no filter applied)
+  - chair of a course's committee
+  - the course's lecturer
+
+The id set is computed once and cached; list views filter with
+master_id__in instead of re-joining committee/lecturer on every request.
+Any course, committee or faculty profile save or delete bumps a global
+generation so every cached scope is dropped at once (those edits are
+rare, list reads are not).
+"""
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Q
+
+SCOPE_GENERATION_KEY = "qbank:scope:gen"
+SCOPE_TIMEOUT = 60 * 60
+
+
+def _generation() -> int:
+    gen = cache.get(SCOPE_GENERATION_KEY)
+    if gen is None:
+        cache.add(SCOPE_GENERATION_KEY, 1, None)
+        gen = cache.get(SCOPE_GENERATION_KEY, 1)
+    return gen
+
+
+def invalidate_access_scopes():
+    try:
+        cache.incr(SCOPE_GENERATION_KEY)
+    except ValueError:
+        cache.set(SCOPE_GENERATION_KEY, 2, None)
+
+
+def _compute(user) -> frozenset:
+    from .models import CourseMaster
+
+    try:
+        fp_id = user.facultyprofile.id
+    except ObjectDoesNotExist:
+        return frozenset()
+    return frozenset(
+        CourseMaster.objects
+        .filter(Q(committee__chair_id=fp_id) | Q(lecturer_id=fp_id))
+        .values_list("id", flat=True)
+    )
+
+
+def scope_cache_key(user) -> str:
+    """Key part that changes whenever the user's scope may have changed."""
+    if getattr(user, "is_superuser", False):
+        return "all"
+    return f"{_generation()}:{getattr(user, 'pk', None)}"
+
+
+def visible_master_ids(user):
+    """frozenset of CourseMaster ids, or None when the user sees everything."""
+    if not getattr(user, "is_authenticated", False):
+        return frozenset()
+    if user.is_superuser:
+        return None
+    cached = getattr(user, "_qbank_scope", None)
+    if cached is not None:
+        return cached
+    key = f"qbank:scope:{_generation()}:{user.pk}"
+    ids = cache.get(key)
+    if ids is None:
+        ids = _compute(user)
+        cache.set(key, ids, SCOPE_TIMEOUT)
+    user._qbank_scope = ids  # once per request
+    return ids
+
+
+def scope_masters(qs, user):
+    """CourseMaster queryset limited to the user's scope."""
+    ids = visible_master_ids(user)
+    return qs if ids is None else qs.filter(id__in=ids)
+
+
+def scope_questions(qs, user, field="master_id"):
+    """Any queryset with a master FK (questions, selections) limited to scope."""
+    ids = visible_master_ids(user)
+    return qs if ids is None else qs.filter(**{f"{field}__in": ids})
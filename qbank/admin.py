@@ -6,7 +6,7 @@ from import_export.admin import ImportExportModelAdmin
 from django_select2.forms import Select2Widget
 
 # Eğer CourseMaster bu app'in models'ında ise:
-from .models import CourseMaster, CourseQuestionDepot, ExamSetup, CourseQuestionSelected
+from .models import CourseMaster, CourseQuestionDepot, ExamSetup, CourseQuestionSelected, ExportJob, QuestionPicture, ExamVariant, ExamResult
 # Eğer CourseMaster qbank içindeyse bunun yerine:
 # from qbank.models import CourseMaster
 
@@ -57,9 +57,16 @@ class CourseQuestionDepotResource(resources.ModelResource):
     class Meta:
         model = CourseQuestionDepot
 
+class QuestionPictureInline(admin.TabularInline):
+    model = QuestionPicture
+    extra = 0
+    fields = ("image_type", "image", "sha256", "size")
+    readonly_fields = ("sha256", "size")
+
 @admin.register(CourseQuestionDepot)
 class CourseQuestionDepotAdmin(ImportExportModelAdmin):
     resource_class = CourseQuestionDepotResource
+    inlines = [QuestionPictureInline]
 
     list_display = ("id", "name", "master", "lecturer", "active", "hidden", "created_at")
     list_display_links = ("id", "name")
@@ -113,4 +120,37 @@ class CourseQuestionSelectedAdmin(ImportExportModelAdmin):
 
     list_select_related = ("exam", "master", "question")
 
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "exam", "committee", "requested_by", "progress", "total", "created_at", "finished_at")
+    list_display_links = ("id",)
+    list_filter = ("status", "kind")
+    list_per_page = 50
+
+    list_select_related = ("exam", "committee", "requested_by")
+
+    readonly_fields = ("created_at", "started_at", "finished_at")
+
+@admin.register(ExamVariant)
+class ExamVariantAdmin(admin.ModelAdmin):
+    list_display = ("id", "exam", "code", "seed", "created_at")
+    list_display_links = ("id",)
+    list_filter = ("code",)
+    search_fields = ("exam__name",)
+    list_per_page = 50
+
+    list_select_related = ("exam",)
+
+    readonly_fields = ("items", "answer_key", "created_at")
+
+@admin.register(ExamResult)
+class ExamResultAdmin(admin.ModelAdmin):
+    list_display = ("id", "exam", "student_no", "student_name", "variant_code", "correct", "wrong", "blank", "score")
+    list_display_links = ("id",)
+    list_filter = ("variant_code",)
+    search_fields = ("exam__name", "student_no", "student_name")
+    list_per_page = 50
+
+    list_select_related = ("exam",)
 
+    readonly_fields = ("answers", "scored_at")
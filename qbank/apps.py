@@ -1,6 +1,24 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def reset_cached_lookups(**kwargs):
+    """
+    post_migrate: a recreated database reuses row ids, so scopes and facet
+    counts cached for the previous one must not be read back.
+    """
+    from .access import invalidate_access_scopes
+    from .facets import invalidate_question_facets
+
+    invalidate_access_scopes()
+    invalidate_question_facets()
 
 
 class QbankConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'qbank'
+
+    def ready(self):
+        from .search import ensure_search_index
+        post_migrate.connect(ensure_search_index, sender=self)
+        post_migrate.connect(reset_cached_lookups, sender=self)
@@ -0,0 +1,160 @@
+"""
+Automatic exam assembly.
+
+assemble_exam() fills every course of an exam's committee up to its quota
+with randomly drawn questions:
+
+- the quota is CourseMaster.question_set, or final_question_set for final
+  exams; the exam type also decides the question type (theoric / pratic);
+- inactive and hidden questions are never drawn, nor questions selected
+  for another exam dated within the last `exclude_days` days;
+- questions already selected for the exam are kept and count toward the
+  quota, unless `replace` is set, in which case each course is redrawn;
+- every course draws from its own random.Random seeded with
+  (seed, exam, course), so the same seed reproduces the same exam and a
+  dry run previews exactly what applying with that seed would write.
+
+The whole exam is read in a handful of queries and written in one
+transaction through qbank.selection.write_selection().
+"""
+import random
+from collections import defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .exposure import RECENT_USE_DAYS
+from .models import CourseMaster, CourseQuestionDepot, CourseQuestionSelected
+from .selection import current_selection, lock_selection, write_selection
+
+# exam type -> (quota field of CourseMaster, question type drawn)
+EXAM_RULES = {
+    "theoric": ("question_set", "theoric"),
+    "pratic": ("question_set", "pratic"),
+    "final": ("final_question_set", "theoric"),
+    "final_pratic": ("final_question_set", "pratic"),
+}
+SEED_RANGE = 1_000_000
+
+
+@dataclass
+class CourseDraw:
+    course_id: int
+    course_name: str
+    quota: int
+    available: int                       # drawable questions after exclusions
+    kept: list = field(default_factory=list)
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return len(self.kept) + len(self.added)
+
+    @property
+    def shortfall(self) -> int:
+        return max(self.quota - self.total, 0)
+
+    @property
+    def excess(self) -> int:
+        """Hand-picked selections beyond the quota (kept, never trimmed)."""
+        return max(self.total - self.quota, 0)
+
+
+@dataclass
+class AssemblyResult:
+    exam_id: int
+    seed: int
+    question_type: str
+    dry_run: bool
+    courses: list = field(default_factory=list)
+
+    @property
+    def added(self) -> int:
+        return sum(len(c.added) for c in self.courses)
+
+    @property
+    def removed(self) -> int:
+        return sum(len(c.removed) for c in self.courses)
+
+    @property
+    def quota(self) -> int:
+        return sum(c.quota for c in self.courses)
+
+    @property
+    def total(self) -> int:
+        return sum(c.total for c in self.courses)
+
+    @property
+    def shortfall(self) -> int:
+        return sum(c.shortfall for c in self.courses)
+
+
+def new_seed() -> int:
+    return random.SystemRandom().randrange(1, SEED_RANGE)
+
+
+def _recently_used(course_ids, exam, exclude_days):
+    """Questions of these courses selected for another exam in the window."""
+    if not exclude_days:
+        return set()
+    cutoff = timezone.now() - timedelta(days=exclude_days)
+    return set(CourseQuestionSelected.objects
+               .filter(master_id__in=course_ids, exam__isnull=False)
+               .exclude(exam=exam)
+               .annotate(used_at=Coalesce("exam__date", "exam__start"))
+               .filter(used_at__gte=cutoff)
+               .values_list("question_id", flat=True))
+
+
+def assemble_exam(exam, seed=None, *, exclude_days=RECENT_USE_DAYS, replace=False, dry_run=False) -> AssemblyResult:
+    quota_field, qtype = EXAM_RULES.get(exam.type, EXAM_RULES["theoric"])
+    seed = new_seed() if seed is None else int(seed)
+    result = AssemblyResult(exam_id=exam.pk, seed=seed, question_type=qtype, dry_run=dry_run)
+
+    courses = list(CourseMaster.objects
+                   .filter(committee_id=exam.committee_id)
+                   .order_by("name", "id")
+                   .values_list("id", "name", quota_field))
+    course_ids = [c[0] for c in courses]
+
+    with nullcontext() if dry_run else transaction.atomic():
+        if not dry_run:
+            # hand edits of these courses wait until the draw is written
+            lock_selection(exam, course_ids)
+        current = current_selection(exam, course_ids)
+        excluded = _recently_used(course_ids, exam, exclude_days)
+        pools = defaultdict(list)
+        for master_id, qid in (CourseQuestionDepot.objects
+                               .filter(master_id__in=course_ids, active=True, hidden=False, type=qtype)
+                               .order_by("id")
+                               .values_list("master_id", "id")):
+            if qid not in excluded:
+                pools[master_id].append(qid)
+
+        for course_id, name, quota in courses:
+            quota = int(quota or 0)
+            rng = random.Random(f"{seed}:{exam.pk}:{course_id}")
+            have = current[course_id]
+            kept = set() if replace else have
+            pool = [qid for qid in pools[course_id] if qid not in kept]
+            drawn = set(rng.sample(pool, min(max(quota - len(kept), 0), len(pool))))
+            final = kept | drawn
+            result.courses.append(CourseDraw(
+                course_id=course_id, course_name=name, quota=quota, available=len(pools[course_id]),
+                kept=sorted(final & have), added=sorted(final - have), removed=sorted(have - final),
+            ))
+
+        if not dry_run:
+            _apply(exam, result)
+    return result
+
+
+def _apply(exam, result: AssemblyResult):
+    write_selection(exam,
+                    {c.course_id: c.added for c in result.courses if c.added},
+                    [qid for c in result.courses for qid in c.removed])
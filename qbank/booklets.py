@@ -0,0 +1,106 @@
+"""
+Printed exam booklets.
+
+plan_variants() decides the booklets (A, B, ...) of an exam and stores
+them as ExamVariant rows:
+
+- every booklet holds the exam's selected questions in its own order;
+  questions with an empty stem or no valid correct letter are left out,
+  as in the text exports;
+- answers are shuffled only for questions with shuffle_answers set;
+- every booklet draws from its own random.Random seeded with
+  (seed, exam, booklet), so the same seed gives the same booklets.
+
+The DOCX files are rendered from the stored rows by
+qbank.exports.booklet, one worker process per booklet; scoring maps the
+answers of each booklet back through the same rows.
+"""
+import random
+from dataclasses import dataclass, field
+
+from django.db import transaction
+
+from .assembly import new_seed
+from .exports.rows import ANSWER_LETTERS, answer_choices, selected_question_rows
+from .models import ExamVariant
+
+VARIANT_CODES = "ABCD"
+
+BOOKLET_FIELDS = (
+    "id", "question_text",
+    "answer_1_text", "answer_2_text", "answer_3_text", "answer_4_text", "answer_5_text",
+    "correct_answer", "shuffle_answers",
+)
+
+
+@dataclass
+class BookletPlan:
+    exam_id: int
+    seed: int
+    variants: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)      # question ids left out
+
+    @property
+    def question_count(self) -> int:
+        return len(self.variants[0].items) if self.variants else 0
+
+
+def _printable(row: dict):
+    """Original answer letters of a row, or None when it cannot be printed."""
+    letters = [label for label, text in answer_choices(row) if text.strip()]
+    correct = (row["correct_answer"] or "").strip().upper()[:1]
+    if not (row["question_text"] or "").strip() or correct not in letters:
+        return None
+    return letters
+
+
+def variant_items(rows, rng: random.Random):
+    """([question_id, answer order], ...) and the answer key of one booklet."""
+    items, key = [], []
+    for row in rng.sample(rows, len(rows)):
+        letters = list(row["letters"])
+        if row["shuffle_answers"]:
+            rng.shuffle(letters)
+        items.append([row["id"], "".join(letters)])
+        key.append(ANSWER_LETTERS[letters.index(row["correct_answer"].strip().upper()[:1])])
+    return items, "".join(key)
+
+
+def plan_variants(exam, count: int = len(VARIANT_CODES), seed=None) -> BookletPlan:
+    """Replace the booklets of `exam` with `count` new ones."""
+    if not 1 <= count <= len(VARIANT_CODES):
+        raise ValueError(f"Kitapçık sayısı 1 ile {len(VARIANT_CODES)} arasında olmalı.")
+    seed = new_seed() if seed is None else int(seed)
+    plan = BookletPlan(exam_id=exam.pk, seed=seed)
+
+    rows = []
+    for row in selected_question_rows(exam, None, fields=BOOKLET_FIELDS):
+        letters = _printable(row)
+        if letters is None:
+            plan.skipped.append(row["id"])
+        else:
+            rows.append({**row, "letters": letters})
+
+    for code in VARIANT_CODES[:count]:
+        items, key = variant_items(rows, random.Random(f"{seed}:{exam.pk}:{code}"))
+        plan.variants.append(ExamVariant(exam=exam, code=code, seed=seed, items=items, answer_key=key))
+
+    with transaction.atomic():
+        ExamVariant.objects.filter(exam=exam).delete()
+        ExamVariant.objects.bulk_create(plan.variants)
+    return plan
+
+
+def variants_outdated(exam, variants) -> bool:
+    """
+    True when the booklets no longer match the exam: the printable
+    selection changed or a question was edited after they were made.
+    """
+    if not variants:
+        return False
+    current, edited = set(), False
+    for row in selected_question_rows(exam, None, fields=BOOKLET_FIELDS + ("updated_at",)):
+        if _printable(row) is not None:
+            current.add(row["id"])
+            edited = edited or row["updated_at"] > variants[0].created_at
+    return edited or current != set(variants[0].question_ids)
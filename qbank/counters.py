@@ -0,0 +1,83 @@
+"""
+Question and selection counters for the exam dashboard.
+
+CourseQuestionTotal holds the number of questions of each course and
+ExamCourseSelection the number of questions selected for each
+(exam, course), so the exam page reads both with a join instead of
+counting on every view.
+
+Single-row saves and deletes (see the receivers in
+models/selection_counter.py) move a counter by one inside the same
+transaction; a missing row is created from a real count. Bulk writers
+(question import, qbank.selection.write_selection) call the recount_*
+helpers for what they touched. rebuild_counters() recomputes everything
+(used by the migration that adds the tables and by the
+rebuild_selection_counters command).
+"""
+from django.db.models import Count, F
+
+from .models import (
+    CourseMaster, CourseQuestionDepot, CourseQuestionSelected, CourseQuestionTotal, ExamCourseSelection,
+)
+
+
+def recount_course_questions(course_ids):
+    ids = {pk for pk in course_ids if pk}
+    if not ids:
+        return
+    counts = dict(CourseQuestionDepot.objects
+                  .filter(master_id__in=ids)
+                  .order_by().values("master_id").annotate(n=Count("id"))
+                  .values_list("master_id", "n"))
+    existing = set(CourseMaster.objects.filter(pk__in=ids).values_list("id", flat=True))
+    CourseQuestionTotal.objects.bulk_create(
+        [CourseQuestionTotal(course_id=pk, questions=counts.get(pk, 0)) for pk in existing],
+        update_conflicts=True, unique_fields=["course"], update_fields=["questions"],
+    )
+
+
+def recount_exam_selection(exam_id, course_ids):
+    ids = {pk for pk in course_ids if pk}
+    if not exam_id or not ids:
+        return
+    counts = dict(CourseQuestionSelected.objects
+                  .filter(exam_id=exam_id, master_id__in=ids)
+                  .order_by().values("master_id").annotate(n=Count("id"))
+                  .values_list("master_id", "n"))
+    existing = set(CourseMaster.objects.filter(pk__in=ids).values_list("id", flat=True))
+    ExamCourseSelection.objects.bulk_create(
+        [ExamCourseSelection(exam_id=exam_id, course_id=pk, selected=counts.get(pk, 0)) for pk in existing],
+        update_conflicts=True, unique_fields=["exam", "course"], update_fields=["selected"],
+    )
+
+
+def bump_course_questions(course_id, delta: int):
+    rows = CourseQuestionTotal.objects.filter(course_id=course_id)
+    if delta < 0:
+        # never create on the way down: the course may be being deleted
+        rows.filter(questions__gte=-delta).update(questions=F("questions") + delta)
+    elif not rows.update(questions=F("questions") + delta):
+        recount_course_questions([course_id])
+
+
+def bump_exam_selection(exam_id, course_id, delta: int):
+    """Also bumps the version, so pages opened before this change get a conflict."""
+    rows = ExamCourseSelection.objects.filter(exam_id=exam_id, course_id=course_id)
+    if delta < 0:
+        rows.filter(selected__gte=-delta).update(selected=F("selected") + delta, version=F("version") + 1)
+    elif not rows.update(selected=F("selected") + delta, version=F("version") + 1):
+        recount_exam_selection(exam_id, [course_id])
+
+
+def rebuild_counters():
+    CourseQuestionTotal.objects.all().delete()
+    ExamCourseSelection.objects.all().delete()
+    recount_course_questions(CourseMaster.objects.values_list("id", flat=True))
+    ExamCourseSelection.objects.bulk_create(
+        [ExamCourseSelection(exam_id=exam_id, course_id=course_id, selected=n)
+         for exam_id, course_id, n in (CourseQuestionSelected.objects
+                                       .filter(exam__isnull=False)
+                                       .order_by().values("exam_id", "master_id").annotate(n=Count("id"))
+                                       .values_list("exam_id", "master_id", "n"))],
+        batch_size=1000,
+    )
@@ -0,0 +1,193 @@
+"""
+Server-side DataTables (1.10+ protocol) on top of Django querysets.
+
+A DataTable lists its columns once: the key DataTables asks for, the ORM
+fields it sorts by and how a cell is rendered. The same renderers build
+the first page in the template (datatable_rows) and every later page in
+the JSON answer, so a table's markup lives in one place.
+
+Request keys read: draw, start, length, search[value],
+order[i][column], order[i][dir], columns[i][data], and cursor.
+
+A table under a keyset list keeps the list's own pager: the page sends a
+`cursor` (empty for the first page) and gets one cursor page with the
+capped approximate count, plus nextCursor / previousCursor for the
+pager. Without one (small tables, ranked search results), paging is
+DataTables' start/length with exact counts.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Sequence
+
+from django.http import JsonResponse
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
+
+from .pagination import approximate_count, keyset_paginate
+
+DATATABLE_MAX_LENGTH = 200
+
+
+@dataclass(frozen=True)
+class Column:
+    data: str
+    order_by: Sequence[str] = ()
+    render: Optional[Callable] = None     # (obj, ctx) -> html
+    class_name: str = ""
+
+    def cell(self, obj, ctx) -> str:
+        if self.render is not None:
+            return str(self.render(obj, ctx))
+        value = getattr(obj, self.data, "")
+        return str(conditional_escape("" if value is None else value))
+
+
+@dataclass(frozen=True)
+class DataTableRequest:
+    draw: int
+    start: int
+    length: int
+    search: str
+    order: list = field(default_factory=list)     # [(data, descending)]
+
+    @classmethod
+    def parse(cls, params, default_length=20):
+        def _int(key, default):
+            try:
+                return int(params.get(key, default))
+            except (TypeError, ValueError):
+                return default
+
+        length = _int("length", default_length)
+        if length <= 0 or length > DATATABLE_MAX_LENGTH:   # -1 is "all"
+            length = DATATABLE_MAX_LENGTH
+        order = []
+        i = 0
+        while f"order[{i}][column]" in params:
+            col = params.get(f"columns[{_int(f'order[{i}][column]', -1)}][data]")
+            if col:
+                order.append((col, params.get(f"order[{i}][dir]") == "desc"))
+            i += 1
+        return cls(
+            draw=_int("draw", 0),
+            start=max(_int("start", 0), 0),
+            length=length,
+            search=(params.get("search[value]") or "").strip(),
+            order=order,
+        )
+
+
+class DataTable:
+    """
+    columns: Column list, in table order.
+    search:  optional (qs, term) -> qs for the DataTables search box.
+    """
+
+    def __init__(self, columns: Sequence[Column], search: Callable = None, page_length: int = 20):
+        self.columns = list(columns)
+        self.by_data = {c.data: c for c in self.columns}
+        self.search = search
+        self.page_length = page_length
+
+    def ordering(self, dt_request: DataTableRequest) -> list:
+        """ORM ordering of the requested columns, pk breaking ties; [] when none was asked for."""
+        terms = []
+        for data, descending in dt_request.order:
+            col = self.by_data.get(data)
+            if col is None:
+                continue
+            for f in col.order_by:
+                if descending:
+                    f = f[1:] if f.startswith("-") else f"-{f}"
+                terms.append(f)
+        if not terms:
+            return []
+        return [*terms, "-pk" if terms[-1].startswith("-") else "pk"]
+
+    def order(self, qs, dt_request: DataTableRequest):
+        """Sort by the requested columns; with none, keep the queryset's own order."""
+        terms = self.ordering(dt_request)
+        return qs.order_by(*terms) if terms else qs
+
+    def row(self, obj, ctx) -> dict:
+        data = {c.data: c.cell(obj, ctx) for c in self.columns}
+        data["DT_RowId"] = f"row-{obj.pk}"
+        return data
+
+    def rows(self, objects, ctx=None) -> list:
+        """Cells for the server-rendered first page: [[(html, class_name), ...], ...]"""
+        ctx = ctx or {}
+        return [[(mark_safe(c.cell(obj, ctx)), c.class_name) for c in self.columns] for obj in objects]
+
+    def response(self, request, qs, ctx=None, keyset_ordering=None) -> JsonResponse:
+        """
+        One page of `qs` as DataTables JSON; by cursor when the view pages
+        by keyset_ordering and the request carries a cursor.
+        """
+        dt_request = DataTableRequest.parse(request.GET, self.page_length)
+        filtered_qs = qs
+        if dt_request.search and self.search is not None:
+            filtered_qs = self.search(qs, dt_request.search)
+        ctx = ctx or {}
+        if keyset_ordering and "cursor" in request.GET:
+            return self.keyset_response(dt_request, request.GET["cursor"], qs, filtered_qs,
+                                        self.ordering(dt_request) or keyset_ordering, ctx)
+
+        total = qs.count()
+        filtered = filtered_qs.count() if filtered_qs is not qs else total
+        page = self.order(filtered_qs, dt_request)[dt_request.start:dt_request.start + dt_request.length]
+        return JsonResponse({
+            "draw": dt_request.draw,
+            "recordsTotal": total,
+            "recordsFiltered": filtered,
+            "data": [self.row(obj, ctx) for obj in page],
+        })
+
+    def keyset_response(self, dt_request, cursor, qs, filtered_qs, ordering, ctx) -> JsonResponse:
+        page = keyset_paginate(filtered_qs, ordering, cursor, dt_request.length)
+        total = approximate_count(qs)[0] if filtered_qs is not qs else page.count
+        return JsonResponse({
+            "draw": dt_request.draw,
+            "recordsTotal": total,
+            "recordsFiltered": page.count,
+            "countCapped": page.count_capped,
+            "nextCursor": page.next_cursor,
+            "previousCursor": page.previous_cursor,
+            "data": [self.row(obj, ctx) for obj in page],
+        })
+
+
+def is_datatables_request(request) -> bool:
+    return "draw" in request.GET
+
+
+class DataTablesMixin:
+    """
+    ListView mixin: a request carrying DataTables' `draw` gets the JSON page
+    of get_queryset() (so the view's own filters and access scope apply);
+    the HTML page gets `datatable_rows` for the first page. Combined with
+    KeysetPaginationMixin, the JSON pages follow the same cursors.
+    """
+    datatable: DataTable = None
+
+    def get_datatable_context(self) -> dict:
+        return {"request": self.request, "user": self.request.user}
+
+    def get(self, request, *args, **kwargs):
+        if self.datatable is not None and is_datatables_request(request):
+            use_keyset = getattr(self, "use_keyset", None)
+            ordering = self.keyset_ordering if use_keyset is not None and use_keyset() else None
+            return self.datatable.response(request, self.get_queryset(), self.get_datatable_context(), ordering)
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["datatable_rows"] = self.datatable.rows(ctx["object_list"], self.get_datatable_context())
+        page = ctx.get("page_obj")
+        if getattr(page, "is_keyset", False):
+            total = page.count
+        elif page is not None:
+            total = page.paginator.count
+        else:
+            total = len(ctx["object_list"])
+        ctx["datatable_total"] = total
+        return ctx
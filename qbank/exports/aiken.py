@@ -0,0 +1,53 @@
+import re
+
+from .registry import Exporter, register
+from .rows import ANSWER_LETTERS, answer_choices
+
+
+def _clean_line(s: str) -> str:
+    """Aiken sade metin çıktısı için tek satıra indir, boşlukları toparla."""
+    if not s:
+        return ""
+    s = re.sub(r'\s+', ' ', str(s)).strip()
+    return s
+
+
+def render_question(row: dict):
+    """
+    Aiken block for one question, or None when the question cannot be
+    exported (empty stem or no valid correct letter). Validation happens
+    before anything is emitted, so skipped questions leave no partial lines.
+    """
+    qtext = _clean_line(row["question_text"])
+    if not qtext:
+        return None
+    correct = (row["correct_answer"] or "").strip().upper()[:1]
+    if correct not in ANSWER_LETTERS:
+        return None
+
+    lines = [qtext]
+    for label, text in answer_choices(row):
+        text = _clean_line(text)
+        if text:
+            lines.append(f"{label}. {text}")
+    lines.append(f"ANSWER: {correct}")
+    return "\n".join(lines) + "\n"
+
+
+def iter_aiken(rows):
+    """Stream Aiken blocks separated by a blank line. Aiken cannot carry pictures."""
+    emitted = False
+    for row in rows:
+        block = render_question(row)
+        if block is None:
+            continue
+        yield ("\n" + block) if emitted else block
+        emitted = True
+    if not emitted:
+        yield "\n"
+
+
+register(Exporter(
+    key="aiken", label="Aiken TXT", suffix="aiken.txt",
+    content_type="text/plain; charset=utf-8", render=iter_aiken,
+))
@@ -0,0 +1,212 @@
+import csv
+import io
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.utils import timezone
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Cm, Inches, Pt
+from PIL import Image
+
+from .bulk import _default_processes, _ensure_tmp_root, _init_worker
+from .pictures import open_picture, stem_pictures
+from .rows import ANSWER_LETTERS, EXPORT_FIELDS, chunked
+from .zipstream import ZipSink, copy_into_zip, open_stream_zip
+
+# Formats Word embeds as they are; anything else is converted to PNG.
+DOCX_IMAGE_FORMATS = {"PNG", "JPEG", "GIF", "BMP"}
+MAX_PICTURE_WIDTH = Cm(12)
+
+
+def booklet_filename(code: str) -> str:
+    return f"kitapcik_{code}.docx"
+
+
+def answer_key_filename(code: str) -> str:
+    return f"cevap_anahtari_{code}.docx"
+
+
+def _question_rows(question_ids) -> dict:
+    from ..models import CourseQuestionDepot
+
+    rows = {}
+    for chunk in chunked(question_ids, 500):
+        rows.update((r["id"], r) for r in CourseQuestionDepot.objects.filter(pk__in=chunk).values(*EXPORT_FIELDS))
+    return rows
+
+
+def _picture(name: str):
+    """(stream, width) of a stored picture, converted to PNG when Word cannot embed it."""
+    with open_picture(name) as fh:
+        data = fh.read()
+    with Image.open(io.BytesIO(data)) as img:
+        dpi = (img.info.get("dpi") or (96, 96))[0] or 96
+        width = min(Inches(img.width / dpi), MAX_PICTURE_WIDTH)
+        if img.format not in DOCX_IMAGE_FORMATS:
+            out = io.BytesIO()
+            img.save(out, "PNG")
+            data = out.getvalue()
+    return io.BytesIO(data), width
+
+
+def _new_document() -> Document:
+    doc = Document()
+    section = doc.sections[0]
+    section.top_margin = section.bottom_margin = Cm(1.5)
+    section.left_margin = section.right_margin = Cm(1.8)
+    doc.styles["Normal"].font.size = Pt(10.5)
+    return doc
+
+
+def _heading(doc, exam, code: str, title: str):
+    p = doc.add_paragraph()
+    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = p.add_run(exam.name)
+    run.bold = True
+    run.font.size = Pt(14)
+    date = exam.date or exam.start
+    date = timezone.localtime(date) if date else None
+    p = doc.add_paragraph()
+    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    p.add_run(f"{exam.get_type_display()}{f' — {date:%d.%m.%Y}' if date else ''} — ")
+    run = p.add_run(f"{title} {code}")
+    run.bold = True
+
+
+def build_booklet(exam, variant, rows: dict, pictures: dict) -> Document:
+    doc = _new_document()
+    _heading(doc, exam, variant.code, "Kitapçık")
+    table = doc.add_table(rows=1, cols=2)
+    table.style = "Table Grid"
+    table.rows[0].cells[0].text = "Ad Soyad:"
+    table.rows[0].cells[1].text = "Öğrenci No:"
+    doc.add_paragraph()
+
+    for number, (qid, order) in enumerate(variant.items, start=1):
+        row = rows[qid]
+        p = doc.add_paragraph()
+        p.paragraph_format.keep_with_next = True
+        p.paragraph_format.space_before = Pt(6)
+        p.add_run(f"{number}. ").bold = True
+        p.add_run(row["question_text"].strip())
+        for _, stored_name in pictures.get(qid, ()):
+            stream, width = _picture(stored_name)
+            doc.add_picture(stream, width=width)
+            doc.paragraphs[-1].paragraph_format.keep_with_next = True
+        for i, original in enumerate(order):
+            text = row[f"answer_{ANSWER_LETTERS.index(original) + 1}_text"].strip()
+            p = doc.add_paragraph(f"{ANSWER_LETTERS[i]}) {text}")
+            p.paragraph_format.left_indent = Cm(0.6)
+            p.paragraph_format.space_after = Pt(0)
+            # keep a question and its answers on one page
+            p.paragraph_format.keep_with_next = i < len(order) - 1
+    return doc
+
+
+def build_answer_key(exam, variant) -> Document:
+    doc = _new_document()
+    _heading(doc, exam, variant.code, "Cevap Anahtarı — Kitapçık")
+    doc.add_paragraph(f"Tohum: {variant.seed}")
+    # ten questions per row keeps a 200-question key on one page
+    per_row = 10
+    key = variant.answer_key
+    table = doc.add_table(rows=0, cols=per_row)
+    table.style = "Table Grid"
+    for start in range(0, len(key), per_row):
+        cells = table.add_row().cells
+        for i, letter in enumerate(key[start:start + per_row]):
+            cells[i].text = f"{start + i + 1}. {letter}"
+    return doc
+
+
+def render_variant_files(variant_id: int, out_dir: str):
+    """
+    Pool task: write the booklet and the answer key of one variant into
+    `out_dir`. Returns [(archive name, file path), ...].
+    """
+    from ..models import ExamVariant
+
+    variant = ExamVariant.objects.select_related("exam").get(pk=variant_id)
+    rows = _question_rows(variant.question_ids)
+    pictures = stem_pictures([qid for qid, row in rows.items() if row["picture"]])
+    written = []
+    for name, doc in ((booklet_filename(variant.code), build_booklet(variant.exam, variant, rows, pictures)),
+                      (answer_key_filename(variant.code), build_answer_key(variant.exam, variant))):
+        path = os.path.join(out_dir, f"{variant.pk}_{name}")
+        doc.save(path)
+        written.append((name, path))
+    return written
+
+
+def answer_keys_csv(variants) -> str:
+    """kitapcik,soru_sayisi,anahtar: one line per booklet, for the optical reader."""
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["kitapcik", "soru_sayisi", "anahtar"])
+    for v in variants:
+        writer.writerow([v.code, len(v.answer_key), v.answer_key])
+    return out.getvalue()
+
+
+def iter_booklet_zip(variants, processes=None):
+    """
+    Stream a ZIP with the booklet and answer key DOCX of every variant and
+    a CSV of all keys. Variants render in parallel worker processes
+    (in this process when `processes` is 1); a failed variant becomes an
+    ERROR.txt entry.
+    """
+    variants = list(variants)
+    processes = min(processes or _default_processes(), len(variants) or 1)
+    return (part for part in _iter_zip_parts(variants, processes) if part)
+
+
+def _iter_zip_parts(variants, processes):
+    work_dir = tempfile.mkdtemp(prefix="booklet_", dir=_ensure_tmp_root())
+    sink = ZipSink()
+    try:
+        with open_stream_zip(sink) as zf:
+            zf.writestr("cevap_anahtari.csv", answer_keys_csv(variants))
+            yield sink.drain()
+            for code, entries in _render_all(variants, work_dir, processes):
+                if isinstance(entries, Exception):
+                    zf.writestr(f"kitapcik_{code}_ERROR.txt", f"{type(entries).__name__}: {entries}\n")
+                    yield sink.drain()
+                    continue
+                for arcname, path in entries:
+                    with open(path, "rb") as src:
+                        yield from copy_into_zip(zf, sink, arcname, src, os.path.getsize(path))
+                    os.remove(path)
+        yield sink.drain()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _render_all(variants, work_dir, processes):
+    """(code, entries or the exception) for every variant, as each finishes."""
+    if processes <= 1:
+        for v in variants:
+            try:
+                yield v.code, render_variant_files(v.pk, work_dir)
+            except Exception as exc:
+                yield v.code, exc
+        return
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    ) as pool:
+        futures = {pool.submit(render_variant_files, v.pk, work_dir): v.code for v in variants}
+        try:
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as exc:
+                    yield futures[future], exc
+        except GeneratorExit:
+            for future in futures:
+                future.cancel()
+            raise
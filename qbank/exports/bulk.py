@@ -0,0 +1,145 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.utils.dateparse import parse_date
+from django.utils.text import slugify
+
+from .registry import EXPORTERS
+from .zipstream import ZipSink, copy_into_zip, open_stream_zip
+
+_TR_DOTS = str.maketrans("ıİ", "iI")
+
+
+def parse_exam_filters(params) -> dict:
+    """
+    filter_exams() keywords from request-style params (program, committee,
+    date_from, date_to as YYYY-MM-DD, type); empty values are left out.
+    Raises ValueError naming the first bad value.
+    """
+    from ..models import ExamSetup
+
+    filters = {}
+    for name in ("program", "committee"):
+        value = str(params.get(name) or "").strip()
+        if value:
+            if not value.isdigit():
+                raise ValueError(f"Geçersiz {name}: {value}")
+            filters[name] = int(value)
+    for name in ("date_from", "date_to"):
+        value = str(params.get(name) or "").strip()
+        if value:
+            try:
+                filters[name] = parse_date(value)
+            except ValueError:
+                filters[name] = None
+            if filters[name] is None:
+                raise ValueError(f"Geçersiz tarih ({name}): {value}")
+    value = params.get("type") or ""
+    if value:
+        if value not in dict(ExamSetup.EXAM_TYPES):
+            raise ValueError(f"Geçersiz sınav türü: {value}")
+        filters["type"] = value
+    return filters
+
+
+def filter_exams(qs, *, program=None, committee=None, date_from=None, date_to=None, type=None):
+    if program:
+        qs = qs.filter(program_id=program)
+    if committee:
+        qs = qs.filter(committee_id=committee)
+    if date_from:
+        qs = qs.filter(date__date__gte=date_from)
+    if date_to:
+        qs = qs.filter(date__date__lte=date_to)
+    if type:
+        qs = qs.filter(type=type)
+    return qs
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def render_exam_files(exam_id: int, formats, out_dir: str):
+    """
+    Pool task: write every requested format of one exam into `out_dir`.
+    Returns [(archive name, file path), ...]. Runs with staff scope.
+    """
+    from ..models import ExamSetup
+    from .rows import selected_question_rows
+
+    exam = ExamSetup.objects.get(pk=exam_id)
+    # slugify drops the dotless ı / dotted İ instead of transliterating them
+    folder = f"exam_{exam.pk}_{slugify(exam.name.translate(_TR_DOTS)) or 'exam'}"
+    written = []
+    for fmt in formats:
+        exporter = EXPORTERS[fmt]
+        filename = exporter.filename(exam.pk)
+        path = os.path.join(out_dir, f"{exam.pk}_{filename}")
+        exporter.write(selected_question_rows(exam, None), path)
+        written.append((f"{folder}/{filename}", path))
+    return written
+
+
+def _ensure_tmp_root() -> str:
+    root = os.path.join(settings.QBANK_EXPORT_DIR, "tmp")
+    os.makedirs(root, exist_ok=True)
+    return root
+
+
+def _default_processes() -> int:
+    return getattr(settings, "QBANK_EXPORT_PROCESSES", None) or min(4, os.cpu_count() or 1)
+
+
+def iter_bulk_zip(exam_ids, formats=("moodle_xml", "aiken"), processes=None):
+    """
+    Stream a ZIP with the exports of every exam in `exam_ids`.
+
+    Exams are rendered in parallel worker processes; each entry is added to
+    the archive (and sent to the client) as soon as its exam is finished.
+    A failed exam becomes an ERROR.txt entry instead of aborting the archive.
+    """
+    unknown = set(formats) - set(EXPORTERS)
+    if unknown:
+        raise ValueError(f"Unknown export format(s): {', '.join(sorted(unknown))}")
+    parts = _iter_zip_parts(list(exam_ids), tuple(formats), processes or _default_processes())
+    return (part for part in parts if part)
+
+
+def _iter_zip_parts(exam_ids, formats, processes):
+    work_dir = tempfile.mkdtemp(prefix="bulk_", dir=_ensure_tmp_root())
+    sink = ZipSink()
+    try:
+        with open_stream_zip(sink) as zf:
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            ) as pool:
+                futures = {pool.submit(render_exam_files, exam_id, formats, work_dir): exam_id
+                           for exam_id in exam_ids}
+                try:
+                    for future in as_completed(futures):
+                        try:
+                            entries = future.result()
+                        except Exception as exc:
+                            zf.writestr(f"exam_{futures[future]}_ERROR.txt", f"{type(exc).__name__}: {exc}\n")
+                            yield sink.drain()
+                            continue
+                        for arcname, path in entries:
+                            with open(path, "rb") as src:
+                                yield from copy_into_zip(zf, sink, arcname, src, os.path.getsize(path))
+                            os.remove(path)
+                except GeneratorExit:
+                    # Client went away: do not render the exams nobody will receive.
+                    for future in futures:
+                        future.cancel()
+                    raise
+        yield sink.drain()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
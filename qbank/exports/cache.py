@@ -0,0 +1,148 @@
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db.models import Count, Max, Sum
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+# Bump when the output of an exporter changes, so old artifacts are not reused.
+EXPORT_CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ExportStamp:
+    """
+    Content version of the rows an export would contain. There is no
+    Last-Modified: removing a selection moves no timestamp, so only the
+    digest can tell the client its copy is stale.
+    """
+    digest: str
+
+    @property
+    def etag(self) -> str:
+        return quote_etag(self.digest)
+
+
+def export_scope(user) -> str:
+    """Staff see the whole exam; lecturers only their own questions."""
+    if user is None or user.is_superuser or user.is_staff:
+        return "staff"
+    return f"lecturer-{user.pk}"
+
+
+def export_stamp(exam, user, fmt: str) -> ExportStamp:
+    """
+    One aggregate over the exam's selections: any selection added or removed
+    changes count/ids/created_at, and any edited question moves
+    question__updated_at.
+    """
+    from ..models import CourseQuestionSelected
+
+    qs = CourseQuestionSelected.objects.filter(exam=exam)
+    scope = export_scope(user)
+    if scope != "staff":
+        qs = qs.filter(question__lecturer__user=user)
+    agg = qs.aggregate(
+        n=Count("id"),
+        last_id=Max("id"),
+        qid_sum=Sum("question_id"),
+        last_selected=Max("created_at"),
+        last_updated=Max("question__updated_at"),
+    )
+    raw = "|".join(str(x) for x in (
+        EXPORT_CACHE_VERSION, exam.pk, fmt, scope,
+        agg["n"], agg["last_id"], agg["qid_sum"], agg["last_selected"], agg["last_updated"],
+    ))
+    return ExportStamp(digest=hashlib.sha256(raw.encode()).hexdigest()[:32])
+
+
+def _exam_dir(exam_id) -> str:
+    return os.path.join(settings.QBANK_EXPORT_DIR, "cache", f"exam_{exam_id}")
+
+
+def _artifact_path(exam_id, fmt: str, scope: str, digest: str, ext: str) -> str:
+    return os.path.join(_exam_dir(exam_id), f"{fmt}-{scope}-{digest}.{ext}")
+
+
+def _remove_artifacts(folder: str, prefix: str = ""):
+    """
+    Delete the finished artifacts in `folder` whose name starts with
+    `prefix`. ``.part`` files belong to downloads still streaming and are
+    left to them; a concurrent cleanup may already have removed a file.
+    """
+    try:
+        names = os.listdir(folder)
+    except FileNotFoundError:
+        return
+    for name in names:
+        if name.startswith(prefix) and not name.endswith(".part"):
+            try:
+                os.remove(os.path.join(folder, name))
+            except FileNotFoundError:
+                pass
+
+
+def drop_exam_exports(*exam_ids):
+    """Remove every cached artifact of the given exams."""
+    for exam_id in set(exam_ids):
+        if exam_id is not None:
+            _remove_artifacts(_exam_dir(exam_id))
+
+
+def _write_through(chunks, path: str):
+    """
+    Pass `chunks` through to the client while writing them to `path`.
+    The file only appears once the whole export has been written, so a
+    cancelled download never leaves a truncated artifact behind.
+    """
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            for chunk in chunks:
+                data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+                fh.write(data)
+                yield data
+        # Older versions of the same (format, scope) are now unreachable.
+        _remove_artifacts(folder, os.path.basename(path).rsplit("-", 1)[0] + "-")
+        try:
+            os.replace(tmp_path, path)
+        except FileNotFoundError:
+            # the cache folder was cleared while streaming; the client
+            # already has every byte, there is just nothing to keep
+            pass
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def cached_export_response(request, exam, exporter):
+    """
+    Serve an exam export with an ETag.
+
+    - matching If-None-Match: 304 without touching the rows
+    - artifact already on disk for this version: served from disk
+    - otherwise the export is streamed to the client and written to disk
+    """
+    stamp = export_stamp(exam, request.user, exporter.key)
+    not_modified = get_conditional_response(request, etag=stamp.etag)
+    if not_modified is not None:
+        return not_modified
+
+    path = _artifact_path(exam.pk, exporter.key, export_scope(request.user), stamp.digest, exporter.ext)
+    if os.path.exists(path):
+        resp = FileResponse(open(path, "rb"), content_type=exporter.content_type)
+    else:
+        resp = StreamingHttpResponse(_write_through(exporter.iter_exam(exam, request.user), path),
+                                     content_type=exporter.content_type)
+
+    resp["Content-Disposition"] = f'attachment; filename="{exporter.filename(exam.pk)}"'
+    resp["ETag"] = stamp.etag
+    # Always revalidate: the selection can change at any moment before the exam.
+    resp["Cache-Control"] = "private, no-cache"
+    return resp
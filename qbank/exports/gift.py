@@ -0,0 +1,58 @@
+import re
+
+from django.utils.html import escape
+
+from .registry import Exporter, register
+from .rows import ANSWER_LETTERS, answer_choices
+
+_GIFT_SPECIAL = re.compile(r"([~=#{}:\\])")
+
+
+def _gift_escape(s: str) -> str:
+    return _GIFT_SPECIAL.sub(r"\\\1", s)
+
+
+def _one_line(s: str) -> str:
+    return re.sub(r"\s+", " ", s or "").strip()
+
+
+def render_question(row: dict):
+    """
+    GIFT multiple choice for one question, or None when it has no stem or
+    no valid correct letter. Texts go out as escaped HTML like the Moodle
+    XML export; GIFT has no way to embed pictures.
+    """
+    stem = _one_line(row["question_text"])
+    correct = (row["correct_answer"] or "").strip().upper()[:1]
+    if not stem or correct not in ANSWER_LETTERS:
+        return None
+
+    name = _one_line(row["name"]) or f"Q{row['id']}"
+    lines = [
+        f"// Q{row['id']}",
+        f"::{_gift_escape(name)}::[html]<p>{_gift_escape(escape(stem))}</p> {{",
+    ]
+    for label, text in answer_choices(row):
+        text = _one_line(text)
+        if text:
+            mark = "=" if label == correct else "~"
+            lines.append(f"\t{mark}{_gift_escape(escape(text))}")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def iter_gift(rows):
+    """Stream GIFT questions separated by a blank line."""
+    emitted = False
+    for row in rows:
+        block = render_question(row)
+        if block is None:
+            continue
+        yield ("\n" + block) if emitted else block
+        emitted = True
+
+
+register(Exporter(
+    key="gift", label="GIFT", suffix="gift.txt",
+    content_type="text/plain; charset=utf-8", render=iter_gift,
+))
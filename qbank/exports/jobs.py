@@ -0,0 +1,196 @@
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import ExportJob
+from .registry import EXPORTERS
+from .rows import selected_question_queryset, selected_question_rows
+
+logger = logging.getLogger(__name__)
+
+# Progress is written back at most this often (seconds) to keep the job row cheap.
+PROGRESS_INTERVAL = 0.5
+# A job still running after this long lost its worker (killed, restarted, ...).
+STALE_AFTER = timedelta(hours=1)
+# Finished jobs and their files are purged after this long.
+KEEP_FINISHED = timedelta(days=7)
+
+
+@dataclass(frozen=True)
+class JobKind:
+    label: str
+    target: str                 # "exam" or "committee"
+    ext: str
+    content_type: str
+    run: Callable               # run(job, path, tick) -> None
+
+
+class _Progress:
+    """Counts processed items and flushes the count to the job row now and then."""
+
+    def __init__(self, job: ExportJob):
+        self.job = job
+        self.done = 0
+        self._flushed_at = 0.0
+
+    def __call__(self, n: int = 1):
+        self.done += n
+        now = time.monotonic()
+        if now - self._flushed_at >= PROGRESS_INTERVAL:
+            ExportJob.objects.filter(pk=self.job.pk).update(progress=self.done)
+            self._flushed_at = now
+
+    def counted(self, items):
+        for item in items:
+            yield item
+            self(1)
+
+
+def _exam_export(exporter):
+    def run(job, path, tick):
+        rows = selected_question_rows(job.exam, job.requested_by)
+        exporter.write(tick.counted(rows), path)
+    return run
+
+
+def _event_rows(job):
+    from faculty.exports import fetch_committee_rows
+    start, end = job.params.get("start"), job.params.get("end")
+    return fetch_committee_rows(
+        committee=job.committee,
+        start=parse_datetime(start) if start else None,
+        end=parse_datetime(end) if end else None,
+    )
+
+
+def _run_events_csv(job, path, tick):
+    from faculty.exports import write_events_csv
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        write_events_csv(tick.counted(_event_rows(job)), fh)
+
+
+def _run_events_excel(job, path, tick):
+    from faculty.exports import write_events_excel
+    with open(path, "wb") as fh:
+        write_events_excel(tick.counted(_event_rows(job)), fh)
+
+
+# Every registered question format is also available as an exam job.
+JOB_KINDS = {
+    key: JobKind(exporter.label, "exam", exporter.ext, exporter.content_type, _exam_export(exporter))
+    for key, exporter in EXPORTERS.items()
+}
+JOB_KINDS.update({
+    "events_csv": JobKind("Etkinlikler CSV", "committee", "csv", "text/csv; charset=utf-8",
+                          _run_events_csv),
+    "events_excel": JobKind("Etkinlikler Excel", "committee", "xlsx",
+                            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                            _run_events_excel),
+})
+
+
+def _job_total(job: ExportJob) -> int:
+    if JOB_KINDS[job.kind].target == "exam":
+        return selected_question_queryset(job.exam, job.requested_by).count()
+    from faculty.exports import committee_event_values
+    start, end = job.params.get("start"), job.params.get("end")
+    return committee_event_values(
+        committee=job.committee,
+        start=parse_datetime(start) if start else None,
+        end=parse_datetime(end) if end else None,
+    ).count()
+
+
+def _download_name(job: ExportJob) -> str:
+    if job.exam_id:
+        return EXPORTERS[job.kind].filename(job.exam_id)
+    return f"committee_{job.committee_id}_{job.kind}.{JOB_KINDS[job.kind].ext}"
+
+
+def enqueue_export(kind: str, user, *, exam=None, committee=None, params=None) -> ExportJob:
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown export kind: {kind}")
+    return ExportJob.objects.create(
+        kind=kind, requested_by=user, exam=exam, committee=committee, params=params or {},
+    )
+
+
+def job_path(job: ExportJob) -> str:
+    return os.path.join(settings.QBANK_EXPORT_DIR, "jobs", f"job_{job.pk}.{JOB_KINDS[job.kind].ext}")
+
+
+def fail_stale_jobs() -> int:
+    """
+    Mark running jobs whose worker died as failed, so the page stops
+    polling them. They are not requeued: a job that kills its worker
+    would otherwise take down every worker in turn.
+    """
+    now = timezone.now()
+    stale = list(ExportJob.objects.filter(status=ExportJob.STATUS_RUNNING, started_at__lt=now - STALE_AFTER))
+    for job in stale:
+        failed = (ExportJob.objects
+                  .filter(pk=job.pk, status=ExportJob.STATUS_RUNNING)
+                  .update(status=ExportJob.STATUS_FAILED, finished_at=now,
+                          error="Dışa aktarım zaman aşımına uğradı; lütfen yeniden deneyin."))
+        if failed and job.kind in JOB_KINDS and os.path.exists(job_path(job)):
+            os.remove(job_path(job))
+    return len(stale)
+
+
+def purge_finished_jobs() -> int:
+    """Delete finished jobs older than KEEP_FINISHED (the files go with them, see models/export_job.py)."""
+    old = ExportJob.objects.filter(status__in=[ExportJob.STATUS_DONE, ExportJob.STATUS_FAILED],
+                                   finished_at__lt=timezone.now() - KEEP_FINISHED)
+    deleted, _ = old.delete()
+    return deleted
+
+
+def claim_next_job():
+    """
+    Take the oldest queued job. The status flip is a conditional UPDATE,
+    so several workers can poll the same table without a broker. Jobs
+    left running by a dead worker are failed first.
+    """
+    fail_stale_jobs()
+    candidates = (ExportJob.objects
+                  .filter(status=ExportJob.STATUS_QUEUED)
+                  .order_by("created_at", "id")
+                  .values_list("id", flat=True)[:10])
+    for job_id in candidates:
+        claimed = (ExportJob.objects
+                   .filter(pk=job_id, status=ExportJob.STATUS_QUEUED)
+                   .update(status=ExportJob.STATUS_RUNNING, started_at=timezone.now()))
+        if claimed:
+            return ExportJob.objects.select_related("exam", "committee", "requested_by").get(pk=job_id)
+    return None
+
+
+def run_job(job: ExportJob) -> ExportJob:
+    path = job_path(job)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        job.total = _job_total(job)
+        ExportJob.objects.filter(pk=job.pk).update(total=job.total)
+        tick = _Progress(job)
+        JOB_KINDS[job.kind].run(job, path, tick)
+    except Exception as exc:
+        logger.exception("Export job %s failed", job.pk)
+        job.status = ExportJob.STATUS_FAILED
+        job.error = str(exc)[:2000]
+        if os.path.exists(path):
+            os.remove(path)
+    else:
+        job.status = ExportJob.STATUS_DONE
+        job.progress = tick.done
+        job.file_path = path
+        job.filename = _download_name(job)
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "progress", "total", "file_path", "filename", "error", "finished_at"])
+    return job
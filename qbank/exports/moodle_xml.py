@@ -0,0 +1,66 @@
+from xml.sax.saxutils import escape as xml_escape, quoteattr
+from django.utils.html import escape
+
+from .pictures import iter_base64_file, stem_pictures
+from .registry import Exporter, register
+from .rows import answer_choices, chunked
+
+
+def _cdata(s: str) -> str:
+    # "]]>" cannot appear inside a CDATA section; split it across two sections.
+    return "<![CDATA[" + s.replace("]]>", "]]]]><![CDATA[>") + "]]>"
+
+
+def iter_question(row: dict, pictures=()):
+    """One <question type="multichoice"> block, indented as in the old ElementTree output."""
+    name = row["name"] or f"Q{row['id']}"
+    stem_html = f"<p>{escape((row['question_text'] or '').strip())}</p>"
+    stem_html = "".join(
+        f'<p><img src="@@PLUGINFILE@@/{filename}" /></p>' for filename, _ in pictures
+    ) + stem_html
+
+    yield (
+        '  <question type="multichoice">\n'
+        "    <name>\n"
+        f"      <text>{xml_escape(name)}</text>\n"
+        "    </name>\n"
+        '    <questiontext format="html">\n'
+        f"      <text>{_cdata(stem_html)}</text>\n"
+    )
+    for filename, stored_name in pictures:
+        yield f'      <file name={quoteattr(filename)} path="/" encoding="base64">'
+        yield from iter_base64_file(stored_name)
+        yield "</file>\n"
+
+    parts = ["    </questiontext>\n"]
+    for label, text in answer_choices(row):
+        fraction = "100" if row["correct_answer"] == label else "0"
+        parts += [
+            f'    <answer fraction="{fraction}">\n',
+            f"      <text>{xml_escape(escape(text.strip()))}</text>\n",
+            "      <feedback />\n",
+            "    </answer>\n",
+        ]
+    parts.append("  </question>\n")
+    yield "".join(parts)
+
+
+def iter_moodle_xml(rows):
+    """
+    Stream a Moodle <quiz> document one <question> block at a time.
+    Pictures are looked up once per chunk of rows and their files are
+    base64-encoded block by block, so memory stays flat however many
+    images the exam carries.
+    """
+    yield "<quiz>\n"
+    for chunk in chunked(rows):
+        pictures = stem_pictures([r["id"] for r in chunk if r["picture"]])
+        for row in chunk:
+            yield from iter_question(row, pictures.get(row["id"], ()))
+    yield "</quiz>"
+
+
+register(Exporter(
+    key="moodle_xml", label="Moodle XML", suffix="moodle.xml",
+    content_type="application/xml", render=iter_moodle_xml,
+))
@@ -0,0 +1,42 @@
+import base64
+
+from ..models import QuestionPicture
+
+# Raw bytes per block; a multiple of 3 so base64 blocks concatenate without padding.
+PICTURE_READ_BLOCK = 3 * 16 * 1024
+
+
+def _storage():
+    return QuestionPicture._meta.get_field("image").storage
+
+
+def stem_pictures(question_ids) -> dict:
+    """
+    {question_id: [(filename, storage name), ...]} for the stem pictures of
+    the given questions, in one query. A blob attached twice to the same
+    question is listed once; files missing from storage are skipped.
+    """
+    if not question_ids:
+        return {}
+    storage = _storage()
+    out, seen = {}, set()
+    for qid, sha, name in (QuestionPicture.objects
+                           .filter(question_id__in=question_ids, image_type="Q")
+                           .order_by("question_id", "id")
+                           .values_list("question_id", "sha256", "image")):
+        if (qid, sha) in seen or not storage.exists(name):
+            continue
+        seen.add((qid, sha))
+        out.setdefault(qid, []).append((name.rsplit("/", 1)[-1], name))
+    return out
+
+
+def open_picture(name: str):
+    return _storage().open(name, "rb")
+
+
+def iter_base64_file(name: str):
+    """Base64 of a stored picture, read and encoded one block at a time."""
+    with open_picture(name) as fh:
+        for block in iter(lambda: fh.read(PICTURE_READ_BLOCK), b""):
+            yield base64.b64encode(block).decode("ascii")
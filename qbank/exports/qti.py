@@ -0,0 +1,93 @@
+from xml.sax.saxutils import escape as xml_escape, quoteattr
+
+from .pictures import open_picture, stem_pictures
+from .registry import Exporter, register
+from .rows import ANSWER_LETTERS, answer_choices, chunked
+from .zipstream import ZipSink, copy_into_zip, open_stream_zip
+
+QTI_NS = "http://www.imsglobal.org/xsd/imsqti_v2p1"
+QTI_XSD = "http://www.imsglobal.org/xsd/qti/qtiv2p1/imsqti_v2p1.xsd"
+CP_NS = "http://www.imsglobal.org/xsd/imscp_v1p1"
+
+
+def _item_xml(row: dict, correct: str, pictures) -> str:
+    ident = f"Q{row['id']}"
+    title = row["name"] or ident
+    images = "".join(
+        f'<p><img src={quoteattr("media/" + filename)} alt=""/></p>' for filename, _ in pictures
+    )
+    choices = "".join(
+        f'<simpleChoice identifier="{label}">{xml_escape(text.strip())}</simpleChoice>'
+        for label, text in answer_choices(row)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<assessmentItem xmlns="{QTI_NS}" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        f'xsi:schemaLocation="{QTI_NS} {QTI_XSD}" '
+        f'identifier="{ident}" title={quoteattr(title)} adaptive="false" timeDependent="false">'
+        '<responseDeclaration identifier="RESPONSE" cardinality="single" baseType="identifier">'
+        f'<correctResponse><value>{correct}</value></correctResponse>'
+        '</responseDeclaration>'
+        '<outcomeDeclaration identifier="SCORE" cardinality="single" baseType="float">'
+        '<defaultValue><value>0</value></defaultValue>'
+        '</outcomeDeclaration>'
+        '<itemBody>'
+        f'{images}<p>{xml_escape((row["question_text"] or "").strip())}</p>'
+        f'<choiceInteraction responseIdentifier="RESPONSE" shuffle="false" maxChoices="1">{choices}</choiceInteraction>'
+        '</itemBody>'
+        '<responseProcessing template="http://www.imsglobal.org/question/qti_v2p1/rptemplates/match_correct"/>'
+        '</assessmentItem>\n'
+    )
+
+
+def _manifest_xml(resources) -> str:
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<manifest xmlns="{CP_NS}" identifier="MANIFEST-QBANK">'
+        '<organizations/><resources>'
+    ]
+    for ident, href, media in resources:
+        deps = "".join(f"<file href={quoteattr(m)}/>" for m in media)
+        parts.append(
+            f'<resource identifier="{ident}" type="imsqti_item_xmlv2p1" href="{href}">'
+            f'<file href="{href}"/>{deps}</resource>'
+        )
+    parts.append("</resources></manifest>\n")
+    return "".join(parts)
+
+
+def iter_qti_package(rows):
+    """
+    Stream an IMS QTI 2.1 content package (ZIP): one assessmentItem per
+    question, imsmanifest.xml last. Pictures live once under media/ no
+    matter how many items reference them.
+    """
+    sink = ZipSink()
+    resources, written_media = [], set()
+    with open_stream_zip(sink) as zf:
+        for chunk in chunked(rows):
+            pictures = stem_pictures([r["id"] for r in chunk if r["picture"]])
+            for row in chunk:
+                correct = (row["correct_answer"] or "").strip().upper()[:1]
+                if correct not in ANSWER_LETTERS or not (row["question_text"] or "").strip():
+                    continue
+                pics = pictures.get(row["id"], ())
+                for filename, stored_name in pics:
+                    if filename in written_media:
+                        continue
+                    written_media.add(filename)
+                    with open_picture(stored_name) as src:
+                        yield from copy_into_zip(zf, sink, f"media/{filename}", src, src.size)
+                href = f"items/Q{row['id']}.xml"
+                zf.writestr(href, _item_xml(row, correct, pics))
+                resources.append((f"Q{row['id']}", href, [f"media/{fn}" for fn, _ in pics]))
+                yield sink.drain()
+        zf.writestr("imsmanifest.xml", _manifest_xml(resources))
+    yield sink.drain()
+
+
+register(Exporter(
+    key="qti21", label="IMS QTI 2.1", suffix="qti21.zip",
+    content_type="application/zip", render=iter_qti_package,
+))
@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from .rows import EXPORT_FIELDS, selected_question_rows
+
+
+@dataclass(frozen=True)
+class Exporter:
+    """
+    A question export format. `render` turns the shared row stream
+    (dicts with EXPORT_FIELDS) into str or bytes chunks.
+    """
+    key: str
+    label: str
+    suffix: str                 # download name: exam_<pk>_<suffix>
+    content_type: str
+    render: Callable[[Iterable[dict]], Iterable]
+
+    @property
+    def ext(self) -> str:
+        return self.suffix.rsplit(".", 1)[-1]
+
+    def filename(self, exam_id) -> str:
+        return f"exam_{exam_id}_{self.suffix}"
+
+    def iter_exam(self, exam, user=None):
+        """Render `exam` for `user` (None: staff scope) from the shared row source."""
+        return self.render(selected_question_rows(exam, user, fields=EXPORT_FIELDS))
+
+    def write(self, rows, path: str):
+        """Render `rows` into the file at `path`; text chunks are written as UTF-8."""
+        with open(path, "wb") as fh:
+            for chunk in self.render(rows):
+                fh.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+
+
+EXPORTERS: dict[str, Exporter] = {}
+
+
+def register(exporter: Exporter) -> Exporter:
+    EXPORTERS[exporter.key] = exporter
+    return exporter
+
+
+def get_exporter(key: str) -> Exporter:
+    try:
+        return EXPORTERS[key]
+    except KeyError:
+        raise KeyError(f"Unknown export format: {key}") from None
+
+
+# Built-in formats register themselves on import.
+from . import moodle_xml, aiken, gift, qti  # noqa: E402,F401
@@ -0,0 +1,55 @@
+from itertools import islice
+
+from ..models import CourseQuestionDepot
+
+# Rows are pulled from the database in chunks of this size so that an export
+# never holds more than one chunk of question texts in memory.
+EXPORT_CHUNK_SIZE = 200
+
+# The one projection every exporter reads from; formats pick what they need.
+EXPORT_FIELDS = (
+    "id", "name", "question_text",
+    "answer_1_text", "answer_2_text", "answer_3_text", "answer_4_text", "answer_5_text",
+    "correct_answer", "picture",
+)
+
+ANSWER_LETTERS = ("A", "B", "C", "D", "E")
+
+
+def selected_question_queryset(exam, user=None):
+    """
+    Selected questions of `exam` the user may export.
+
+    - user None / superuser / staff: every selected question
+    - other users: only the questions they lecture
+    """
+    qs = CourseQuestionDepot.objects.filter(coursequestionselected__exam=exam)
+    if user is not None and not (user.is_superuser or user.is_staff):
+        qs = qs.filter(lecturer__user=user)
+    return qs
+
+
+def selected_question_rows(exam, user=None, *, fields=EXPORT_FIELDS, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the selected questions of `exam` as dicts holding only `fields`,
+    in selection order, fetched `chunk_size` at a time.
+    """
+    return (selected_question_queryset(exam, user)
+            .order_by("coursequestionselected__id")
+            .values(*fields)
+            .iterator(chunk_size=chunk_size))
+
+
+def chunked(rows, size=EXPORT_CHUNK_SIZE):
+    """Group an iterable of rows into lists of at most `size`."""
+    it = iter(rows)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def answer_choices(row: dict):
+    """(letter, text) for every non-empty answer of a row."""
+    for i, label in enumerate(ANSWER_LETTERS, start=1):
+        text = row[f"answer_{i}_text"]
+        if text:
+            yield label, text
@@ -0,0 +1,44 @@
+import time
+import zipfile
+
+# Bytes copied into an archive entry between two drains of the sink.
+ZIP_COPY_BLOCK = 64 * 1024
+
+
+class ZipSink:
+    """Write-only, unseekable target for ZipFile; the caller drains it between writes."""
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def open_stream_zip(sink: ZipSink) -> zipfile.ZipFile:
+    return zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED)
+
+
+def copy_into_zip(zf: zipfile.ZipFile, sink: ZipSink, arcname: str, src, file_size=None):
+    """
+    Copy the binary file object `src` into the archive block by block,
+    yielding the compressed bytes produced so far after every block.
+    """
+    zinfo = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    if file_size is not None:
+        zinfo.file_size = file_size
+    with zf.open(zinfo, "w", force_zip64=file_size is None) as dest:
+        for block in iter(lambda: src.read(ZIP_COPY_BLOCK), b""):
+            dest.write(block)
+            yield sink.drain()
+    yield sink.drain()
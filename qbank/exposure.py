@@ -0,0 +1,110 @@
+"""
+Question exposure: how often and how recently a question was used.
+
+QuestionExposure keeps, per question, the total number of exams it was
+selected for, the latest of those exams (by exam date, falling back to
+start) and a count per academic year. refresh_exposure() recomputes the
+rows of the given questions only, from their own selections; it is called
+by the selection receivers, by bulk selection code (bulk_create sends no
+signals) and when an exam's date changes. rebuild_question_exposure fills
+the table for an existing bank.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.db.models import Case, CharField, F, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .facets import invalidate_question_facets
+from .models import CourseQuestionSelected, QuestionExposure
+
+# "recently used" = selected for an exam within this many days
+RECENT_USE_DAYS = 365
+USAGE_LABELS = {
+    "recent": "Son 1 yılda kullanıldı",
+    "old": "1 yıldan önce kullanıldı",
+    "never": "Hiç kullanılmadı",
+}
+
+
+def academic_year(dt) -> str:
+    """'2025-2026' for any date from 1 September 2025 to 31 August 2026."""
+    dt = timezone.localtime(dt) if timezone.is_aware(dt) else dt
+    start = dt.year if dt.month >= 9 else dt.year - 1
+    return f"{start}-{start + 1}"
+
+
+def refresh_exposure(question_ids):
+    """Recompute the exposure rows of `question_ids` from their selections."""
+    ids = {int(pk) for pk in question_ids if pk}
+    if not ids:
+        return 0
+    uses = (CourseQuestionSelected.objects
+            .filter(question_id__in=ids, exam__isnull=False)
+            .annotate(used_at=Coalesce("exam__date", "exam__start"))
+            .values_list("question_id", "exam_id", "used_at"))
+
+    stats = {}
+    for qid, exam_id, used_at in uses:
+        s = stats.setdefault(qid, {"count": 0, "last": None, "years": Counter()})
+        s["count"] += 1
+        if used_at is not None:
+            s["years"][academic_year(used_at)] += 1
+        # undated exams only count as "last" when nothing dated exists
+        key = (used_at is not None, used_at or timezone.now(), exam_id)
+        if s["last"] is None or key > s["last"]:
+            s["last"] = key
+
+    QuestionExposure.objects.filter(question_id__in=ids - stats.keys()).delete()
+    QuestionExposure.objects.bulk_create(
+        [QuestionExposure(
+            question_id=qid,
+            use_count=s["count"],
+            last_exam_id=s["last"][2],
+            last_used_at=s["last"][1] if s["last"][0] else None,
+            year_counts=dict(sorted(s["years"].items())),
+        ) for qid, s in stats.items()],
+        update_conflicts=True,
+        unique_fields=["question"],
+        update_fields=["use_count", "last_exam", "last_used_at", "year_counts", "updated_at"],
+    )
+    invalidate_question_facets()
+    return len(stats)
+
+
+def rebuild_exposure(chunk_size=1000):
+    """Recompute the whole table (questions with selections, plus stale rows)."""
+    ids = set(CourseQuestionSelected.objects.filter(exam__isnull=False)
+              .values_list("question_id", flat=True).distinct())
+    ids |= set(QuestionExposure.objects.values_list("question_id", flat=True))
+    ids = sorted(ids)
+    done = 0
+    for i in range(0, len(ids), chunk_size):
+        done += refresh_exposure(ids[i:i + chunk_size])
+    return done
+
+
+def usage_expression():
+    """'recent' / 'old' / 'never' for a CourseQuestionDepot queryset."""
+    cutoff = timezone.now() - timedelta(days=RECENT_USE_DAYS)
+    return Case(
+        When(exposure__last_used_at__gte=cutoff, then=Value("recent")),
+        When(exposure__use_count__gt=0, then=Value("old")),
+        default=Value("never"),
+        output_field=CharField(),
+    )
+
+
+def filter_usage(qs, usage: str):
+    """Keep questions whose usage bucket is `usage` (unknown values: no filter)."""
+    if usage not in USAGE_LABELS:
+        return qs
+    return qs.alias(usage=usage_expression()).filter(usage=usage)
+
+
+def order_by_exposure(qs, field: str, descending: bool):
+    """Order by use_count or last_used_at; never-used questions count as 0 / oldest."""
+    expr = F(f"exposure__{field}")
+    expr = expr.desc(nulls_last=True) if descending else expr.asc(nulls_first=True)
+    return qs.order_by(expr, "name", "id")
@@ -0,0 +1,129 @@
+"""
+Facet counts for the question list filters.
+
+One grouped aggregation over the scoped, searched queryset returns a row
+per (master, type, active, hidden, lecturer) combination; every facet is
+folded from those rows in Python. A facet's counts apply the other
+selected filters but not its own, so each dropdown shows what choosing
+another value would give.
+
+The grouped rows are cached per (access scope, search text). Any question
+save/delete, a bulk import, a course change or a selection change (usage
+facet) bumps a generation that drops them all.
+"""
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from faculty.text import fold_tr
+from .access import scope_cache_key
+
+FACET_GENERATION_KEY = "qbank:facets:gen"
+FACET_TIMEOUT = 10 * 60
+
+# facet name -> grouped column
+FACET_FIELDS = {
+    "master": "master_id",
+    "type": "type",
+    "active": "active",
+    "hidden": "hidden",
+    "lecturer": "lecturer_id",
+    # annotated from QuestionExposure, see qbank.exposure.usage_expression
+    "usage": "usage",
+}
+BOOLEAN_LABELS = {
+    "active": {True: "Aktif", False: "Pasif"},
+    "hidden": {True: "Gizli", False: "Görünür"},
+}
+
+
+def invalidate_question_facets():
+    try:
+        cache.incr(FACET_GENERATION_KEY)
+    except ValueError:
+        cache.set(FACET_GENERATION_KEY, 2, None)
+
+
+def _generation() -> int:
+    gen = cache.get(FACET_GENERATION_KEY)
+    if gen is None:
+        cache.add(FACET_GENERATION_KEY, 1, None)
+        gen = cache.get(FACET_GENERATION_KEY, 1)
+    return gen
+
+
+def facet_groups(qs, user, search: str = "") -> list:
+    """The grouped counts for qs (already scoped and searched), cached."""
+    digest = hashlib.md5(json.dumps([scope_cache_key(user), search]).encode()).hexdigest()
+    key = f"qbank:facets:{_generation()}:{digest}"
+    groups = cache.get(key)
+    if groups is None:
+        from .exposure import usage_expression
+        groups = list(
+            qs.order_by()
+            .annotate(usage=usage_expression())
+            .values(
+                *FACET_FIELDS.values(),
+                "master__name", "lecturer__user__first_name", "lecturer__user__last_name",
+            )
+            .annotate(n=Count("id"))
+        )
+        cache.set(key, groups, FACET_TIMEOUT)
+    return groups
+
+
+def _value(group, name):
+    return group[FACET_FIELDS[name]]
+
+
+def _matches(group, name, selected: str) -> bool:
+    value = _value(group, name)
+    if name in BOOLEAN_LABELS:
+        return value == (selected == "1")
+    return str(value) == selected
+
+
+def _label(group, name) -> str:
+    value = _value(group, name)
+    if name == "master":
+        return group["master__name"]
+    if name == "lecturer":
+        return f'{group["lecturer__user__first_name"] or ""} {group["lecturer__user__last_name"] or ""}'.strip()
+    if name == "type":
+        from .models import CourseQuestionDepot
+        return dict(CourseQuestionDepot.QUESTION_TYPES).get(value, value)
+    if name == "usage":
+        from .exposure import USAGE_LABELS
+        return USAGE_LABELS[value]
+    return BOOLEAN_LABELS[name][value]
+
+
+def question_facets(qs, user, search: str = "", selected: dict = None) -> dict:
+    """
+    {facet: [{"value", "label", "count", "selected"}, ...]} for the question
+    list. `selected` holds the current filter values as strings ("" = none).
+    """
+    selected = {k: v for k, v in (selected or {}).items() if k in FACET_FIELDS and v not in ("", None)}
+    groups = facet_groups(qs, user, search)
+
+    facets = {}
+    for name in FACET_FIELDS:
+        others = [(k, v) for k, v in selected.items() if k != name]
+        buckets = {}
+        for g in groups:
+            if not all(_matches(g, k, v) for k, v in others):
+                continue
+            value = _value(g, name)
+            if value not in buckets:
+                buckets[value] = {"value": value, "label": _label(g, name), "count": 0}
+            buckets[value]["count"] += g["n"]
+        items = sorted(buckets.values(), key=lambda b: fold_tr(str(b["label"])))
+        for item in items:
+            item["selected"] = name in selected and _matches(
+                {FACET_FIELDS[name]: item["value"]}, name, selected[name])
+            if name in BOOLEAN_LABELS:
+                item["value"] = "1" if item["value"] else "0"
+        facets[name] = items
+    return facets
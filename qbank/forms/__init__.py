@@ -1,3 +1,7 @@
 from .examsetup_f import ExamSetupForm
 from .coursemaster_f import CourseMasterForm
-from .question_depot_f import CourseQuestionDepotForm
\ No newline at end of file
+from .question_depot_f import CourseQuestionDepotForm
+from .question_import_f import QuestionImportForm
+from .assembly_f import ExamAssemblyForm
+from .booklet_f import ExamBookletForm
+from .scoring_f import ExamScoringForm
@@ -0,0 +1,20 @@
+from django import forms
+
+from ..assembly import SEED_RANGE
+from ..exposure import RECENT_USE_DAYS
+
+
+class ExamAssemblyForm(forms.Form):
+    seed = forms.IntegerField(
+        label="Tohum (seed)", required=False, min_value=1, max_value=SEED_RANGE - 1,
+        help_text="Boş bırakılırsa rastgele seçilir; aynı tohum aynı sınavı üretir.",
+        widget=forms.NumberInput(attrs={"class": "form-control"}),
+    )
+    exclude_days = forms.IntegerField(
+        label="Son kaç günde kullanılan sorular hariç", initial=RECENT_USE_DAYS, min_value=0, max_value=3650,
+        widget=forms.NumberInput(attrs={"class": "form-control"}),
+    )
+    replace = forms.BooleanField(
+        label="Mevcut seçimleri sil ve yeniden çek", required=False,
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
@@ -0,0 +1,17 @@
+from django import forms
+
+from ..assembly import SEED_RANGE
+from ..booklets import VARIANT_CODES
+
+
+class ExamBookletForm(forms.Form):
+    count = forms.TypedChoiceField(
+        label="Kitapçık sayısı", coerce=int, initial=len(VARIANT_CODES),
+        choices=[(n, f"{n} ({VARIANT_CODES[:n]})") for n in range(1, len(VARIANT_CODES) + 1)],
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    seed = forms.IntegerField(
+        label="Tohum (seed)", required=False, min_value=1, max_value=SEED_RANGE - 1,
+        help_text="Boş bırakılırsa rastgele seçilir; aynı tohum aynı kitapçıkları üretir.",
+        widget=forms.NumberInput(attrs={"class": "form-control"}),
+    )
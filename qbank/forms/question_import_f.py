@@ -0,0 +1,36 @@
+import os
+
+from django import forms
+
+from ..imports import IMPORT_FORMATS, detect_format
+from ..models.course_question_depot import CourseQuestionDepot
+
+
+class QuestionImportForm(forms.Form):
+    file = forms.FileField(
+        label="Dosya",
+        widget=forms.ClearableFileInput(attrs={"class": "form-control", "accept": ".xml,.txt"}),
+    )
+    format = forms.ChoiceField(
+        label="Format",
+        required=False,
+        choices=[("", "Dosya uzantısına göre")] + list(IMPORT_FORMATS.items()),
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    type = forms.ChoiceField(
+        label="Soru türü",
+        choices=CourseQuestionDepot.QUESTION_TYPES,
+        initial="theoric",
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+
+    def clean(self):
+        cleaned = super().clean()
+        upload = cleaned.get("file")
+        if upload and not cleaned.get("format"):
+            fmt = detect_format(upload.name)
+            if fmt is None:
+                ext = os.path.splitext(upload.name)[1] or upload.name
+                raise forms.ValidationError(f"'{ext}' uzantısından format anlaşılamadı; lütfen formatı seçin.")
+            cleaned["format"] = fmt
+        return cleaned
@@ -0,0 +1,49 @@
+import os
+
+from django import forms
+
+from ..scoring import SCORING_FORMATS, FixedWidthLayout, detect_format
+
+_DEFAULT_LAYOUT = FixedWidthLayout()
+
+
+def _column(label, initial, min_value=1):
+    return forms.IntegerField(
+        label=label, initial=initial, min_value=min_value, max_value=2000, required=False,
+        widget=forms.NumberInput(attrs={"class": "form-control form-control-sm"}),
+    )
+
+
+class ExamScoringForm(forms.Form):
+    file = forms.FileField(
+        label="Cevap dosyası",
+        widget=forms.ClearableFileInput(attrs={"class": "form-control", "accept": ".csv,.txt,.dat"}),
+    )
+    format = forms.ChoiceField(
+        label="Format",
+        required=False,
+        choices=[("", "Dosya uzantısına göre")] + list(SCORING_FORMATS.items()),
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    # fixed-width layout, 1-based columns
+    no_start = _column("Öğrenci no başlangıç", _DEFAULT_LAYOUT.no_start)
+    no_length = _column("Öğrenci no uzunluk", _DEFAULT_LAYOUT.no_length)
+    name_start = _column("Ad soyad başlangıç (0: yok)", _DEFAULT_LAYOUT.name_start, min_value=0)
+    name_length = _column("Ad soyad uzunluk", _DEFAULT_LAYOUT.name_length, min_value=0)
+    booklet_col = _column("Kitapçık sütunu (0: yok)", _DEFAULT_LAYOUT.booklet_col, min_value=0)
+    answers_start = _column("Cevaplar başlangıç", _DEFAULT_LAYOUT.answers_start)
+
+    def clean(self):
+        cleaned = super().clean()
+        upload = cleaned.get("file")
+        if upload and not cleaned.get("format"):
+            fmt = detect_format(upload.name)
+            if fmt is None:
+                ext = os.path.splitext(upload.name)[1] or upload.name
+                raise forms.ValidationError(f"'{ext}' uzantısından format anlaşılamadı; lütfen formatı seçin.")
+            cleaned["format"] = fmt
+        return cleaned
+
+    def layout(self) -> FixedWidthLayout:
+        values = {name: self.cleaned_data.get(name) for name in FixedWidthLayout.__dataclass_fields__}
+        return FixedWidthLayout(**{k: v for k, v in values.items() if v is not None})
@@ -0,0 +1,2 @@
+from .loader import ImportResult, import_questions
+from .parsers import IMPORT_FORMATS, detect_format, iter_questions
@@ -0,0 +1,127 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.db import transaction
+
+from faculty.text import fold_tr
+
+from ..models import CourseQuestionDepot
+from ..models.course_question_depot import _full_name
+from ..exports.rows import ANSWER_LETTERS
+from ..counters import recount_course_questions
+from ..facets import invalidate_question_facets
+from ..similarity import index_missing
+
+# Questions inserted per INSERT statement.
+IMPORT_BATCH_SIZE = 500
+
+# At most this many skipped questions are listed by name in the result.
+MAX_REPORTED_PROBLEMS = 50
+
+_FRACTION_PLACES = Decimal("0.0000001")
+
+
+def _decimal_limit(name: str) -> Decimal:
+    """Smallest absolute value the DecimalField `name` can no longer store."""
+    f = CourseQuestionDepot._meta.get_field(name)
+    return Decimal(10) ** (f.max_digits - f.decimal_places)
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    skipped: int = 0
+    pictures_dropped: int = 0
+    problems: list = field(default_factory=list)
+
+    def skip(self, name: str, reason: str):
+        self.skipped += 1
+        if len(self.problems) < MAX_REPORTED_PROBLEMS:
+            self.problems.append(f"{name or '(adsız)'}: {reason}")
+
+
+def _build(parsed: dict, master_fields: dict, qtype: str):
+    """
+    CourseQuestionDepot for one parsed question, or a skip reason.
+    Does in memory what cq_pre_save would do per row: lecturer / tag_1 /
+    tag_2 come from the master, single-choice fractions become 1/0 and
+    the name is folded into name_norm.
+    """
+    answers = [(text, fraction) for text, fraction in parsed["answers"] if text]
+    if not parsed.get("question_text"):
+        return None, "soru metni boş"
+    if len(answers) < 2:
+        return None, "en az iki şık gerekli"
+    if len(answers) > len(ANSWER_LETTERS):
+        return None, f"en fazla {len(ANSWER_LETTERS)} şık desteklenir"
+    best = max(range(len(answers)), key=lambda i: answers[i][1])
+    if answers[best][1] <= 0:
+        return None, "doğru şık yok"
+    for name, label in (("default_grade", "puan"), ("penalty", "ceza")):
+        # compared as stored: 999.99999999 rounds to 1000
+        if abs(Decimal(parsed.get(name, 0)).quantize(_FRACTION_PLACES)) >= _decimal_limit(name):
+            return None, f"{label} değeri aralık dışında ({parsed[name]})"
+    if any(abs(fraction) >= _decimal_limit("answer_1_fraction") for _, fraction in answers):
+        return None, "şık oranı aralık dışında"
+
+    single = parsed.get("single", True)
+    values = {k: v for k, v in parsed.items() if k not in ("answers", "pictures", "single")}
+    values["name"] = (parsed.get("name") or "")[:255] or "Please fill this field"
+    values["name_norm"] = fold_tr(values["name"])[:255]
+    if values.get("id_number"):
+        values["id_number"] = values["id_number"][:255]
+    for i, letter in enumerate(ANSWER_LETTERS):
+        text, fraction = answers[i] if i < len(answers) else ("", Decimal(0))
+        if single:
+            fraction = Decimal(i == best)
+        values[f"answer_{i + 1}_text"] = text
+        values[f"answer_{i + 1}_fraction"] = fraction.quantize(_FRACTION_PLACES)
+    values["correct_answer"] = ANSWER_LETTERS[best]
+    return CourseQuestionDepot(single=single, type=qtype, **master_fields, **values), None
+
+
+def import_questions(master, parsed_questions, *, qtype="theoric", batch_size=IMPORT_BATCH_SIZE) -> ImportResult:
+    """
+    Insert `parsed_questions` (see imports.parsers) into `master` with
+    batched bulk_create inside one transaction. Parsing and inserting are
+    interleaved, so only one batch of questions is held in memory.
+
+    bulk_create skips the model signals; the fields cq_pre_save fills are
+    set here from the master, which is read once for the whole import,
+    and the course question counter, facet counts and similarity index are
+    refreshed once at the end.
+    Embedded pictures are not imported (counted in pictures_dropped).
+    """
+    master_fields = {
+        "master": master,
+        "lecturer_id": master.lecturer_id,
+        "tag_1": master.name or "",
+        "tag_2": _full_name(master.lecturer) if master.lecturer_id else "",
+    }
+    result = ImportResult()
+    batch = []
+    with transaction.atomic():
+        for parsed in parsed_questions:
+            if "skip" in parsed:
+                result.skip(parsed.get("name"), parsed["skip"])
+                continue
+            obj, reason = _build(parsed, master_fields, qtype)
+            if obj is None:
+                result.skip(parsed.get("name"), reason)
+                continue
+            if parsed.get("pictures"):
+                result.pictures_dropped += 1
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                CourseQuestionDepot.objects.bulk_create(batch, batch_size=batch_size)
+                result.created += len(batch)
+                batch = []
+        if batch:
+            CourseQuestionDepot.objects.bulk_create(batch, batch_size=batch_size)
+            result.created += len(batch)
+        if result.created:
+            recount_course_questions([master.pk])
+    if result.created:
+        invalidate_question_facets()
+        index_missing(CourseQuestionDepot.objects.filter(master=master))
+    return result
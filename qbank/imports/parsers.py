@@ -0,0 +1,175 @@
+import codecs
+import html
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.utils.html import strip_tags
+from lxml import etree
+from django.utils.text import Truncator
+
+IMPORT_FORMATS = {
+    "moodle_xml": "Moodle XML",
+    "aiken": "Aiken TXT",
+}
+
+_BLOCK_END = re.compile(r"<br\s*/?>|</p>|</div>|</li>", re.IGNORECASE)
+_AIKEN_OPTION = re.compile(r"^([A-Z])[.)]\s+(.*)$")
+_AIKEN_ANSWER = re.compile(r"^ANSWER:\s*([A-Z])\s*$", re.IGNORECASE)
+
+
+def detect_format(filename: str):
+    name = (filename or "").lower()
+    if name.endswith(".xml"):
+        return "moodle_xml"
+    if name.endswith(".txt"):
+        return "aiken"
+    return None
+
+
+def iter_questions(fmt: str, fh):
+    """Parsed questions of the binary file object `fh` in format `fmt`."""
+    if fmt == "moodle_xml":
+        return iter_moodle_xml(fh)
+    if fmt == "aiken":
+        return iter_aiken(codecs.getreader("utf-8-sig")(fh, errors="replace"))
+    raise ValueError(f"Unknown import format: {fmt}")
+
+
+# A parsed question is a dict of CourseQuestionDepot fields plus
+#   "answers": [(text, fraction 0..1), ...]   in source order
+#   "pictures": number of embedded files that were dropped
+# or, for a question that cannot be imported, {"skip": reason, "name": ...}.
+
+
+def _html_to_text(s: str) -> str:
+    # Most answers are bare text; only pay for the HTML parser when needed.
+    if "<" in s:
+        s = strip_tags(_BLOCK_END.sub("\n", s))
+    if "&" in s:
+        s = html.unescape(s)
+    return s.strip()
+
+
+def _flatten(parent) -> str:
+    """Plain text of parent/<text>; HTML-formatted parents are flattened."""
+    node = parent.find("text")
+    raw = node.text if node is not None and node.text else ""
+    if parent.get("format", "html") == "html":
+        return _html_to_text(raw)
+    return raw.strip()
+
+
+def _text(elem, path: str) -> str:
+    parent = elem.find(path)
+    return _flatten(parent) if parent is not None else ""
+
+
+def _value(elem, tag: str, default: str = "") -> str:
+    node = elem.find(tag)
+    return (node.text or "").strip() if node is not None and node.text else default
+
+
+def _decimal(s: str, default="0") -> Decimal:
+    """Decimal of `s`; empty, malformed, NaN and infinite values give `default`."""
+    try:
+        value = Decimal(s or default)
+    except InvalidOperation:
+        return Decimal(default)
+    return value if value.is_finite() else Decimal(default)
+
+
+def _flag(s: str, default: bool) -> bool:
+    if not s:
+        return default
+    return s.lower() in ("1", "true", "yes")
+
+
+def _moodle_question(elem) -> dict:
+    name = _value(elem, "name/text")
+    qtype = elem.get("type")
+    if qtype not in ("multichoice", "truefalse"):
+        return {"skip": f"desteklenmeyen soru türü: {qtype}", "name": name}
+
+    answers = []
+    for ans in elem.iterfind("answer"):
+        answers.append((_flatten(ans), _decimal(ans.get("fraction")) / 100))
+
+    question = {
+        "name": name,
+        "question_text": _text(elem, "questiontext"),
+        "general_feedback": _text(elem, "generalfeedback"),
+        "default_grade": _decimal(_value(elem, "defaultgrade"), "1"),
+        "penalty": _decimal(_value(elem, "penalty")),
+        "hidden": _flag(_value(elem, "hidden"), False),
+        "id_number": _value(elem, "idnumber") or None,
+        "single": qtype == "truefalse" or _flag(_value(elem, "single"), True),
+        "shuffle_answers": _flag(_value(elem, "shuffleanswers"), True),
+        "answer_numbering": _value(elem, "answernumbering", "ABCD")[:10],
+        "show_num_correct": "Yes" if elem.find("shownumcorrect") is not None else "No",
+        "answers": answers,
+        "pictures": len(elem.findall("questiontext/file")),
+    }
+    # Feedback missing from the file keeps the model's Turkish defaults.
+    for field, tag in (("correct_feedback", "correctfeedback"),
+                       ("partially_correct_feedback", "partiallycorrectfeedback"),
+                       ("incorrect_feedback", "incorrectfeedback")):
+        if elem.find(tag) is not None:
+            question[field] = _text(elem, tag)
+    return question
+
+
+def iter_moodle_xml(fh):
+    """
+    Stream <question> elements with lxml's iterparse. Every element is
+    cleared once read and detached from <quiz>, so the tree never grows
+    beyond the question being parsed.
+    """
+    for _, elem in etree.iterparse(fh, events=("end",), tag="question",
+                                   huge_tree=True, resolve_entities=False, no_network=True):
+        if elem.get("type") != "category":
+            yield _moodle_question(elem)
+        elem.clear(keep_tail=False)
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+
+def _aiken_question(stem_lines, options, letter) -> dict:
+    stem = " ".join(stem_lines)
+    name = Truncator(stem).chars(80)
+    letters = [label for label, _ in options]
+    if letter not in letters:
+        return {"skip": f"ANSWER: {letter} şıklarda yok", "name": name}
+    return {
+        "name": name,
+        "question_text": stem,
+        "answers": [(text, Decimal(label == letter)) for label, text in options],
+        "pictures": 0,
+    }
+
+
+def iter_aiken(lines):
+    """
+    Read Aiken text line by line: stem line(s), "A. ..." / "A) ..." options,
+    then "ANSWER: X". A block that runs into a new stem without an ANSWER
+    line is reported as skipped.
+    """
+    stem, options = [], []
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+        m = _AIKEN_ANSWER.match(line)
+        if m and stem and options:
+            yield _aiken_question(stem, options, m.group(1).upper())
+            stem, options = [], []
+            continue
+        m = _AIKEN_OPTION.match(line)
+        if m and stem:
+            options.append((m.group(1), m.group(2).strip()))
+            continue
+        if options:
+            yield {"skip": "ANSWER satırı eksik", "name": Truncator(" ".join(stem)).chars(80)}
+            stem, options = [], []
+        stem.append(line)
+    if stem:
+        yield {"skip": "ANSWER satırı eksik", "name": Truncator(" ".join(stem)).chars(80)}
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from faculty.models import FacultyProfile
+from faculty.models.fct_profile import profile_name_norms
+from faculty.text import fold_tr
+from qbank.models import CourseMaster, CourseQuestionDepot
+
+
+class Command(BaseCommand):
+    help = "Recompute the Turkish-folded search columns (name_norm / last_name_norm)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def _backfill(self, qs, compute, fields, batch_size) -> int:
+        """Write `compute(obj)` for rows whose stored value differs; returns the count."""
+        changed, batch = 0, []
+        for obj in qs.iterator(chunk_size=batch_size):
+            values = compute(obj)
+            if any(getattr(obj, f) != v for f, v in values.items()):
+                for f, v in values.items():
+                    setattr(obj, f, v)
+                batch.append(obj)
+            if len(batch) >= batch_size:
+                qs.model.objects.bulk_update(batch, fields)
+                changed += len(batch)
+                batch = []
+        qs.model.objects.bulk_update(batch, fields)
+        return changed + len(batch)
+
+    def handle(self, *args, **opts):
+        size = opts["batch_size"]
+        n = self._backfill(
+            FacultyProfile.objects.select_related("user").only(
+                "id", "name_norm", "last_name_norm", "user__first_name", "user__last_name"),
+            lambda fp: profile_name_norms(fp.user),
+            ["name_norm", "last_name_norm"], size,
+        )
+        self.stdout.write(f"FacultyProfile: {n} updated")
+        for model in (CourseMaster, CourseQuestionDepot):
+            n = self._backfill(
+                model.objects.only("id", "name", "name_norm"),
+                lambda obj: {"name_norm": fold_tr(obj.name)[:255]},
+                ["name_norm"], size,
+            )
+            self.stdout.write(f"{model.__name__}: {n} updated")
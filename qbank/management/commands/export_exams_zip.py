@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from qbank.models import ExamSetup
+from qbank.exports.bulk import filter_exams, iter_bulk_zip, parse_exam_filters
+from qbank.exports.registry import EXPORTERS
+
+
+class Command(BaseCommand):
+    help = "Write the question exports (Moodle XML, Aiken, GIFT, QTI) of all matching exams into one ZIP file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Path of the ZIP file to write.")
+        parser.add_argument("--program", type=int)
+        parser.add_argument("--committee", type=int)
+        parser.add_argument("--from", dest="date_from", help="YYYY-MM-DD (inclusive)")
+        parser.add_argument("--to", dest="date_to", help="YYYY-MM-DD (inclusive)")
+        parser.add_argument("--type", choices=[t for t, _ in ExamSetup.EXAM_TYPES])
+        parser.add_argument("--formats", default="moodle_xml,aiken",
+                            help=f"Comma separated, any of: {', '.join(EXPORTERS)}")
+        parser.add_argument("--processes", type=int, default=None,
+                            help="Worker processes (default: QBANK_EXPORT_PROCESSES or min(4, CPUs)).")
+
+    def handle(self, *args, **opts):
+        formats = [f for f in opts["formats"].split(",") if f]
+        unknown = set(formats) - set(EXPORTERS)
+        if not formats or unknown:
+            raise CommandError(f"Unknown format(s): {', '.join(sorted(unknown)) or '-'}")
+
+        try:
+            filters = parse_exam_filters(opts)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        exams = filter_exams(ExamSetup.objects.all(), **filters)
+        exam_ids = list(exams.order_by("date", "id").values_list("id", flat=True))
+
+        with open(opts["output"], "wb") as fh:
+            for part in iter_bulk_zip(exam_ids, formats, processes=opts["processes"]):
+                fh.write(part)
+        self.stdout.write(self.style.SUCCESS(f"{len(exam_ids)} sınav -> {opts['output']}"))
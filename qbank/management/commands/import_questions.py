@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from qbank.models import CourseMaster, CourseQuestionDepot
+from qbank.imports import IMPORT_FORMATS, detect_format, import_questions, iter_questions
+from qbank.imports.loader import IMPORT_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Bulk-import a Moodle XML or Aiken file into the question bank of one course."
+
+    def add_arguments(self, parser):
+        parser.add_argument("master", type=int, help="CourseMaster id the questions belong to.")
+        parser.add_argument("path", help="Moodle XML (.xml) or Aiken (.txt) file.")
+        parser.add_argument("--format", choices=list(IMPORT_FORMATS), help="Default: from the file extension.")
+        parser.add_argument("--type", default="theoric", choices=[t for t, _ in CourseQuestionDepot.QUESTION_TYPES])
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **opts):
+        try:
+            master = CourseMaster.objects.select_related("lecturer__user").get(pk=opts["master"])
+        except CourseMaster.DoesNotExist:
+            raise CommandError(f"CourseMaster {opts['master']} not found")
+        fmt = opts["format"] or detect_format(opts["path"])
+        if fmt is None:
+            raise CommandError("Cannot tell the format from the file name; pass --format.")
+
+        with open(opts["path"], "rb") as fh:
+            result = import_questions(master, iter_questions(fmt, fh),
+                                      qtype=opts["type"], batch_size=opts["batch_size"])
+
+        self.stdout.write(f"{result.created} imported, {result.skipped} skipped, "
+                          f"{result.pictures_dropped} with pictures dropped")
+        for problem in result.problems:
+            self.stdout.write(f"  - {problem}")
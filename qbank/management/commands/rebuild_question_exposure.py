@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from qbank.exposure import rebuild_exposure
+
+
+class Command(BaseCommand):
+    help = "Recompute the question exposure table (use counts, last use, per academic year) from all selections."
+
+    def handle(self, *args, **opts):
+        n = rebuild_exposure()
+        self.stdout.write(f"Question exposure: {n} question(s) with selections.")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from qbank.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the question full-text index (SQLite FTS5 / MySQL FULLTEXT) from CourseQuestionDepot."
+
+    def handle(self, *args, **opts):
+        backend = get_search_backend(connection)
+        with connection.cursor() as cursor:
+            backend.rebuild(cursor)
+        self.stdout.write(f"Search index rebuilt ({type(backend).__name__}).")
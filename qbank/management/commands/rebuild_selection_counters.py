@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from qbank.counters import rebuild_counters
+from qbank.models import CourseQuestionTotal, ExamCourseSelection
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-course question counters and per-(exam, course) selection counters."
+
+    def handle(self, *args, **opts):
+        rebuild_counters()
+        self.stdout.write(f"Counters rebuilt: {CourseQuestionTotal.objects.count()} course(s), "
+                          f"{ExamCourseSelection.objects.count()} exam/course pair(s).")
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from qbank.models import QuestionLshBucket, QuestionSignature
+from qbank.similarity import index_missing
+
+
+class Command(BaseCommand):
+    help = "Build the near-duplicate (MinHash/LSH) index for questions that have none; --full recomputes all."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Drop and rebuild every signature.")
+
+    def handle(self, *args, **opts):
+        if opts["full"]:
+            QuestionLshBucket.objects.all().delete()
+            QuestionSignature.objects.all().delete()
+        n = index_missing()
+        self.stdout.write(f"Similarity index: {n} question(s) indexed.")
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from qbank.exports.jobs import claim_next_job, purge_finished_jobs, run_job
+
+# Old finished jobs and their files are purged at most this often (seconds).
+PURGE_INTERVAL = 60 * 60
+
+
+class Command(BaseCommand):
+    help = "Render queued ExportJob rows (Moodle XML, Aiken, event CSV/Excel) to disk."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true",
+                            help="Process the jobs that are queued now, then exit.")
+        parser.add_argument("--interval", type=float, default=2.0,
+                            help="Seconds to sleep when the queue is empty (default: 2).")
+
+    def handle(self, *args, **opts):
+        purged_at = None
+        while True:
+            close_old_connections()
+            job = claim_next_job()
+            if job is None:
+                if purged_at is None or time.monotonic() - purged_at >= PURGE_INTERVAL:
+                    purge_finished_jobs()
+                    purged_at = time.monotonic()
+                if opts["once"]:
+                    return
+                time.sleep(opts["interval"])
+                continue
+            job = run_job(job)
+            self.stdout.write(f"{job} {job.progress}/{job.total}")
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:57
+
+import django.db.models.deletion
+import django.utils.timezone
+import qbank.models.question_picture
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qbank', '0012_exportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionPicture',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image_type', models.CharField(choices=[('Q', 'Soru kökü'), ('F', 'Geri bildirim')], default='Q', max_length=1)),
+                ('image', models.ImageField(storage=qbank.models.question_picture.ContentAddressedStorage(), upload_to=qbank.models.question_picture.picture_upload_to)),
+                ('sha256', models.CharField(db_index=True, editable=False, max_length=64)),
+                ('size', models.PositiveIntegerField(default=0, editable=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pictures', to='qbank.coursequestiondepot')),
+            ],
+            options={
+                'verbose_name': 'Soru görseli',
+                'verbose_name_plural': 'Soru görselleri',
+                'indexes': [models.Index(fields=['question', 'image_type'], name='qbank_quest_questio_b4b2cb_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    from qbank.search import get_search_backend
+    with schema_editor.connection.cursor() as cursor:
+        get_search_backend(schema_editor.connection).install(cursor)
+
+
+def uninstall_search_index(apps, schema_editor):
+    from qbank.search import get_search_backend
+    with schema_editor.connection.cursor() as cursor:
+        get_search_backend(schema_editor.connection).uninstall(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qbank', '0013_questionpicture'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:15
+
+from django.db import migrations, models
+
+from faculty.text import fold_tr
+
+
+def fill_name_norms(apps, schema_editor):
+    for model_name in ("CourseMaster", "CourseQuestionDepot"):
+        model = apps.get_model("qbank", model_name)
+        batch = []
+        for obj in model.objects.only("id", "name").iterator(chunk_size=1000):
+            obj.name_norm = fold_tr(obj.name)[:255]
+            batch.append(obj)
+            if len(batch) >= 1000:
+                model.objects.bulk_update(batch, ["name_norm"])
+                batch = []
+        model.objects.bulk_update(batch, ["name_norm"])
+
+
+def reinstall_search_index(apps, schema_editor):
+    # SQLite adds the column by rebuilding the table, which drops the FTS
+    # triggers of 0014; put them back and re-index the copied rows.
+    from qbank.search import get_search_backend
+    with schema_editor.connection.cursor() as cursor:
+        get_search_backend(schema_editor.connection).install(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qbank', '0014_question_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursemaster',
+            name='name_norm',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='coursequestiondepot',
+            name='name_norm',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(reinstall_search_index, migrations.RunPython.noop),
+        migrations.RunPython(fill_name_norms, migrations.RunPython.noop),
+    ]
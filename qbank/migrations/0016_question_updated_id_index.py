@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('faculty', '0011_facultyprofile_name_norms'),
+        ('qbank', '0015_name_norms'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coursequestiondepot',
+            index=models.Index(fields=['updated_at', 'id'], name='qbank_cqd_updated_id_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:27
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qbank', '0016_question_updated_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionSignature',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='qbank.coursequestiondepot')),
+                ('minhash', models.BinaryField()),
+                ('text_hash', models.CharField(max_length=40)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Soru imzası',
+                'verbose_name_plural': 'Soru imzaları',
+            },
+        ),
+        migrations.CreateModel(
+            name='QuestionLshBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField(db_index=True)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='qbank.coursequestiondepot')),
+            ],
+            options={
+                'unique_together': {('question', 'band')},
+            },
+        ),
+    ]
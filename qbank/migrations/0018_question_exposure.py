@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qbank', '0017_question_similarity_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionExposure',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='exposure', serialize=False, to='qbank.coursequestiondepot')),
+                ('use_count', models.PositiveIntegerField(default=0)),
+                ('last_used_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('year_counts', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('last_exam', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='qbank.examsetup')),
+            ],
+            options={
+                'verbose_name': 'Soru kullanımı',
+                'verbose_name_plural': 'Soru kullanımları',
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_counters(apps, schema_editor):
+    CourseQuestionDepot = apps.get_model("qbank", "CourseQuestionDepot")
+    CourseQuestionSelected = apps.get_model("qbank", "CourseQuestionSelected")
+    CourseQuestionTotal = apps.get_model("qbank", "CourseQuestionTotal")
+    ExamCourseSelection = apps.get_model("qbank", "ExamCourseSelection")
+    CourseQuestionTotal.objects.bulk_create(
+        [CourseQuestionTotal(course_id=master_id, questions=n)
+         for master_id, n in (CourseQuestionDepot.objects.order_by()
+                              .values("master_id").annotate(n=Count("id"))
+                              .values_list("master_id", "n"))],
+        batch_size=1000,
+    )
+    ExamCourseSelection.objects.bulk_create(
+        [ExamCourseSelection(exam_id=exam_id, course_id=master_id, selected=n)
+         for exam_id, master_id, n in (CourseQuestionSelected.objects.filter(exam__isnull=False).order_by()
+                                       .values("exam_id", "master_id").annotate(n=Count("id"))
+                                       .values_list("exam_id", "master_id", "n"))],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qbank', '0018_question_exposure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseQuestionTotal',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='question_total', serialize=False, to='qbank.coursemaster')),
+                ('questions', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Ders soru sayısı',
+                'verbose_name_plural': 'Ders soru sayıları',
+            },
+        ),
+        migrations.CreateModel(
+            name='ExamCourseSelection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('selected', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exam_selections', to='qbank.coursemaster')),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_selections', to='qbank.examsetup')),
+            ],
+            options={
+                'verbose_name': 'Sınav-ders seçim sayısı',
+                'verbose_name_plural': 'Sınav-ders seçim sayıları',
+                'unique_together': {('exam', 'course')},
+            },
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qbank', '0019_selection_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examcourseselection',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qbank', '0020_selection_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=2)),
+                ('seed', models.PositiveIntegerField()),
+                ('items', models.JSONField(default=list)),
+                ('answer_key', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='qbank.examsetup')),
+            ],
+            options={
+                'verbose_name': 'Sınav kitapçığı',
+                'verbose_name_plural': 'Sınav kitapçıkları',
+                'ordering': ['exam', 'code'],
+                'unique_together': {('exam', 'code')},
+            },
+        ),
+    ]
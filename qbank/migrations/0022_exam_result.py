@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qbank', '0021_exam_variant'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('student_no', models.CharField(max_length=32)),
+                ('student_name', models.CharField(blank=True, default='', max_length=150)),
+                ('variant_code', models.CharField(max_length=2)),
+                ('answers', models.TextField(blank=True, default='')),
+                ('correct', models.PositiveSmallIntegerField(default=0)),
+                ('wrong', models.PositiveSmallIntegerField(default=0)),
+                ('blank', models.PositiveSmallIntegerField(default=0)),
+                ('net', models.FloatField(default=0)),
+                ('score', models.FloatField(default=0)),
+                ('scored_at', models.DateTimeField(auto_now_add=True)),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='qbank.examsetup')),
+            ],
+            options={
+                'verbose_name': 'Sınav sonucu',
+                'verbose_name_plural': 'Sınav sonuçları',
+                'ordering': ['exam', '-score', 'student_no'],
+                'unique_together': {('exam', 'student_no')},
+            },
+        ),
+    ]
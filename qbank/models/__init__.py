@@ -1,4 +1,11 @@
 from .course_master import CourseMaster
 from .course_question_depot import CourseQuestionDepot
 from .examsetup import ExamSetup
-from .course_question_selected import CourseQuestionSelected
\ No newline at end of file
+from .course_question_selected import CourseQuestionSelected
+from .export_job import ExportJob
+from .question_picture import QuestionPicture
+from .question_similarity import QuestionSignature, QuestionLshBucket
+from .question_exposure import QuestionExposure
+from .selection_counter import CourseQuestionTotal, ExamCourseSelection
+from .exam_variant import ExamVariant
+from .exam_result import ExamResult
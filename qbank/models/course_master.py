@@ -1,9 +1,11 @@
 from django.utils import timezone
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from faculty.models import FacultyProfile, Committee, Department
 from django.dispatch import receiver
+from faculty.text import fold_tr
+from ..access import invalidate_access_scopes
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,6 +13,7 @@ logger = logging.getLogger(__name__)
 class CourseMaster(models.Model):
 
     name = models.CharField(max_length=255, default="")
+    name_norm = models.CharField(max_length=255, blank=True, default="", db_index=True, editable=False)
     lecturer = models.ForeignKey(FacultyProfile, on_delete=models.CASCADE, default=207, related_name='fct_courses')
     committee = models.ForeignKey(Committee, on_delete=models.CASCADE, default=4, related_name='cmt_courses') 
     department = models.ForeignKey(Department, on_delete=models.CASCADE, default=1, related_name='dpt_courses') 
@@ -32,3 +35,19 @@ class CourseMaster(models.Model):
     def __str__(self):
         return self.name 
 
+
+@receiver(pre_save, sender=CourseMaster)
+def cm_name_norm(sender, instance: CourseMaster, **kwargs):
+    instance.name_norm = fold_tr(instance.name)[:255]
+
+
+@receiver(post_save, sender=CourseMaster)
+@receiver(post_delete, sender=CourseMaster)
+@receiver(post_save, sender=Committee)
+@receiver(post_delete, sender=Committee)
+@receiver(post_save, sender=FacultyProfile)
+@receiver(post_delete, sender=FacultyProfile)
+def cm_scope_changed(sender, **kwargs):
+    # lecturer / committee / chair may have moved, or a user gained or lost
+    # the profile their scope is computed from; cached scopes are stale
+    invalidate_access_scopes()
@@ -1,12 +1,14 @@
 ﻿from django.utils import timezone
 from django.db import models
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.core.exceptions import ValidationError
 from django.apps import apps
 from django.contrib.auth.models import User 
 from .course_master import CourseMaster
 from faculty.models import FacultyProfile
+from faculty.text import fold_tr
+from ..facets import invalidate_question_facets
 
 
 class CourseQuestionDepot(models.Model):
@@ -17,6 +19,7 @@ class CourseQuestionDepot(models.Model):
     ]
     master = models.ForeignKey(CourseMaster, on_delete=models.CASCADE, default=1, related_name='questions')
     name = models.CharField(max_length=255, default="Please fill this field")
+    name_norm = models.CharField(max_length=255, blank=True, default="", db_index=True, editable=False)
     question_text = models.TextField()
     general_feedback = models.TextField(blank=True, default="")
     default_grade = models.DecimalField(max_digits=10, decimal_places=7, default=0.0)
@@ -51,6 +54,12 @@ class CourseQuestionDepot(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            # keyset pagination walks (updated_at, id) in the lists
+            models.Index(fields=["updated_at", "id"], name="qbank_cqd_updated_id_idx"),
+        ]
+
     def __str__(self):
         return self.name + " | Ders: " + self.tag_1 + " | Öğretim Elemanı: " +self.tag_2
 
@@ -71,6 +80,9 @@ class CourseQuestionDepot(models.Model):
 
 
 
+# Model default of tag_1 / tag_2; the question form does not set them.
+TAG_PLACEHOLDER = "Please fill this field"
+
 def _full_name(fp: FacultyProfile) -> str:
     try:
         return fp.user.get_full_name()
@@ -85,17 +97,19 @@ def cq_pre_save(sender, instance: CourseQuestionDepot, **kwargs):
     - Pull tag_1 from master.name
     - Pull tag_2 from lecturer full name
     - Normalize fractions if single-choice
+    - Fold the name for indexed search
     """
+    instance.name_norm = fold_tr(instance.name)[:255]
     m = instance.master
     if m:
         # lecturer ← master.lecturer
         if getattr(m, "lecturer_id", None):
             instance.lecturer_id = m.lecturer_id
             # tag_2 from lecturer name
-            if not instance.tag_2:
+            if not instance.tag_2 or instance.tag_2 == TAG_PLACEHOLDER:
                 instance.tag_2 = _full_name(m.lecturer)
         # tag_1 from course name
-        if not instance.tag_1:
+        if not instance.tag_1 or instance.tag_1 == TAG_PLACEHOLDER:
             instance.tag_1 = (m.name or "")
 
     # Make single-choice consistent: correct gets 1, others 0
@@ -123,3 +137,22 @@ def cq_master_sync(sender, instance: CourseMaster, **kwargs):
             tag_1=instance.name or "",
             tag_2=lecturer_name
         ))
+    invalidate_question_facets()
+
+
+@receiver(post_save, sender=CourseQuestionDepot)
+def cq_export_invalidate(sender, instance: CourseQuestionDepot, created, **kwargs):
+    """An edited question changes the exports of every exam it is selected in."""
+    if created:
+        return
+    from qbank.exports.cache import drop_exam_exports
+    CourseQuestionSelected = apps.get_model("qbank", "CourseQuestionSelected")
+    drop_exam_exports(*CourseQuestionSelected.objects
+                      .filter(question_id=instance.pk)
+                      .values_list("exam_id", flat=True))
+
+
+@receiver(post_save, sender=CourseQuestionDepot)
+@receiver(post_delete, sender=CourseQuestionDepot)
+def cq_facets_invalidate(sender, **kwargs):
+    invalidate_question_facets()
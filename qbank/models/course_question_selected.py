@@ -5,6 +5,8 @@ from .course_question_depot import CourseQuestionDepot
 from .examsetup import ExamSetup
 from faculty.models import FacultyProfile 
 from django.utils.functional import cached_property
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 
 
 
@@ -22,4 +24,24 @@ class CourseQuestionSelected(models.Model):
         ]  
 
     def __str__(self):
-        return f"{self.master.name} - Q{self.question.id} "
\ No newline at end of file
+        return f"{self.master.name} - Q{self.question.id} "
+
+
+@receiver(post_save, sender=CourseQuestionSelected)
+@receiver(post_delete, sender=CourseQuestionSelected)
+def cqs_export_invalidate(sender, instance: CourseQuestionSelected, **kwargs):
+    """Selection changed: cached exports of that exam are stale."""
+    from qbank.exports.cache import drop_exam_exports
+    drop_exam_exports(instance.exam_id)
+
+
+@receiver(post_save, sender=CourseQuestionSelected)
+@receiver(post_delete, sender=CourseQuestionSelected)
+def cqs_exposure_refresh(sender, instance: CourseQuestionSelected, origin=None, **kwargs):
+    """Keep the question's QuestionExposure row in step with its selections."""
+    if kwargs.get("raw") or isinstance(origin, CourseQuestionDepot) or (
+            getattr(origin, "model", None) is CourseQuestionDepot):
+        # the question itself is being deleted, its exposure row goes with it
+        return
+    from qbank.exposure import refresh_exposure
+    refresh_exposure([instance.question_id])
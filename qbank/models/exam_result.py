@@ -0,0 +1,31 @@
+from django.db import models
+
+from .examsetup import ExamSetup
+
+
+class ExamResult(models.Model):
+    """
+    One student's scored answer sheet, written by qbank.scoring. `answers`
+    is the sheet as read, in the printed order of booklet `variant_code`
+    (" " blank, "*" unreadable or more than one mark).
+    """
+    exam = models.ForeignKey(ExamSetup, on_delete=models.CASCADE, related_name="results")
+    student_no = models.CharField(max_length=32)
+    student_name = models.CharField(max_length=150, blank=True, default="")
+    variant_code = models.CharField(max_length=2)
+    answers = models.TextField(blank=True, default="")
+    correct = models.PositiveSmallIntegerField(default=0)
+    wrong = models.PositiveSmallIntegerField(default=0)
+    blank = models.PositiveSmallIntegerField(default=0)
+    net = models.FloatField(default=0)
+    score = models.FloatField(default=0)            # 0-100
+    scored_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = [("exam", "student_no")]
+        ordering = ["exam", "-score", "student_no"]
+        verbose_name = "Sınav sonucu"
+        verbose_name_plural = "Sınav sonuçları"
+
+    def __str__(self):
+        return f"{self.exam_id} / {self.student_no}: {self.score:.2f}"
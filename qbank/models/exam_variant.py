@@ -0,0 +1,32 @@
+from django.db import models
+
+from .examsetup import ExamSetup
+
+
+class ExamVariant(models.Model):
+    """
+    One printed booklet (A, B, ...) of an exam, written by
+    qbank.booklets.plan_variants(). `items` lists the questions in printed
+    order as [question_id, answer order], where the answer order is the
+    original letters in printed order ("CADB": printed A is answer C).
+    `answer_key` holds the printed correct letter of each position.
+    """
+    exam = models.ForeignKey(ExamSetup, on_delete=models.CASCADE, related_name="variants")
+    code = models.CharField(max_length=2)
+    seed = models.PositiveIntegerField()
+    items = models.JSONField(default=list)
+    answer_key = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = [("exam", "code")]
+        ordering = ["exam", "code"]
+        verbose_name = "Sınav kitapçığı"
+        verbose_name_plural = "Sınav kitapçıkları"
+
+    def __str__(self):
+        return f"{self.exam_id} / {self.code}"
+
+    @property
+    def question_ids(self) -> list:
+        return [qid for qid, _ in self.items]
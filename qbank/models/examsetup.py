@@ -3,6 +3,8 @@ from django.utils import timezone
 from faculty.models.program import Program
 from faculty.models.committee import Committee
 from django.core.exceptions import ValidationError
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 
 
 class ExamSetup(models.Model):
@@ -31,3 +33,17 @@ class ExamSetup(models.Model):
         #return self.name
         return f"{self.name} ({self.get_type_display()}) - {self.date.strftime('%Y-%m-%d') if self.date else 'No date'}"
 
+
+@receiver(post_delete, sender=ExamSetup)
+def exam_export_cleanup(sender, instance: ExamSetup, **kwargs):
+    from qbank.exports.cache import drop_exam_exports
+    drop_exam_exports(instance.pk)
+
+
+@receiver(post_save, sender=ExamSetup)
+def exam_exposure_refresh(sender, instance: ExamSetup, created, raw=False, **kwargs):
+    """The exam date decides "last used" and the academic year of its questions."""
+    if created or raw:
+        return
+    from qbank.exposure import refresh_exposure
+    refresh_exposure(instance.coursequestionselected_set.values_list("question_id", flat=True))
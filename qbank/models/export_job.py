@@ -0,0 +1,69 @@
+import os
+
+from django.utils import timezone
+from django.db import models
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from faculty.models import Committee
+from .examsetup import ExamSetup
+
+
+class ExportJob(models.Model):
+    """
+    An export rendered to disk by the background worker
+    (`manage.py run_export_worker`) instead of inside the request.
+    `kind` is one of the keys of qbank.exports.jobs.JOB_KINDS.
+    """
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUSES = [
+        (STATUS_QUEUED, "Sırada"),
+        (STATUS_RUNNING, "Hazırlanıyor"),
+        (STATUS_DONE, "Hazır"),
+        (STATUS_FAILED, "Hata"),
+    ]
+
+    kind = models.CharField(max_length=20)
+    status = models.CharField(max_length=10, choices=STATUSES, default=STATUS_QUEUED)
+    requested_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="export_jobs")
+    exam = models.ForeignKey(ExamSetup, on_delete=models.CASCADE, null=True, blank=True)
+    committee = models.ForeignKey(Committee, on_delete=models.CASCADE, null=True, blank=True)
+    params = models.JSONField(default=dict, blank=True)
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    file_path = models.CharField(max_length=500, blank=True, default="")
+    filename = models.CharField(max_length=255, blank=True, default="")
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+    @property
+    def percent(self) -> int:
+        if self.status == self.STATUS_DONE:
+            return 100
+        if not self.total:
+            return 0
+        return min(int(self.progress * 100 / self.total), 99)
+
+
+@receiver(post_delete, sender=ExportJob)
+def export_job_file_delete(sender, instance: ExportJob, **kwargs):
+    """The rendered file belongs to the job row (purged jobs, deleted users or exams)."""
+    if instance.file_path:
+        try:
+            os.remove(instance.file_path)
+        except FileNotFoundError:
+            pass
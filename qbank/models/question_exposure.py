@@ -0,0 +1,27 @@
+from django.db import models
+
+from .course_question_depot import CourseQuestionDepot
+from .examsetup import ExamSetup
+
+
+class QuestionExposure(models.Model):
+    """
+    How often and how recently a question was selected for an exam.
+    Maintained by qbank.exposure.refresh_exposure(); a question that was
+    never selected has no row.
+    """
+    question = models.OneToOneField(CourseQuestionDepot, on_delete=models.CASCADE,
+                                    primary_key=True, related_name="exposure")
+    use_count = models.PositiveIntegerField(default=0)
+    last_exam = models.ForeignKey(ExamSetup, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    last_used_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    # {"2025-2026": 2, ...}
+    year_counts = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Soru kullanımı"
+        verbose_name_plural = "Soru kullanımları"
+
+    def __str__(self):
+        return f"Q{self.question_id}: {self.use_count}"
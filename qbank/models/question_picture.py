@@ -0,0 +1,98 @@
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .course_question_depot import CourseQuestionDepot
+
+# Files are hashed and read in blocks of this size, never whole.
+PICTURE_BLOCK_SIZE = 64 * 1024
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Storage where the file name is derived from the content hash:
+    saving bytes that are already stored is a no-op, so an image shared by
+    many questions exists once on disk.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        if self.exists(name):
+            return name
+        return super()._save(name, content)
+
+
+def picture_upload_to(instance, filename):
+    ext = os.path.splitext(filename)[1].lower() or ".bin"
+    return f"qpictures/{instance.sha256[:2]}/{instance.sha256}{ext}"
+
+
+def file_sha256(f) -> str:
+    h = hashlib.sha256()
+    f.seek(0)
+    for block in iter(lambda: f.read(PICTURE_BLOCK_SIZE), b""):
+        h.update(block)
+    f.seek(0)
+    return h.hexdigest()
+
+
+class QuestionPicture(models.Model):
+    IMAGE_TYPES = [
+        ("Q", "Soru kökü"),
+        ("F", "Geri bildirim"),
+    ]
+    question = models.ForeignKey(CourseQuestionDepot, on_delete=models.CASCADE, related_name="pictures")
+    image_type = models.CharField(max_length=1, choices=IMAGE_TYPES, default="Q")
+    image = models.ImageField(upload_to=picture_upload_to, storage=ContentAddressedStorage())
+    sha256 = models.CharField(max_length=64, editable=False, db_index=True)
+    size = models.PositiveIntegerField(default=0, editable=False)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Soru görseli"
+        verbose_name_plural = "Soru görselleri"
+        indexes = [
+            models.Index(fields=["question", "image_type"]),
+        ]
+
+    def __str__(self):
+        return f"Q{self.question_id} - {self.sha256[:12]}"
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.image.name)
+
+    def save(self, *args, **kwargs):
+        # A newly assigned file is not committed yet: hash it so upload_to
+        # can place it under its content address.
+        if self.image and not self.image._committed:
+            self.sha256 = file_sha256(self.image.file)
+            self.size = self.image.size or 0
+        super().save(*args, **kwargs)
+
+
+@receiver(post_save, sender=QuestionPicture)
+@receiver(post_delete, sender=QuestionPicture)
+def qp_sync_question_flag(sender, instance: QuestionPicture, **kwargs):
+    """
+    Keep CourseQuestionDepot.picture in step with its pictures. updated_at is
+    bumped explicitly because .update() skips auto_now, and exports key on it.
+    """
+    has_pictures = QuestionPicture.objects.filter(question_id=instance.question_id).exists()
+    (CourseQuestionDepot.objects
+        .filter(pk=instance.question_id)
+        .update(picture=has_pictures, updated_at=timezone.now()))
+
+
+@receiver(post_delete, sender=QuestionPicture)
+def qp_drop_orphan_file(sender, instance: QuestionPicture, **kwargs):
+    """The blob is shared; remove it only when no other picture points at it."""
+    if instance.image and not QuestionPicture.objects.filter(image=instance.image.name).exists():
+        instance.image.storage.delete(instance.image.name)
@@ -0,0 +1,38 @@
+from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .course_question_depot import CourseQuestionDepot
+
+
+class QuestionSignature(models.Model):
+    """MinHash signature of a question stem (see qbank.similarity)."""
+    question = models.OneToOneField(CourseQuestionDepot, on_delete=models.CASCADE,
+                                    primary_key=True, related_name="signature")
+    minhash = models.BinaryField()
+    # sha1 of the normalised text; an unchanged stem is not re-hashed
+    text_hash = models.CharField(max_length=40)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Soru imzası"
+        verbose_name_plural = "Soru imzaları"
+
+
+class QuestionLshBucket(models.Model):
+    """One LSH band of a signature; questions sharing a bucket are candidates."""
+    question = models.ForeignKey(CourseQuestionDepot, on_delete=models.CASCADE, related_name="lsh_buckets")
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField(db_index=True)
+
+    class Meta:
+        unique_together = ("question", "band")
+
+
+@receiver(post_save, sender=CourseQuestionDepot)
+def cq_similarity_index(sender, instance: CourseQuestionDepot, raw=False, **kwargs):
+    if raw:
+        return
+    from qbank.similarity import index_questions
+    index_questions([instance])
@@ -0,0 +1,82 @@
+from django.db import models
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .course_master import CourseMaster
+from .course_question_depot import CourseQuestionDepot
+from .course_question_selected import CourseQuestionSelected
+from .examsetup import ExamSetup
+
+
+class CourseQuestionTotal(models.Model):
+    """Number of questions of a course, kept by qbank.counters."""
+    course = models.OneToOneField(CourseMaster, on_delete=models.CASCADE,
+                                  primary_key=True, related_name="question_total")
+    questions = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Ders soru sayısı"
+        verbose_name_plural = "Ders soru sayıları"
+
+
+class ExamCourseSelection(models.Model):
+    """
+    Number of questions selected for an exam from one course, kept by
+    qbank.counters. The row is also the lock of that selection: writers
+    take it and bump `version` (see qbank.selection.lock_selection).
+    """
+    exam = models.ForeignKey(ExamSetup, on_delete=models.CASCADE, related_name="course_selections")
+    course = models.ForeignKey(CourseMaster, on_delete=models.CASCADE, related_name="exam_selections")
+    selected = models.PositiveIntegerField(default=0)
+    version = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("exam", "course")
+        verbose_name = "Sınav-ders seçim sayısı"
+        verbose_name_plural = "Sınav-ders seçim sayıları"
+
+
+@receiver(pre_save, sender=CourseQuestionDepot)
+def cq_counter_remember_master(sender, instance: CourseQuestionDepot, raw=False, **kwargs):
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._counter_old_master_id = (CourseQuestionDepot.objects
+                                       .filter(pk=instance.pk)
+                                       .values_list("master_id", flat=True)
+                                       .first())
+
+
+@receiver(post_save, sender=CourseQuestionDepot)
+def cq_counter_saved(sender, instance: CourseQuestionDepot, created, raw=False, **kwargs):
+    if raw:
+        return
+    from qbank.counters import bump_course_questions, recount_course_questions
+    if created:
+        bump_course_questions(instance.master_id, 1)
+        return
+    old = getattr(instance, "_counter_old_master_id", None)
+    if old is not None and old != instance.master_id:
+        # a moved question; its selections keep their own master
+        recount_course_questions([old, instance.master_id])
+
+
+@receiver(post_delete, sender=CourseQuestionDepot)
+def cq_counter_deleted(sender, instance: CourseQuestionDepot, **kwargs):
+    from qbank.counters import bump_course_questions
+    bump_course_questions(instance.master_id, -1)
+
+
+@receiver(post_save, sender=CourseQuestionSelected)
+def cqs_counter_saved(sender, instance: CourseQuestionSelected, created, raw=False, **kwargs):
+    if raw or not created or not instance.exam_id:
+        return
+    from qbank.counters import bump_exam_selection
+    bump_exam_selection(instance.exam_id, instance.master_id, 1)
+
+
+@receiver(post_delete, sender=CourseQuestionSelected)
+def cqs_counter_deleted(sender, instance: CourseQuestionSelected, **kwargs):
+    if not instance.exam_id:
+        return
+    from qbank.counters import bump_exam_selection
+    bump_exam_selection(instance.exam_id, instance.master_id, -1)
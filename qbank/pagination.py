@@ -0,0 +1,166 @@
+"""
+Keyset (cursor) pagination for the long lists.
+
+A page is fetched with WHERE (ordering tuple) < (last row's values)
+instead of OFFSET, so page 500 costs the same as page 1. Cursors are
+signed and opaque; the exact COUNT(*) is replaced by a count capped at
+KEYSET_COUNT_CAP rows ("1000+ kayıt").
+
+Ordering terms may follow relations ("master__name"), name annotations
+or "pk"; none of them may be NULL.
+"""
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+KEYSET_SALT = "qbank.keyset"
+KEYSET_COUNT_CAP = 1000
+
+
+class KeysetPage:
+    is_keyset = True
+
+    def __init__(self, object_list, *, next_cursor=None, previous_cursor=None, count=None, count_capped=False):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+        self.count_capped = count_capped
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def _field_name(term: str) -> str:
+    return term.lstrip("-")
+
+
+def encode_cursor(values, direction: str, ordering) -> str:
+    # the ordering is signed in too: a cursor of another sort order starts over
+    return signing.dumps({"v": values, "d": direction, "o": list(ordering)}, salt=KEYSET_SALT, compress=True)
+
+
+def _model_field(model, name: str):
+    """Model field behind an ordering term, or None for an annotation."""
+    field = None
+    for part in name.split("__"):
+        if model is None:
+            return None
+        try:
+            field = model._meta.pk if part == "pk" else model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        model = field.related_model
+    return field
+
+
+def decode_cursor(token: str, model, ordering):
+    """(values, direction) of a cursor, or None for a missing/tampered one."""
+    if not token:
+        return None
+    try:
+        data = signing.loads(token, salt=KEYSET_SALT)
+        raw, direction = data["v"], data["d"]
+        if direction not in ("next", "prev") or data["o"] != list(ordering):
+            return None
+        values = []
+        for term, value in zip(ordering, raw):
+            field = _model_field(model, _field_name(term))
+            values.append(field.to_python(value) if field is not None else value)
+    except (signing.BadSignature, KeyError, TypeError, ValueError, ValidationError):
+        return None
+    return values, direction
+
+
+def _row_key(obj, ordering):
+    out = []
+    for term in ordering:
+        v = obj
+        for part in _field_name(term).split("__"):
+            v = getattr(v, part)
+        out.append(v.isoformat() if hasattr(v, "isoformat") else v)
+    return out
+
+
+def _after(ordering, values, forward: bool) -> Q:
+    """Rows strictly after `values` in `ordering` (or before, walking back)."""
+    cond = Q()
+    for i, term in enumerate(ordering):
+        name = _field_name(term)
+        descending = term.startswith("-")
+        op = "lt" if descending == forward else "gt"
+        step = Q(**{f"{name}__{op}": values[i]})
+        for prev_term, prev_value in zip(ordering[:i], values[:i]):
+            step &= Q(**{_field_name(prev_term): prev_value})
+        cond |= step
+    return cond
+
+
+def _reverse(ordering):
+    return [t[1:] if t.startswith("-") else f"-{t}" for t in ordering]
+
+
+def approximate_count(qs, cap=KEYSET_COUNT_CAP):
+    """COUNT over at most cap+1 rows: (count, capped)."""
+    n = qs.order_by()[: cap + 1].count()
+    return min(n, cap), n > cap
+
+
+def keyset_paginate(qs, ordering, cursor: str = None, per_page: int = 20, *, with_count=True) -> KeysetPage:
+    """
+    One page of `qs` in `ordering` (whose last term must be unique, e.g. "-id").
+    `cursor` is a next/prev token from a previous page; empty means page 1.
+    """
+    ordering = list(ordering)
+    decoded = decode_cursor(cursor, qs.model, ordering)
+    forward = decoded is None or decoded[1] == "next"
+
+    page_qs = qs.order_by(*(ordering if forward else _reverse(ordering)))
+    if decoded is not None:
+        page_qs = page_qs.filter(_after(ordering, decoded[0], forward))
+    rows = list(page_qs[: per_page + 1])
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if not forward:
+        rows.reverse()
+
+    has_next = more if forward else decoded is not None
+    has_prev = decoded is not None if forward else more
+    page = KeysetPage(
+        rows,
+        next_cursor=encode_cursor(_row_key(rows[-1], ordering), "next", ordering) if rows and has_next else None,
+        previous_cursor=encode_cursor(_row_key(rows[0], ordering), "prev", ordering) if rows and has_prev else None,
+    )
+    if with_count:
+        page.count, page.count_capped = approximate_count(qs)
+    return page
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin: paginate by cursor unless the request still uses
+    ?page= (old links) or the view opts out for the current request.
+    Templates get page_obj.is_keyset / next_cursor / previous_cursor.
+    """
+    keyset_ordering = ("-id",)
+
+    def use_keyset(self) -> bool:
+        return "page" not in self.request.GET
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_keyset():
+            return super().paginate_queryset(queryset, page_size)
+        page = keyset_paginate(queryset, self.keyset_ordering, self.request.GET.get("cursor"), page_size)
+        return (None, page, page.object_list, page.has_other_pages())
@@ -0,0 +1,3 @@
+from .engine import ScoringResult, score_exam
+from .parsers import SCORING_FORMATS, FixedWidthLayout, detect_format, iter_sheets
+from .report import iter_results_csv, result_summary
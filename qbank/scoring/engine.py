@@ -0,0 +1,163 @@
+"""
+Scoring of optical answer sheets.
+
+The booklets of the exam (ExamVariant) give, for each printed position,
+the canonical question and the letter translation. Sheets are encoded
+into one uint8 matrix, translated booklet by booklet into canonical
+order with fancy indexing and scored against the key in a single pass;
+results replace the exam's ExamResult rows in one transaction.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+from django.db import transaction
+
+from ..models import CourseQuestionDepot, ExamResult
+from .parsers import ANSWER_MARKS
+
+# Answer codes: 0 blank, 1-5 A-E, INVALID for "*" or a letter the question does not have.
+INVALID = len(ANSWER_MARKS) + 1
+RESULT_BATCH_SIZE = 1000
+
+# At most this many rejected sheets are listed in the result.
+MAX_REPORTED_PROBLEMS = 50
+
+_CODES = np.full(256, INVALID, dtype=np.uint8)
+_CODES[ord(" ")] = 0
+for _i, _c in enumerate(ANSWER_MARKS, start=1):
+    _CODES[ord(_c)] = _i
+
+
+@dataclass
+class ScoringResult:
+    scored: int = 0
+    skipped: int = 0
+    penalty_applied: bool = False
+    mean: float = 0.0
+    problems: list = field(default_factory=list)
+
+    def skip(self, line: int, reason: str):
+        self.skipped += 1
+        if len(self.problems) < MAX_REPORTED_PROBLEMS:
+            self.problems.append(f"Satır {line}: {reason}")
+
+
+@dataclass
+class VariantMap:
+    """Printed position -> canonical question and printed letter -> original letter of one booklet."""
+    positions: np.ndarray        # (P,) canonical question index per printed position
+    letters: np.ndarray          # (P, INVALID + 1) answer code translation per position
+
+
+def encode_answers(answers, width: int) -> np.ndarray:
+    """(students, width) uint8 answer codes; short sheets are padded blank, long ones cut."""
+    raw = "".join(a[:width].ljust(width) for a in answers).encode("ascii", errors="replace")
+    return _CODES[np.frombuffer(raw, dtype=np.uint8)].reshape(len(answers), width)
+
+
+def variant_maps(variants):
+    """
+    Canonical question order (ids), {code: VariantMap} and the canonical
+    key (answer codes) from the stored booklets.
+    """
+    question_ids = sorted(variants[0].question_ids)
+    index = {qid: i for i, qid in enumerate(question_ids)}
+    key = np.zeros(len(question_ids), dtype=np.uint8)
+    maps = {}
+    for v in variants:
+        positions = np.array([index[qid] for qid in v.question_ids], dtype=np.intp)
+        letters = np.full((len(v.items), INVALID + 1), INVALID, dtype=np.uint8)
+        letters[:, 0] = 0
+        for p, ((qid, order), printed) in enumerate(zip(v.items, v.answer_key)):
+            for k, original in enumerate(order, start=1):
+                letters[p, k] = ANSWER_MARKS.index(original) + 1
+            key[index[qid]] = letters[p, ANSWER_MARKS.index(printed) + 1]
+        maps[v.code] = VariantMap(positions, letters)
+    return question_ids, maps, key
+
+
+def score_matrix(canonical: np.ndarray, key: np.ndarray, weights: np.ndarray, penalties: np.ndarray,
+                 apply_penalty: bool):
+    """
+    correct / wrong / blank counts, net points and 0-100 scores of every
+    student at once. A wrong answer (including INVALID) costs its
+    question's penalty share of the question's weight when apply_penalty
+    is set; the net never goes below zero.
+    """
+    correct = canonical == key
+    blank = canonical == 0
+    wrong = ~(correct | blank)
+    net = correct @ weights
+    if apply_penalty:
+        net = net - wrong @ (weights * penalties)
+    net = np.maximum(net, 0)
+    total = weights.sum()
+    score = net * (100.0 / total) if total else np.zeros_like(net)
+    return correct.sum(axis=1), wrong.sum(axis=1), blank.sum(axis=1), net, score
+
+
+def score_exam(exam, sheets) -> ScoringResult:
+    """
+    Score the answer sheets of `exam` against its booklets and replace the
+    exam's results. Every sheet is mapped back to the canonical question
+    order through its booklet, then all students are scored as one matrix.
+    Per-question weight is default_grade (0 counts as 1) and the penalty
+    rule is the question's `penalty`, applied when exam.apply_penalty is set.
+    """
+    variants = list(exam.variants.all())
+    if not variants:
+        raise ValueError("Bu sınavın kitapçıkları yok; önce kitapçıkları oluşturun.")
+    question_ids, maps, key = variant_maps(variants)
+    only_code = variants[0].code if len(variants) == 1 else None
+    result = ScoringResult(penalty_applied=exam.apply_penalty)
+
+    accepted, seen = [], set()
+    for sheet in sheets:
+        code = sheet.booklet or only_code
+        if not sheet.student_no:
+            result.skip(sheet.line, "öğrenci numarası boş")
+        elif sheet.student_no in seen:
+            result.skip(sheet.line, f"{sheet.student_no} numarası dosyada birden fazla kez var")
+        elif code not in maps:
+            result.skip(sheet.line, f"kitapçık türü '{sheet.booklet}' bu sınavda yok")
+        else:
+            seen.add(sheet.student_no)
+            accepted.append((sheet, code))
+    if not accepted:
+        # a wrong file or layout must not wipe the results already stored
+        return result
+
+    width = len(question_ids)
+    codes = encode_answers([s.answers for s, _ in accepted], width)
+    booklets = np.array([code for _, code in accepted], dtype=object)
+    canonical = np.zeros((len(accepted), width), dtype=np.uint8)
+    for code, vmap in maps.items():
+        rows = np.flatnonzero(booklets == code)
+        if rows.size:
+            printed = codes[rows]
+            canonical[rows[:, None], vmap.positions[None, :]] = vmap.letters[np.arange(width), printed]
+
+    weights, penalties = _question_weights(question_ids)
+    correct, wrong, blank, net, score = score_matrix(canonical, key, weights, penalties, exam.apply_penalty)
+
+    results = [ExamResult(
+        exam=exam, student_no=sheet.student_no[:32], student_name=sheet.name[:150], variant_code=code,
+        answers=sheet.answers[:width].ljust(width), correct=int(correct[i]), wrong=int(wrong[i]),
+        blank=int(blank[i]), net=round(float(net[i]), 4), score=round(float(score[i]), 2),
+    ) for i, (sheet, code) in enumerate(accepted)]
+    with transaction.atomic():
+        ExamResult.objects.filter(exam=exam).delete()
+        ExamResult.objects.bulk_create(results, batch_size=RESULT_BATCH_SIZE)
+
+    result.scored = len(results)
+    result.mean = round(float(score.mean()), 2)
+    return result
+
+
+def _question_weights(question_ids):
+    values = {pk: (grade, penalty) for pk, grade, penalty in (CourseQuestionDepot.objects
+                                                              .filter(pk__in=question_ids)
+                                                              .values_list("id", "default_grade", "penalty"))}
+    weights = np.array([float(values.get(pk, (0, 0))[0] or 1) for pk in question_ids])
+    penalties = np.array([float(values.get(pk, (0, 0))[1] or 0) for pk in question_ids])
+    return weights, penalties
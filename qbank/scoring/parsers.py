@@ -0,0 +1,145 @@
+"""
+Answer sheet readers. Both yield one Sheet per student; answers keep the
+printed order of the student's booklet and are normalized to A-E, " "
+for blank and "*" for anything else (double marks, unreadable cells).
+"""
+import csv
+import io
+import os
+import re
+from dataclasses import dataclass
+
+from faculty.text import fold_tr
+
+SCORING_FORMATS = {
+    "csv": "CSV",
+    "fixed": "Sabit genişlikli TXT (optik okuyucu)",
+}
+
+BLANK_MARKS = " -._"
+ANSWER_MARKS = "ABCDE"
+
+# CSV header (folded) -> field
+CSV_COLUMNS = {
+    "ogrenci_no": "student_no", "ogrenci no": "student_no", "numara": "student_no", "no": "student_no",
+    "student_no": "student_no",
+    "ad_soyad": "name", "ad soyad": "name", "adi soyadi": "name", "ad": "name", "name": "name",
+    "kitapcik": "booklet", "kitapcik_turu": "booklet", "kitapcik turu": "booklet", "booklet": "booklet",
+    "cevaplar": "answers", "cevap": "answers", "answers": "answers",
+}
+
+_NORMALIZE = str.maketrans({c: " " for c in BLANK_MARKS})
+
+
+@dataclass(frozen=True)
+class FixedWidthLayout:
+    """1-based columns of an optical reader line."""
+    no_start: int = 1
+    no_length: int = 10
+    name_start: int = 11
+    name_length: int = 30
+    booklet_col: int = 41
+    answers_start: int = 42
+
+    def split(self, line: str):
+        def cut(start, length):
+            return line[start - 1:start - 1 + length].strip() if start else ""
+        return (cut(self.no_start, self.no_length), cut(self.name_start, self.name_length),
+                cut(self.booklet_col, 1), line[self.answers_start - 1:].rstrip("\r\n"))
+
+
+@dataclass
+class Sheet:
+    line: int
+    student_no: str
+    name: str
+    booklet: str
+    answers: str
+
+
+def detect_format(filename: str):
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".txt", ".dat"):
+        return "fixed"
+    return None
+
+
+def normalize_answers(raw: str) -> str:
+    s = (raw or "").upper().translate(_NORMALIZE)
+    return "".join(c if c in ANSWER_MARKS or c == " " else "*" for c in s)
+
+
+def read_text(fh) -> str:
+    """Reader output is UTF-8 or, from older Windows software, cp1254."""
+    data = fh.read()
+    if isinstance(data, str):
+        return data
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp1254", errors="replace")
+
+
+def iter_fixed_width(text: str, layout: FixedWidthLayout = FixedWidthLayout()):
+    for number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        student_no, name, booklet, answers = layout.split(line)
+        yield Sheet(number, student_no, name, booklet.upper(), normalize_answers(answers))
+
+
+def iter_csv(text: str):
+    """
+    Header row required: ogrenci_no, optional ad_soyad and kitapcik, and
+    the answers either in one "cevaplar" column or one column per
+    question ("1", "2", ...). Delimiter is , ; or tab.
+    """
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(io.StringIO(text), dialect)
+    header = next(reader, None)
+    if not header:
+        return
+    fields = {}
+    item_cols = []
+    for i, title in enumerate(header):
+        key = fold_tr(title)
+        if key in CSV_COLUMNS:
+            fields.setdefault(CSV_COLUMNS[key], i)
+        elif re.fullmatch(r"\d+", key):
+            item_cols.append((int(key), i))
+    if "student_no" not in fields:
+        raise ValueError("CSV başlığında öğrenci numarası sütunu (ogrenci_no) bulunamadı.")
+    if "answers" not in fields and not item_cols:
+        raise ValueError("CSV başlığında cevap sütunu (cevaplar ya da 1, 2, ...) bulunamadı.")
+    item_cols = [i for _, i in sorted(item_cols)]
+
+    def cell(row, i):
+        return row[i].strip() if i is not None and i < len(row) else ""
+
+    def mark(value):
+        # one column per question: empty is blank, two letters a double mark
+        return value if len(value) == 1 else ("*" if value else " ")
+
+    for number, row in enumerate(reader, start=2):
+        if not any(c.strip() for c in row):
+            continue
+        if "answers" in fields:
+            answers = row[fields["answers"]] if fields["answers"] < len(row) else ""
+        else:
+            answers = "".join(mark(cell(row, i)) for i in item_cols)
+        yield Sheet(number, cell(row, fields["student_no"]), cell(row, fields.get("name")),
+                    cell(row, fields.get("booklet")).upper(), normalize_answers(answers))
+
+
+def iter_sheets(fmt: str, fh, layout: FixedWidthLayout = FixedWidthLayout()):
+    text = read_text(fh)
+    if fmt == "csv":
+        return iter_csv(text)
+    if fmt == "fixed":
+        return iter_fixed_width(text, layout)
+    raise ValueError(f"Bilinmeyen format: {fmt}")
@@ -0,0 +1,35 @@
+import csv
+
+import numpy as np
+
+RESULT_CSV_HEADERS = ["ogrenci_no", "ad_soyad", "kitapcik", "dogru", "yanlis", "bos", "net", "puan"]
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to the caller."""
+    def write(self, value):
+        return value
+
+
+def iter_results_csv(results):
+    """Yield the results of an exam one CSV line at a time (for StreamingHttpResponse)."""
+    w = csv.writer(_Echo())
+    yield w.writerow(RESULT_CSV_HEADERS)
+    for r in results.values_list("student_no", "student_name", "variant_code", "correct", "wrong", "blank",
+                                 "net", "score").iterator(chunk_size=1000):
+        yield w.writerow(r)
+
+
+def result_summary(results) -> dict:
+    """Count, mean, median, standard deviation, min and max of the scores."""
+    scores = np.fromiter(results.values_list("score", flat=True), dtype=float)
+    if not scores.size:
+        return {"count": 0}
+    return {
+        "count": int(scores.size),
+        "mean": round(float(scores.mean()), 2),
+        "median": round(float(np.median(scores)), 2),
+        "std": round(float(scores.std()), 2),
+        "min": round(float(scores.min()), 2),
+        "max": round(float(scores.max()), 2),
+    }
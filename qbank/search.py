@@ -0,0 +1,224 @@
+"""
+Full-text search over CourseQuestionDepot.
+
+The indexed columns are name, question_text, tag_1 (course name) and
+tag_2 (lecturer name); tag_1/tag_2 are kept denormalized by the model
+signals, so course and lecturer searches need no joins.
+
+- SQLite: an external-content FTS5 table kept in sync by triggers
+- MySQL / MariaDB: an InnoDB FULLTEXT index, queried in boolean mode
+- anything else: prefix lookups on the Turkish-folded name_norm columns
+"""
+import itertools
+import re
+
+from django.db import connection, connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from faculty.text import fold_tr
+from .models import CourseQuestionDepot
+
+SEARCH_COLUMNS = ("name", "question_text", "tag_1", "tag_2")
+
+# Relative weight of each column in the SQLite ranking (same order as SEARCH_COLUMNS).
+SEARCH_WEIGHTS = (10.0, 1.0, 5.0, 5.0)
+
+FTS_TABLE = "qbank_question_fts"
+FULLTEXT_INDEX = "qbank_question_fulltext"
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+# Spellings tried per word for the dotless ı; 2**n grows fast, so cap n.
+MAX_DOTLESS_I_VARIANTS = 3
+
+
+def search_terms(query: str):
+    """Words of the user query; punctuation and operators are dropped."""
+    return _TOKEN.findall(query or "")
+
+
+def tr_variants(term: str):
+    """
+    Spellings of a word the index may hold. The FTS tokenizers fold case
+    and ş/ç/ğ/ö/ü but keep ı apart from i, so a folded "isik" must also
+    be looked up as "ısık", "isık", ...
+    """
+    folded = fold_tr(term)
+    spots = [i for i, ch in enumerate(folded) if ch == "i"][:MAX_DOTLESS_I_VARIANTS]
+    variants = []
+    for mask in itertools.product("iı", repeat=len(spots)):
+        chars = list(folded)
+        for pos, ch in zip(spots, mask):
+            chars[pos] = ch
+        variants.append("".join(chars))
+    return variants
+
+
+class BasicSearch:
+    """
+    No full-text index: question name, course and lecturer are matched on
+    their Turkish-folded, indexed name_norm columns by prefix; only the
+    question text falls back to a substring scan. No ranking.
+    """
+    vendor = None
+
+    def filter(self, qs, query: str):
+        cond = Q()
+        for term in search_terms(query):
+            f = fold_tr(term)
+            cond &= (Q(name_norm__startswith=f) | Q(master__name_norm__startswith=f)
+                     | Q(lecturer__name_norm__startswith=f) | Q(lecturer__last_name_norm__startswith=f)
+                     | Q(question_text__icontains=term))
+        return qs.filter(cond).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    def installed(self, cursor) -> bool:
+        return True
+
+    def install(self, cursor):
+        pass
+
+    def uninstall(self, cursor):
+        pass
+
+    def rebuild(self, cursor):
+        pass
+
+
+class SqliteFtsSearch(BasicSearch):
+    vendor = "sqlite"
+
+    def _match(self, terms) -> str:
+        # every word must match, each as a prefix in any ı/i spelling:
+        # ("kalp"*) AND ("isik"* OR "ısik"* OR ...)
+        # (FTS5 has no implicit AND between parenthesised groups)
+        return " AND ".join(
+            "(" + " OR ".join('"%s"*' % v.replace('"', '""') for v in tr_variants(t)) + ")"
+            for t in terms
+        )
+
+    def filter(self, qs, query: str):
+        terms = search_terms(query)
+        if not terms:
+            return super().filter(qs, query)
+        table = CourseQuestionDepot._meta.db_table
+        weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+        return qs.extra(
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = {table}.id", f"{FTS_TABLE} MATCH %s"],
+            params=[self._match(terms)],
+            # bm25() is smaller for better matches
+            select={"search_rank": f"-bm25({FTS_TABLE}, {weights})"},
+        )
+
+    def installed(self, cursor) -> bool:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name IN (%s, %s, %s, %s)",
+            [FTS_TABLE] + [f"{FTS_TABLE}_{suffix}" for suffix in ("ai", "ad", "au")],
+        )
+        return len(cursor.fetchall()) == 4
+
+    def install(self, cursor):
+        table = CourseQuestionDepot._meta.db_table
+        cols = ", ".join(SEARCH_COLUMNS)
+        new_cols = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+        old_cols = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{cols}, content='{table}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+            f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+    def uninstall(self, cursor):
+        for suffix in ("ai", "ad", "au"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+    def rebuild(self, cursor):
+        # every statement is IF NOT EXISTS, so this also recreates a dropped index
+        self.install(cursor)
+
+
+class MysqlFulltextSearch(BasicSearch):
+    vendor = "mysql"
+
+    # InnoDB ignores words shorter than innodb_ft_min_token_size (default 3).
+    min_token_size = 3
+
+    def filter(self, qs, query: str):
+        terms = search_terms(query)
+        if not terms or any(len(t) < self.min_token_size for t in terms):
+            return super().filter(qs, query)
+        against = " ".join("+(" + " ".join(f"{v}*" for v in tr_variants(t)) + ")" for t in terms)
+        cols = ", ".join(SEARCH_COLUMNS)
+        rank = RawSQL(f"MATCH ({cols}) AGAINST (%s IN BOOLEAN MODE)", [against], output_field=FloatField())
+        return qs.annotate(search_rank=rank).filter(search_rank__gt=0)
+
+    def installed(self, cursor) -> bool:
+        table = CourseQuestionDepot._meta.db_table
+        cursor.execute(f"SHOW INDEX FROM {table} WHERE Key_name = %s", [FULLTEXT_INDEX])
+        return bool(cursor.fetchall())
+
+    def install(self, cursor):
+        if self.installed(cursor):
+            return
+        table = CourseQuestionDepot._meta.db_table
+        cursor.execute(
+            f"ALTER TABLE {table} ADD FULLTEXT INDEX {FULLTEXT_INDEX} ({', '.join(SEARCH_COLUMNS)})"
+        )
+
+    def uninstall(self, cursor):
+        if self.installed(cursor):
+            table = CourseQuestionDepot._meta.db_table
+            cursor.execute(f"ALTER TABLE {table} DROP INDEX {FULLTEXT_INDEX}")
+
+    def rebuild(self, cursor):
+        self.uninstall(cursor)
+        self.install(cursor)
+
+
+_BACKENDS = {b.vendor: b for b in (SqliteFtsSearch(), MysqlFulltextSearch())}
+
+
+def get_search_backend(conn=None):
+    return _BACKENDS.get((conn or connection).vendor, BasicSearch())
+
+
+def ensure_search_index(using="default", **kwargs):
+    """
+    post_migrate: put the index back when it is missing. A migration that
+    rebuilds the question table on SQLite drops the FTS triggers, and the
+    index would silently stop following edits.
+    """
+    conn = connections[using]
+    backend = get_search_backend(conn)
+    table = CourseQuestionDepot._meta.db_table
+    if table not in conn.introspection.table_names():
+        return
+    with conn.cursor() as cursor:
+        if not backend.installed(cursor):
+            backend.install(cursor)
+
+
+def search_questions(qs, query: str):
+    """
+    Narrow a CourseQuestionDepot queryset to the rows matching `query`
+    and annotate `search_rank` (higher is better). Every word must match;
+    each word also matches as a prefix.
+    """
+    return get_search_backend().filter(qs, query)
@@ -0,0 +1,239 @@
+"""
+Saving question selections for an exam.
+
+plan_selection() checks a desired selection ({course_id: [question ids]})
+against the exam in memory: ids that are not questions of that course
+are dropped, already-selected questions are kept first and new ones are
+added in the posted order until CourseMaster.question_set is reached;
+the rest are reported as blocked. write_selection() applies the combined
+insert/delete diff of every course in one transaction and does what the
+per-row signals would have done (exposure, counters, cached exports).
+
+The per-course selection page, the exam-level selection endpoint and the
+assembly engine all write through here.
+
+Writes are serialized per (exam, course): lock_selection() bumps the
+version of the ExamCourseSelection counter rows of the courses being
+written, which locks them until commit (in course order, so two
+multi-course writers cannot deadlock). A caller that passes the versions it read gets SelectionConflict
+when someone else wrote in between; without versions the write still
+waits for the lock and plans against the fresh selection, so the
+question_set cap holds. Writers of different courses never share a row.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, time
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .counters import recount_exam_selection
+from .exports.cache import drop_exam_exports
+from .exposure import refresh_exposure
+from .models import CourseMaster, CourseQuestionDepot, CourseQuestionSelected, ExamCourseSelection
+
+
+class SelectionConflict(Exception):
+    """The selection of some courses changed since the caller read it."""
+
+    def __init__(self, versions: dict):
+        super().__init__("Seçim başka bir kullanıcı tarafından değiştirildi.")
+        self.versions = versions      # {course_id: current version}
+
+
+def exam_open_for_selection(exam) -> bool:
+    """Selections can change until the exam starts, unless it is locked."""
+    if getattr(exam, "locked", False):
+        return False
+    now = timezone.now()
+    start = getattr(exam, "start", None)
+    if start:
+        return start > now
+    exam_date = getattr(exam, "date", None)
+    if exam_date:
+        tz = timezone.get_current_timezone()
+        start_dt = timezone.make_aware(datetime.combine(exam_date, time.min), tz)
+        return start_dt > now
+    return False
+
+
+@dataclass
+class CourseSelection:
+    course_id: int
+    course_name: str
+    required: int
+    selected: list = field(default_factory=list)     # final selection
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    blocked: int = 0                                 # over question_set, not saved
+    invalid: int = 0                                 # not a question of this course
+    version: int = 0                                 # after the write
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.course_id,
+            "name": self.course_name,
+            "required": self.required,
+            "selected": self.selected,
+            "added": self.added,
+            "removed": self.removed,
+            "blocked": self.blocked,
+            "invalid": self.invalid,
+            "version": self.version,
+        }
+
+
+@dataclass
+class SelectionPlan:
+    exam_id: int
+    courses: list = field(default_factory=list)
+
+    @property
+    def added(self) -> int:
+        return sum(len(c.added) for c in self.courses)
+
+    @property
+    def removed(self) -> int:
+        return sum(len(c.removed) for c in self.courses)
+
+    @property
+    def blocked(self) -> int:
+        return sum(c.blocked for c in self.courses)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+def current_selection(exam, course_ids) -> dict:
+    """{course_id: set(question ids)} currently selected for the exam."""
+    current = defaultdict(set)
+    for master_id, qid in (CourseQuestionSelected.objects
+                           .filter(exam=exam, master_id__in=course_ids)
+                           .values_list("master_id", "question_id")):
+        current[master_id].add(qid)
+    return current
+
+
+def selection_versions(exam, course_ids) -> dict:
+    """{course_id: version} to hand out with a selection that may be edited (0 = never written)."""
+    versions = dict(ExamCourseSelection.objects
+                    .filter(exam=exam, course_id__in=course_ids)
+                    .values_list("course_id", "version"))
+    return {pk: versions.get(pk, 0) for pk in course_ids}
+
+
+def lock_selection(exam, course_ids, versions=None) -> None:
+    """
+    Inside a transaction: lock the (exam, course) rows and bump their
+    versions. `versions` ({course_id: version read by the caller}) turns
+    a concurrent change into SelectionConflict.
+    """
+    ids = sorted(set(course_ids))
+    for pk in ids:
+        # write before any read: the UPDATE takes the row lock (and on SQLite
+        # the database write lock, so two writers queue instead of deadlocking)
+        rows = ExamCourseSelection.objects.filter(exam=exam, course_id=pk)
+        if not rows.update(version=F("version") + 1):
+            recount_exam_selection(exam.pk, [pk])
+            rows.update(version=F("version") + 1)
+    versions = versions or {}
+    # versions as they were before this writer's bump
+    current = {pk: v - 1 for pk, v in (ExamCourseSelection.objects
+                                       .filter(exam=exam, course_id__in=ids)
+                                       .values_list("course_id", "version"))}
+    stale = {pk: v for pk, v in current.items() if pk in versions and versions[pk] != v}
+    if stale:
+        raise SelectionConflict(stale)
+
+
+def plan_selection(exam, desired: dict, courses=None) -> SelectionPlan:
+    """
+    Diff of `desired` ({course_id: ordered question ids}) against the
+    exam's selection. `courses` may pass the CourseMaster objects already
+    loaded; courses missing from `desired` are left alone.
+    """
+    if courses is None:
+        courses = CourseMaster.objects.filter(pk__in=list(desired)).only("id", "name", "question_set")
+    courses = {c.pk: c for c in courses}
+    posted = {int(qid) for ids in desired.values() for qid in ids}
+    owner = dict(CourseQuestionDepot.objects
+                 .filter(pk__in=posted, master_id__in=list(courses))
+                 .values_list("id", "master_id"))
+    current = current_selection(exam, list(courses))
+
+    plan = SelectionPlan(exam_id=exam.pk)
+    for course_id, ids in desired.items():
+        course = courses[course_id]
+        required = int(course.question_set or 0)
+        have = current[course_id]
+        ordered, invalid = [], 0
+        for qid in dict.fromkeys(int(x) for x in ids):
+            if owner.get(qid) == course_id:
+                ordered.append(qid)
+            else:
+                invalid += 1
+
+        final = [qid for qid in ordered if qid in have]
+        blocked = 0
+        for qid in ordered:
+            if qid in have:
+                continue
+            if len(final) < required:
+                final.append(qid)
+            else:
+                blocked += 1
+        final_set = set(final)
+        plan.courses.append(CourseSelection(
+            course_id=course_id, course_name=course.name, required=required,
+            selected=sorted(final_set), added=sorted(final_set - have), removed=sorted(have - final_set),
+            blocked=blocked, invalid=invalid,
+        ))
+    return plan
+
+
+def write_selection(exam, added: dict, removed) -> None:
+    """
+    Insert `added` ({course_id: question ids}) and delete `removed`
+    (question ids) for the exam in one transaction. Neither write sends
+    per-row signals; exposure, counters and cached exports are refreshed
+    once for the whole diff. Callers hold lock_selection(), which already
+    bumped each course's version once.
+    """
+    removed = list(removed)
+    rows = [CourseQuestionSelected(master_id=course_id, exam=exam, question_id=qid)
+            for course_id, ids in added.items() for qid in ids]
+    if not rows and not removed:
+        return
+    with transaction.atomic():
+        removed_courses = []
+        if removed:
+            gone = CourseQuestionSelected.objects.filter(exam=exam, question_id__in=removed)
+            removed_courses = list(gone.order_by().values_list("master_id", flat=True).distinct())
+            # one DELETE (nothing references a selection row) instead of a
+            # round of post_delete receivers per row
+            gone._raw_delete(gone.db)
+        CourseQuestionSelected.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+        refresh_exposure([row.question_id for row in rows] + removed)
+        recount_exam_selection(exam.pk, set(added) | set(removed_courses))
+        transaction.on_commit(lambda: drop_exam_exports(exam.pk))
+
+
+def apply_selection(exam, desired: dict, courses=None, versions=None) -> SelectionPlan:
+    """
+    Lock, plan and write in one transaction. `versions` as in
+    lock_selection(); raises SelectionConflict (nothing written) when
+    they are stale. The plan carries the versions after the write.
+    """
+    with transaction.atomic():
+        lock_selection(exam, desired.keys(), versions)
+        plan = plan_selection(exam, desired, courses)
+        if plan.changed:
+            write_selection(exam,
+                            {c.course_id: c.added for c in plan.courses if c.added},
+                            [qid for c in plan.courses for qid in c.removed])
+        after = selection_versions(exam, list(desired))
+    for c in plan.courses:
+        c.version = after[c.course_id]
+    return plan
@@ -0,0 +1,255 @@
+"""
+Near-duplicate questions via MinHash + LSH.
+
+A question (stem plus answer texts, so generic stems such as "Aşağıdakilerden
+hangisi doğrudur?" do not collide on their own) is normalised (tags stripped,
+Turkish-folded), cut into character 5-shingles (robust to the suffix changes
+of a reworded Turkish sentence) and reduced to a NUM_PERM MinHash signature,
+stored in QuestionSignature. The signature is split into BANDS bands of ROWS rows;
+each band hashes to a QuestionLshBucket row. Two questions become
+candidates when they share any bucket (with 32 x 4 that happens from a
+Jaccard similarity of about 0.4 up), and candidates are kept when their
+estimated similarity reaches SIMILARITY_THRESHOLD. Nothing is compared
+pairwise across the bank.
+
+Signatures are refreshed on question save (only when the text changed);
+bulk imports call index_questions() themselves, rebuild_similarity_index
+does the whole bank.
+"""
+import hashlib
+import re
+from collections import defaultdict
+
+import numpy as np
+from django.db import transaction
+
+from faculty.text import fold_tr
+from .models import CourseQuestionDepot, CourseQuestionSelected, ExamSetup, QuestionLshBucket, QuestionSignature
+from .models.course_question_depot import TAG_PLACEHOLDER
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+SIMILARITY_THRESHOLD = 0.5
+# buckets larger than this are not expanded into pairs (runaway guard)
+MAX_BUCKET_SIZE = 500
+# rows shown in the committee report
+REPORT_LIMIT = 300
+TEXT_FIELDS = ("question_text", "answer_1_text", "answer_2_text", "answer_3_text", "answer_4_text", "answer_5_text")
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+# fixed seed: signatures must match across processes and restarts
+_rng = np.random.default_rng(20251)
+_A = _rng.integers(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_ENTITY_RE = re.compile(r"&[#a-z0-9]+;")
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> list:
+    text = _ENTITY_RE.sub(" ", _TAG_RE.sub(" ", text or ""))
+    return _WORD_RE.findall(fold_tr(text))
+
+
+def shingles(words) -> set:
+    text = " ".join(words)
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def question_text(values) -> str:
+    return " ".join(v for v in values if v and v != TAG_PLACEHOLDER)
+
+
+def minhash(shingle_set) -> np.ndarray:
+    """uint32 signature; all-max for an empty text (never bucketed)."""
+    if not shingle_set:
+        return np.full(NUM_PERM, _MAX_HASH, dtype=np.uint32)
+    hv = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little") for s in shingle_set),
+        dtype=np.uint64, count=len(shingle_set),
+    )
+    # a, b, hv < 2**32, so a * hv + b stays inside uint64
+    phv = ((hv[:, None] * _A + _B) % _MERSENNE) & _MAX_HASH
+    return phv.min(axis=0).astype(np.uint32)
+
+
+def band_buckets(signature: np.ndarray) -> list:
+    """One signed 64-bit bucket id per band (band number is part of the hash)."""
+    out = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(bytes([band]) + chunk, digest_size=8).digest()
+        out.append(int.from_bytes(digest, "little", signed=True))
+    return out
+
+
+def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+
+def _signature(raw) -> np.ndarray:
+    return np.frombuffer(bytes(raw), dtype=np.uint32)
+
+
+def index_questions(questions):
+    """
+    (Re)compute signatures and buckets for `questions` (model instances or
+    .values() dicts with id and TEXT_FIELDS). Unchanged texts are skipped.
+    """
+    rows = [(q["id"], question_text(q[f] for f in TEXT_FIELDS)) if isinstance(q, dict)
+            else (q.pk, question_text(getattr(q, f) for f in TEXT_FIELDS))
+            for q in questions]
+    if not rows:
+        return 0
+    known = dict(QuestionSignature.objects
+                 .filter(question_id__in=[pk for pk, _ in rows])
+                 .values_list("question_id", "text_hash"))
+
+    signatures, buckets, changed = [], [], []
+    for pk, text in rows:
+        words = normalize_text(text)
+        text_hash = hashlib.sha1(" ".join(words).encode()).hexdigest()
+        if known.get(pk) == text_hash:
+            continue
+        grams = shingles(words)
+        sig = minhash(grams)
+        changed.append(pk)
+        signatures.append(QuestionSignature(question_id=pk, minhash=sig.tobytes(), text_hash=text_hash))
+        if grams:
+            buckets.extend(QuestionLshBucket(question_id=pk, band=b, bucket=h)
+                           for b, h in enumerate(band_buckets(sig)))
+    if not changed:
+        return 0
+
+    with transaction.atomic():
+        QuestionSignature.objects.filter(question_id__in=changed).delete()
+        QuestionLshBucket.objects.filter(question_id__in=changed).delete()
+        QuestionSignature.objects.bulk_create(signatures)
+        QuestionLshBucket.objects.bulk_create(buckets, batch_size=1000)
+    return len(changed)
+
+
+def index_missing(qs=None, chunk_size=500):
+    """Index every question of qs (default: all) that has no signature yet."""
+    qs = (qs if qs is not None else CourseQuestionDepot.objects.all()).filter(signature__isnull=True)
+    done, batch = 0, []
+    for row in qs.order_by("id").values("id", *TEXT_FIELDS).iterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            done += index_questions(batch)
+            batch = []
+    return done + index_questions(batch)
+
+
+def similar_questions(question, qs=None, threshold=SIMILARITY_THRESHOLD, limit=10):
+    """
+    [(question, score)] most similar to `question`, best first. `qs`
+    limits the candidates (e.g. to the user's access scope).
+    """
+    try:
+        sig = _signature(question.signature.minhash)
+    except QuestionSignature.DoesNotExist:
+        return []
+    candidate_ids = set(
+        QuestionLshBucket.objects
+        .filter(bucket__in=band_buckets(sig))
+        .exclude(question_id=question.pk)
+        .values_list("question_id", flat=True)
+    )
+    if not candidate_ids:
+        return []
+    scored = []
+    for pk, raw in QuestionSignature.objects.filter(question_id__in=candidate_ids).values_list("question_id", "minhash"):
+        score = similarity(sig, _signature(raw))
+        if score >= threshold:
+            scored.append((pk, score))
+    scored.sort(key=lambda x: -x[1])
+    qs = qs if qs is not None else CourseQuestionDepot.objects.all()
+    objs = qs.select_related("master", "lecturer__user").in_bulk([pk for pk, _ in scored])
+    return [(objs[pk], score) for pk, score in scored if pk in objs][:limit]
+
+
+def duplicate_pairs(question_qs, threshold=SIMILARITY_THRESHOLD):
+    """
+    Near-duplicate pairs inside question_qs: [(id_a, id_b, score)], found
+    through shared LSH buckets only, best first.
+    """
+    ids = list(question_qs.values_list("id", flat=True))
+    by_bucket = defaultdict(list)
+    for pk, bucket in (QuestionLshBucket.objects
+                       .filter(question_id__in=ids)
+                       .values_list("question_id", "bucket")
+                       .iterator(chunk_size=2000)):
+        by_bucket[bucket].append(pk)
+
+    # candidate pairs encoded as a * 2**32 + b (a < b), de-duplicated in numpy
+    codes = []
+    for members in by_bucket.values():
+        if 1 < len(members) <= MAX_BUCKET_SIZE:
+            m = np.array(sorted(members), dtype=np.int64)
+            i, j = np.triu_indices(len(m), k=1)
+            codes.append((m[i] << 32) | m[j])
+    if not codes:
+        return []
+    codes = np.unique(np.concatenate(codes))
+    left, right = codes >> 32, codes & 0xFFFFFFFF
+
+    involved = np.union1d(left, right)
+    matrix = np.empty((len(involved), NUM_PERM), dtype=np.uint32)
+    for pk, raw in (QuestionSignature.objects
+                    .filter(question_id__in=involved.tolist())
+                    .values_list("question_id", "minhash")):
+        matrix[np.searchsorted(involved, pk)] = _signature(raw)
+    li, ri = np.searchsorted(involved, left), np.searchsorted(involved, right)
+
+    scores = np.empty(len(codes))
+    for s in range(0, len(codes), 50000):
+        chunk = slice(s, s + 50000)
+        scores[chunk] = np.count_nonzero(matrix[li[chunk]] == matrix[ri[chunk]], axis=1) / NUM_PERM
+    keep = np.flatnonzero(scores >= threshold)
+    keep = keep[np.argsort(-scores[keep], kind="stable")]
+    return list(zip(left[keep].tolist(), right[keep].tolist(), scores[keep].tolist()))
+
+
+def committee_duplicate_report(committee, threshold=SIMILARITY_THRESHOLD, limit=REPORT_LIMIT):
+    """
+    Duplicate pairs among a committee's questions, with the exams where
+    both questions of a pair are selected. Pairs sharing an exam come
+    first; at most `limit` rows are returned.
+
+    Returns (rows, total_pairs, same_exam_pairs).
+    """
+    qs = CourseQuestionDepot.objects.filter(master__committee=committee)
+    pairs = duplicate_pairs(qs, threshold)
+    if not pairs:
+        return [], 0, 0
+    involved = {pk for a, b, _ in pairs for pk in (a, b)}
+    exams = defaultdict(set)
+    for qid, exam_id in (CourseQuestionSelected.objects
+                         .filter(question_id__in=involved, exam__isnull=False)
+                         .values_list("question_id", "exam_id")):
+        exams[qid].add(exam_id)
+
+    shared = [exams[a] & exams[b] for a, b, _ in pairs]
+    same_exam_total = sum(1 for s in shared if s)
+    order = sorted(range(len(pairs)), key=lambda n: (not shared[n], -pairs[n][2]))[:limit]
+
+    shown = {pk for n in order for pk in pairs[n][:2]}
+    objs = qs.select_related("master", "lecturer__user").in_bulk(shown)
+    exam_names = dict(ExamSetup.objects
+                      .filter(id__in={e for n in order for e in shared[n]})
+                      .values_list("id", "name"))
+    rows = [{
+        "a": objs[pairs[n][0]],
+        "b": objs[pairs[n][1]],
+        "score": pairs[n][2],
+        "same_exams": [exam_names[e] for e in sorted(shared[n])],
+    } for n in order]
+    return rows, len(pairs), same_exam_total
@@ -1,3 +1,275 @@
+import io
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Count
 from django.test import TestCase
 
-# Create your tests here.
+from faculty.models import AcadYear, Committee, CourseType, Department, FacultyProfile, Program
+from .assembly import assemble_exam
+from .counters import recount_exam_selection
+from .models import (
+    CourseMaster, CourseQuestionDepot, CourseQuestionSelected, CourseQuestionTotal, ExamCourseSelection,
+    ExamResult, ExamSetup, ExamVariant,
+)
+from .scoring import iter_sheets, score_exam
+from .scoring.parsers import Sheet
+from .selection import SelectionConflict, apply_selection, lock_selection, selection_versions
+
+# question id -> (default_grade, penalty)
+QUESTION_WEIGHTS = {11: (1, 0.25), 12: (2, 0.25), 13: (1, 0.25)}
+
+
+def _question_weights(question_ids):
+    return (np.array([float(QUESTION_WEIGHTS[pk][0]) for pk in question_ids]),
+            np.array([float(QUESTION_WEIGHTS[pk][1]) for pk in question_ids]))
+
+
+class ScoreExamTests(TestCase):
+    """
+    Three questions (11: A, 12: C, 13: B out of five), weights 1 / 2 / 1
+    (total 4) and a quarter penalty each, printed as two booklets:
+
+    A: 11 12 13 in original answer order, key "ACB"
+    B: 13 (EDCBA), 11 (BADC), 12 (CDAB), key "DBA"
+
+    Grades and penalties come from QUESTION_WEIGHTS instead of question
+    rows: the migrations create CourseMaster's table under its default
+    name, not the model's db_table, so questions cannot be saved here.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        dep = Department.objects.create(division="Temel Bilimler", name="Anatomi")
+        user = User.objects.create_user("chair", first_name="Ayşe", last_name="Yılmaz")
+        chair = FacultyProfile.objects.create(user=user, department=dep)
+        program = Program.objects.create(name="Dönem I")
+        committee = Committee.objects.create(name="Kurul 1", phase=program, chair=chair)
+        cls.exam = ExamSetup.objects.create(name="Ara Sınav", program=program, committee=committee)
+        ExamVariant.objects.create(exam=cls.exam, code="A", seed=1, answer_key="ACB",
+                                   items=[[11, "ABCD"], [12, "ABCD"], [13, "ABCDE"]])
+        ExamVariant.objects.create(exam=cls.exam, code="B", seed=2, answer_key="DBA",
+                                   items=[[13, "EDCBA"], [11, "BADC"], [12, "CDAB"]])
+
+    def setUp(self):
+        patcher = mock.patch("qbank.scoring.engine._question_weights", _question_weights)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.exam.apply_penalty = True
+
+    def score(self, *sheets, apply_penalty=True):
+        self.exam.apply_penalty = apply_penalty
+        rows = [Sheet(i, no, "", booklet, answers) for i, (no, booklet, answers) in enumerate(sheets, start=1)]
+        return score_exam(self.exam, rows)
+
+    def result(self, student_no):
+        return ExamResult.objects.get(exam=self.exam, student_no=student_no)
+
+    def assertScored(self, student_no, correct, wrong, blank, net, score):
+        r = self.result(student_no)
+        self.assertEqual((r.correct, r.wrong, r.blank), (correct, wrong, blank))
+        self.assertAlmostEqual(r.net, net)
+        self.assertAlmostEqual(r.score, score)
+
+    def test_all_correct_on_each_booklet(self):
+        result = self.score(("1", "A", "ACB"), ("2", "B", "DBA"))
+        self.assertEqual((result.scored, result.skipped), (2, 0))
+        self.assertScored("1", 3, 0, 0, 4, 100)
+        self.assertScored("2", 3, 0, 0, 4, 100)
+        self.assertEqual(self.result("2").variant_code, "B")
+
+    def test_wrong_answers_are_translated_through_the_booklet(self):
+        # B: printed A of 13 is E (wrong), B of 11 is A (right), C of 12 is A (wrong)
+        self.score(("1", "B", "ABC"))
+        self.assertScored("1", 1, 2, 0, 0.25, 6.25)
+
+    def test_star_marks_count_as_wrong(self):
+        self.score(("1", "A", "*CB"), ("2", "B", "D*A"))
+        self.assertScored("1", 2, 1, 0, 2.75, 68.75)
+        self.assertScored("2", 2, 1, 0, 2.75, 68.75)
+
+    def test_blanks_cost_nothing(self):
+        self.score(("1", "A", "A  "), ("2", "B", ""))
+        self.assertScored("1", 1, 0, 2, 1, 25)
+        self.assertScored("2", 0, 0, 3, 0, 0)
+
+    def test_penalty_off(self):
+        result = self.score(("1", "A", "*CB"), ("2", "B", "ABC"), apply_penalty=False)
+        self.assertFalse(result.penalty_applied)
+        self.assertScored("1", 2, 1, 0, 3, 75)
+        self.assertScored("2", 1, 2, 0, 1, 25)
+
+    def test_net_never_goes_below_zero(self):
+        self.score(("1", "A", "BAA"))
+        self.assertScored("1", 0, 3, 0, 0, 0)
+
+    def test_sheet_without_booklet_code(self):
+        result = self.score(("1", "", "ACB"))
+        self.assertEqual((result.scored, result.skipped), (0, 1))
+
+        self.exam.variants.filter(code="B").delete()
+        result = self.score(("1", "", "ACB"))
+        self.assertEqual((result.scored, result.skipped), (1, 0))
+        self.assertScored("1", 3, 0, 0, 4, 100)
+        self.assertEqual(self.result("1").variant_code, "A")
+
+    def test_rejected_file_keeps_stored_results(self):
+        self.score(("1", "A", "ACB"))
+        result = self.score(("2", "C", "ACB"), ("", "A", "ACB"))
+        self.assertEqual((result.scored, result.skipped), (0, 2))
+        self.assertEqual(list(self.exam.results.values_list("student_no", flat=True)), ["1"])
+
+    def test_csv_upload(self):
+        data = "ogrenci_no;ad_soyad;kitapcik;cevaplar\n1;Ali Veli;a;ACB\n2;Can Su;B;d-a\n2;Can Su;B;DBA\n"
+        result = score_exam(self.exam, iter_sheets("csv", io.BytesIO(data.encode("utf-8"))))
+        self.assertEqual((result.scored, result.skipped), (2, 1))
+        self.assertScored("1", 3, 0, 0, 4, 100)
+        self.assertScored("2", 2, 0, 1, 3, 75)
+        self.assertEqual(self.result("1").student_name, "Ali Veli")
+
+
+def _course_master_table():
+    """
+    The migrations create CourseMaster's table as qbank_coursemaster, the
+    model reads course_master; rename it once (outside any transaction)
+    so tests can save courses and questions.
+    """
+    table = CourseMaster._meta.db_table
+    if table in connection.introspection.table_names():
+        return
+    with connection.schema_editor() as editor:
+        editor.alter_db_table(CourseMaster, "qbank_coursemaster", table)
+
+
+class SelectionTests(TestCase):
+    """
+    Two courses of one committee: "Anatomi" (quota 3, questions 0-5) and
+    "Fizyoloji" (quota 2, questions 0-3), all theoric and active.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        _course_master_table()
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        dep = Department.objects.create(division="Temel Bilimler", name="Anatomi")
+        user = User.objects.create_user("lecturer", first_name="Ali", last_name="Veli")
+        lecturer = FacultyProfile.objects.create(user=user, department=dep)
+        program = Program.objects.create(name="Dönem I")
+        committee = Committee.objects.create(name="Kurul 1", phase=program, chair=lecturer)
+        course_type = CourseType.objects.create(name="Uygulama", acadyear=AcadYear.objects.create(name="2025-2026"))
+        courses = {}
+        for name, quota, count in (("Anatomi", 3, 6), ("Fizyoloji", 2, 4)):
+            course = CourseMaster.objects.create(name=name, lecturer=lecturer, committee=committee, department=dep,
+                                                 type=course_type, question_set=quota)
+            courses[name] = (course, [CourseQuestionDepot.objects.create(
+                master=course, lecturer=lecturer, name=f"{name} {i}", question_text=f"{name} sorusu {i}",
+                correct_answer="A", type="theoric").pk for i in range(count)])
+        cls.anatomy, cls.anatomy_questions = courses["Anatomi"]
+        cls.physiology, cls.physiology_questions = courses["Fizyoloji"]
+        cls.exam = ExamSetup.objects.create(name="Ara Sınav", program=program, committee=committee, type="theoric")
+
+    def selected(self, course):
+        return set(CourseQuestionSelected.objects.filter(exam=self.exam, master=course)
+                   .values_list("question_id", flat=True))
+
+    def counter(self, course):
+        return ExamCourseSelection.objects.get(exam=self.exam, course=course)
+
+    def assertCountersMatch(self):
+        real = dict(CourseQuestionSelected.objects.filter(exam=self.exam)
+                    .order_by().values("master_id").annotate(n=Count("id"))
+                    .values_list("master_id", "n"))
+        stored = dict(ExamCourseSelection.objects.filter(exam=self.exam).values_list("course_id", "selected"))
+        self.assertEqual({pk: n for pk, n in stored.items() if n}, real)
+        totals = dict(CourseQuestionTotal.objects.values_list("course_id", "questions"))
+        real = dict(CourseQuestionDepot.objects.order_by().values("master_id").annotate(n=Count("id"))
+                    .values_list("master_id", "n"))
+        self.assertEqual({pk: n for pk, n in totals.items() if n}, real)
+
+    def test_missing_counter_row_is_created_at_version_0(self):
+        self.assertFalse(ExamCourseSelection.objects.filter(exam=self.exam).exists())
+        self.assertEqual(selection_versions(self.exam, [self.anatomy.pk]), {self.anatomy.pk: 0})
+        with transaction.atomic():
+            lock_selection(self.exam, [self.anatomy.pk], {self.anatomy.pk: 0})
+        row = self.counter(self.anatomy)
+        self.assertEqual((row.selected, row.version), (0, 1))
+
+    def test_apply_selection_writes_and_bumps_the_version(self):
+        q = self.anatomy_questions
+        plan = apply_selection(self.exam, {self.anatomy.pk: q[:4]}, versions={self.anatomy.pk: 0})
+        self.assertEqual(self.selected(self.anatomy), set(q[:3]))
+        course = plan.courses[0]
+        self.assertEqual((course.added, course.blocked, course.version), (q[:3], 1, 1))
+
+        plan = apply_selection(self.exam, {self.anatomy.pk: [q[0], q[5]]}, versions={self.anatomy.pk: 1})
+        self.assertEqual(self.selected(self.anatomy), {q[0], q[5]})
+        self.assertEqual((plan.courses[0].removed, plan.courses[0].version), ([q[1], q[2]], 2))
+        self.assertCountersMatch()
+
+    def test_stale_version_raises_and_writes_nothing(self):
+        q = self.anatomy_questions
+        apply_selection(self.exam, {self.anatomy.pk: q[:2]})
+        with self.assertRaises(SelectionConflict) as caught:
+            apply_selection(self.exam, {self.anatomy.pk: q[2:4], self.physiology.pk: self.physiology_questions[:1]},
+                            versions={self.anatomy.pk: 0, self.physiology.pk: 0})
+        self.assertEqual(caught.exception.versions, {self.anatomy.pk: 1})
+        self.assertEqual(self.selected(self.anatomy), set(q[:2]))
+        self.assertEqual(self.selected(self.physiology), set())
+        self.assertEqual(self.counter(self.anatomy).version, 1)
+        self.assertFalse(ExamCourseSelection.objects.filter(exam=self.exam, course=self.physiology).exists())
+
+    def test_single_row_add_and_remove_bump_counter_and_version(self):
+        q = self.anatomy_questions
+        row = CourseQuestionSelected.objects.create(exam=self.exam, master=self.anatomy, question_id=q[0])
+        first = self.counter(self.anatomy)
+        self.assertEqual(first.selected, 1)
+
+        CourseQuestionSelected.objects.create(exam=self.exam, master=self.anatomy, question_id=q[1])
+        second = self.counter(self.anatomy)
+        self.assertEqual((second.selected, second.version), (2, first.version + 1))
+
+        row.delete()
+        third = self.counter(self.anatomy)
+        self.assertEqual((third.selected, third.version), (1, second.version + 1))
+        self.assertCountersMatch()
+
+    def test_moved_question_recounts_both_courses(self):
+        question = CourseQuestionDepot.objects.get(pk=self.anatomy_questions[0])
+        question.master = self.physiology
+        question.save()
+        self.assertEqual(CourseQuestionTotal.objects.get(course=self.anatomy).questions, 5)
+        self.assertEqual(CourseQuestionTotal.objects.get(course=self.physiology).questions, 5)
+        self.assertCountersMatch()
+
+    def test_deleting_a_question_cascades_to_its_selections(self):
+        q = self.anatomy_questions
+        apply_selection(self.exam, {self.anatomy.pk: q[:3]})
+        CourseQuestionDepot.objects.filter(pk=q[0]).delete()
+        self.assertEqual(self.counter(self.anatomy).selected, 2)
+        self.assertEqual(CourseQuestionTotal.objects.get(course=self.anatomy).questions, 5)
+        self.assertCountersMatch()
+
+    def test_recount_repairs_a_drifted_counter(self):
+        apply_selection(self.exam, {self.anatomy.pk: self.anatomy_questions[:2]})
+        ExamCourseSelection.objects.filter(exam=self.exam).update(selected=9)
+        recount_exam_selection(self.exam.pk, [self.anatomy.pk])
+        self.assertEqual(self.counter(self.anatomy).selected, 2)
+
+    def test_assembly_fills_quotas_and_keeps_counters(self):
+        CourseQuestionSelected.objects.create(exam=self.exam, master=self.anatomy, question_id=self.anatomy_questions[0])
+        before = self.counter(self.anatomy).version
+        result = assemble_exam(self.exam, seed=7, exclude_days=0)
+        self.assertEqual((result.quota, result.total, result.shortfall), (5, 5, 0))
+        self.assertIn(self.anatomy_questions[0], self.selected(self.anatomy))
+        self.assertEqual(len(self.selected(self.physiology)), 2)
+        self.assertEqual(self.counter(self.anatomy).version, before + 1)
+        self.assertCountersMatch()
+
+        result = assemble_exam(self.exam, seed=7, exclude_days=0, replace=True)
+        self.assertEqual(result.total, 5)
+        self.assertCountersMatch()
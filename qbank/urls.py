@@ -2,7 +2,7 @@ from django.urls import path
 from django.conf import settings
 from django.conf.urls.static import static
 from .views.course_master_v import (CourseMasterListView, CourseMasterDetailView, CourseMasterQuestionSelectDetailView,
-    CourseMasterCreateView, CourseMasterUpdateView, CourseMasterDeleteView,
+    CourseMasterCreateView, CourseMasterUpdateView, CourseMasterDeleteView, CourseMasterQuestionImportView,
 )
 from .views.course_question_depot_v import(
     QuestionListView, QuestionDetailView, QuestionCreateView, QuestionUpdateView,
@@ -12,8 +12,12 @@ from .views.course_question_depot_v import(
 from .views.examsetup_v import (
     ExamSetupListView, ExamSetupCreateView, ExamSetupUpdateView,
     ExamSetupDetailView, examsetup_delete, export_exam_to_moodle_xml_light, export_exam_to_aiken_light,
+    export_exams_bulk_zip, export_exam, ExamAssemblyView, ExamBookletView, ExamScoringView,
 )
 from .views.examsetup_v import ExamSetupDetailQuestionListView
+from .views.export_job_v import export_job_start, export_job_status, export_job_download
+from .views.question_select_v import course_candidate_questions, course_question_answers, exam_selection
+from .views.similarity_v import committee_duplicates
 
 
 app_name = "qbank"
@@ -25,6 +29,7 @@ urlpatterns = [
     path("course/new/", CourseMasterCreateView.as_view(), name="course_master_create"),
     path("course/<int:pk>/edit/", CourseMasterUpdateView.as_view(), name="course_master_update"),
     path("course/<int:pk>/delete/", CourseMasterDeleteView.as_view(), name="course_master_delete"),    
+    path("course/<int:pk>/import/", CourseMasterQuestionImportView.as_view(), name="course_master_import"),
 
 
     path("courses/<int:master_id>/questions/", QuestionListByMasterView.as_view(), name="question_list_by_master"),
@@ -36,15 +41,28 @@ urlpatterns = [
 
     path("exams/", ExamSetupListView.as_view(), name="examsetup_list"),
     path("exams/new/", ExamSetupCreateView.as_view(), name="examsetup_create"),
+    path("exams/export/bulk.zip", export_exams_bulk_zip, name="export_exams_bulk_zip"),
     path("exams/<int:pk>/", ExamSetupDetailView.as_view(), name="examsetup_detail"),
     path("exams/<int:pk>/edit/", ExamSetupUpdateView.as_view(), name="examsetup_update"),
     path("exams/<int:pk>/delete/", examsetup_delete, name="examsetup_delete"),   
     path("exams/<int:pk>/questions/", ExamSetupDetailQuestionListView.as_view(), name="examsetup_detail_questions"), 
+    path("exams/<int:pk>/assemble/", ExamAssemblyView.as_view(), name="examsetup_assemble"),
+    path("exams/<int:pk>/booklets/", ExamBookletView.as_view(), name="examsetup_booklets"),
+    path("exams/<int:pk>/scoring/", ExamScoringView.as_view(), name="examsetup_scoring"),
+    path("exams/<int:exam_id>/selection/", exam_selection, name="exam_selection"),
     path("exams/<int:pk>/export/moodle.xml", export_exam_to_moodle_xml_light, name="export_moodle_xml_light"),
     path("exams/<int:pk>/export/aiken.txt", export_exam_to_aiken_light, name="export_aiken_light"), 
+    path("exams/<int:pk>/export/<str:fmt>/", export_exam, name="export_exam"),
+    path("exams/<int:pk>/export-jobs/<str:kind>/", export_job_start, name="export_job_start"),
+    path("committees/<int:committee_id>/export-jobs/<str:kind>/", export_job_start, name="committee_export_job_start"),
+    path("committees/<int:committee_id>/duplicates/", committee_duplicates, name="committee_duplicates"),
+    path("export-jobs/<int:job_id>/", export_job_status, name="export_job_status"),
+    path("export-jobs/<int:job_id>/download/", export_job_download, name="export_job_download"),
 
 
     path("courses/<int:pk>/select-questions/<int:exam_id>/", CourseMasterQuestionSelectDetailView.as_view(), name="course_master_question_select"),
+    path("courses/<int:pk>/select-questions/<int:exam_id>/candidates/", course_candidate_questions, name="course_candidate_questions"),
+    path("courses/<int:pk>/select-questions/<int:exam_id>/answers/<int:qid>/", course_question_answers, name="course_question_answers"),
 
 
 
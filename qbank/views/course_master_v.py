@@ -1,16 +1,21 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.db.models import Q
-from datetime import datetime, time
-from django.utils import timezone
-from django.core.exceptions import ObjectDoesNotExist
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
+from django.utils.html import format_html
+from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, FormView
+from lxml import etree
 from faculty.models import Committee
+from faculty.text import fold_tr
 from ..models import CourseMaster,ExamSetup, CourseQuestionSelected  
-from ..forms import CourseMasterForm
-from ..views.permissions_v import can_manage_course_questions
+from ..forms import CourseMasterForm, QuestionImportForm
+from ..imports import import_questions, iter_questions
+from ..views.permissions_v import can_manage_course_questions, can_add_course_questions
+from ..selection import SelectionConflict, apply_selection, exam_open_for_selection, selection_versions
+from ..pagination import KeysetPaginationMixin
+from ..access import scope_masters
+from ..datatables import Column, DataTable, DataTablesMixin
 
 class OwnerOrSuperuserMixin(UserPassesTestMixin):
     """Sadece superuser veya dersin sahibi (lecturer.user) düzenleyebilir/silebilir."""
@@ -25,11 +30,50 @@ class SuperuserRequiredMixin(UserPassesTestMixin):
     def test_func(self):
         return self.request.user.is_superuser
 
-class CourseMasterListView(LoginRequiredMixin, ListView):
+def search_courses(qs, q: str):
+    """Turkish-folded, indexed prefix lookups ("isik" finds "IŞIK")."""
+    f = fold_tr(q)
+    return qs.filter(
+        Q(name_norm__startswith=f) |
+        Q(lecturer__name_norm__startswith=f) |
+        Q(lecturer__last_name_norm__startswith=f)
+    )
+
+def _lecturer_name(course, ctx=None):
+    if course.lecturer and course.lecturer.user:
+        return format_html("{}", course.lecturer.user.get_full_name())
+    return "—"
+
+def _course_actions(c, ctx):
+    if not ctx["user"].is_superuser:
+        return ""
+    return format_html(
+        '<div class="btn-group"><a class="btn btn-sm btn-outline-primary" href="{}">Düzenle</a>'
+        '<a class="btn btn-sm btn-outline-danger" href="{}">Sil</a></div>',
+        reverse("qbank:course_master_update", args=[c.pk]), reverse("qbank:course_master_delete", args=[c.pk]),
+    )
+
+COURSE_TABLE = DataTable([
+    Column("id", ("id",)),
+    Column("name", ("name",),
+           lambda c, ctx: format_html('<a href="{}">{}</a>', reverse("qbank:course_master_detail", args=[c.pk]), c.name)),
+    Column("committee", ("committee__name",),
+           lambda c, ctx: format_html("{}", c.committee.name) if c.committee else "—"),
+    Column("lecturer", ("lecturer__user__first_name", "lecturer__user__last_name"), _lecturer_name),
+    Column("department", ("department__name",), lambda c, ctx: format_html("{}", c.department.name or "—")),
+    Column("type", ("type__name",), lambda c, ctx: format_html("{}", c.type.name or "—")),
+    Column("active", ("active",),
+           lambda c, ctx: format_html('<span class="badge bg-success">Aktif</span>') if c.active
+           else format_html('<span class="badge bg-secondary">Pasif</span>')),
+    Column("actions", render=_course_actions, class_name="text-end"),
+], search=search_courses)
+
+class CourseMasterListView(LoginRequiredMixin, DataTablesMixin, KeysetPaginationMixin, ListView):
     model = CourseMaster
     context_object_name = "courses"
     template_name = "qbank/course_master_list.html"
     paginate_by = 20
+    datatable = COURSE_TABLE
 
     def get_queryset(self):
         qs = (CourseMaster.objects
@@ -43,11 +87,7 @@ class CourseMasterListView(LoginRequiredMixin, ListView):
         active  = self.request.GET.get("active")
 
         if q:
-            qs = qs.filter(
-                Q(name__icontains=q) |
-                Q(lecturer__user__first_name__icontains=q) |
-                Q(lecturer__user__last_name__icontains=q)
-            )
+            qs = search_courses(qs, q)
         if committee_id:
             qs = qs.filter(committee_id=committee_id)
         if committee_name:
@@ -55,26 +95,7 @@ class CourseMasterListView(LoginRequiredMixin, ListView):
         if active in ("0", "1"):
             qs = qs.filter(active=(active == "1"))
 
-        user = self.request.user
-        if user.is_superuser:
-            return qs
-
-        try:
-            fct = user.facultyprofile
-        except ObjectDoesNotExist:
-            return qs.none()
-
-
-        chair_q = Q(committee__chair_id=fct.id) | Q(committee__chair=fct)
-        if committee_id:
-            if qs.filter(chair_q, committee_id=committee_id).exists():
-                return qs
-        else:
-            if qs.filter(chair_q).exists():
-                return qs.filter(chair_q)
-            
-        lecturer_filter = Q(lecturer=fct)
-        return qs.filter(lecturer_filter).distinct()
+        return scope_masters(qs, self.request.user)
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -88,6 +109,54 @@ class CourseMasterDetailView(LoginRequiredMixin, DetailView):
     template_name = "qbank/course_master_detail.html"
     context_object_name = "course"
 
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["can_import"] = can_add_course_questions(self.request.user, self.object)
+        return ctx
+
+class CourseMasterQuestionImportView(LoginRequiredMixin, UserPassesTestMixin, FormView):
+    """Moodle XML / Aiken dosyasındaki soruları derse toplu olarak ekler."""
+    form_class = QuestionImportForm
+    template_name = "qbank/course_master_import.html"
+
+    def get_course(self) -> CourseMaster:
+        if not hasattr(self, "_course"):
+            self._course = get_object_or_404(
+                CourseMaster.objects.select_related("lecturer__user", "committee"), pk=self.kwargs["pk"]
+            )
+        return self._course
+
+    def test_func(self):
+        return can_add_course_questions(self.request.user, self.get_course())
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["course"] = self.get_course()
+        return ctx
+
+    def form_valid(self, form):
+        course = self.get_course()
+        upload = form.cleaned_data["file"]
+        try:
+            result = import_questions(
+                course,
+                iter_questions(form.cleaned_data["format"], upload),
+                qtype=form.cleaned_data["type"],
+            )
+        except (ValueError, UnicodeDecodeError, etree.XMLSyntaxError) as exc:
+            form.add_error("file", f"Dosya okunamadı: {exc}")
+            return self.form_invalid(form)
+
+        messages.success(self.request, f"{result.created} soru içe aktarıldı.")
+        if result.skipped:
+            messages.warning(
+                self.request,
+                f"{result.skipped} soru atlandı: " + "; ".join(result.problems[:10]),
+            )
+        if result.pictures_dropped:
+            messages.info(self.request, f"{result.pictures_dropped} sorunun görselleri aktarılmadı.")
+        return redirect("qbank:course_master_detail", pk=course.pk)
+
 class CourseMasterCreateView(LoginRequiredMixin, SuperuserRequiredMixin, CreateView):
     model = CourseMaster
     form_class = CourseMasterForm
@@ -147,33 +216,22 @@ class CourseMasterQuestionSelectDetailView(LoginRequiredMixin, UserPassesTestMix
         return can_manage_course_questions(self.request.user, course, exam)
 
     def _is_upcoming_exam(self, exam) -> bool:
-        if getattr(exam, "locked", False):
-            return False
-        now = timezone.now()
-        start = getattr(exam, "start", None)
-        if start:
-            return start > now
-        exam_date = getattr(exam, "date", None)
-        if exam_date:
-            tz = timezone.get_current_timezone()
-            start_dt = timezone.make_aware(datetime.combine(exam_date, time.min), tz)
-            return start_dt > now
-        return False
+        return exam_open_for_selection(exam)
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         exam = self.get_exam()
         course = self.object
 
-        questions = (course.questions
-                     .select_related("lecturer__user")
-                     .order_by("name"))
-
-        selected_ids = set(
-            CourseQuestionSelected.objects
-            .filter(exam=exam, master=course)
-            .values_list("question_id", flat=True)
-        )
+        if "pending_ids" in kwargs:
+            # a save that hit a conflict: show the user's choice again
+            selected_ids = set(kwargs["pending_ids"])
+        else:
+            selected_ids = set(
+                CourseQuestionSelected.objects
+                .filter(exam=exam, master=course)
+                .values_list("question_id", flat=True)
+            )
 
         required = int(getattr(course, "question_set", 0) or 0)
         selected_count = len(selected_ids)
@@ -181,14 +239,16 @@ class CourseMasterQuestionSelectDetailView(LoginRequiredMixin, UserPassesTestMix
 
         exam_upcoming = self._is_upcoming_exam(exam)
 
+        # rows are fetched page by page from course_candidate_questions
         ctx.update(
             exam=exam,
-            questions=questions,
-            selected_ids=selected_ids,
+            question_count=course.questions.count(),
+            selected_ids=sorted(selected_ids),
             required=required,
             selected_count=selected_count,
             remaining=remaining,
             exam_upcoming=exam_upcoming, 
+            selection_version=selection_versions(exam, [course.pk])[course.pk],
         )
         return ctx
 
@@ -202,44 +262,25 @@ class CourseMasterQuestionSelectDetailView(LoginRequiredMixin, UserPassesTestMix
             return redirect(reverse("qbank:course_master_question_select",
                                     args=[course.pk, exam.pk]))
 
-        valid_ids = set(course.questions.values_list("id", flat=True))
-        current_qs = CourseQuestionSelected.objects.filter(exam=exam, master=course)
-        current_ids = set(current_qs.values_list("question_id", flat=True))
-
-        required = int(getattr(course, "question_set", 0) or 0)
-
-        posted_list = request.POST.getlist("qids")
-        ordered_desired = []
-        for x in posted_list:
+        posted = []
+        for x in request.POST.getlist("qids"):
             try:
-                qid = int(x)
+                posted.append(int(x))
             except (TypeError, ValueError):
                 continue
-            if qid in valid_ids:
-                ordered_desired.append(qid)
-
-        desired_final = set(qid for qid in ordered_desired if qid in current_ids)
-        blocked_new = 0
-        for qid in ordered_desired:
-            if qid in current_ids:
-                continue
-            if len(desired_final) < required:
-                desired_final.add(qid)
-            else:
-                blocked_new += 1
-
-        to_add = desired_final - current_ids
-        to_remove = current_ids - desired_final
-
-        if to_add:
-            CourseQuestionSelected.objects.bulk_create(
-                [CourseQuestionSelected(master=course, exam=exam, question_id=qid) for qid in to_add],
-                ignore_conflicts=True
-            )
-        if to_remove:
-            CourseQuestionSelected.objects.filter(
-                exam=exam, master=course, question_id__in=to_remove
-            ).delete()
+        try:
+            version = int(request.POST["version"])
+        except (KeyError, ValueError):
+            version = None
+        try:
+            plan = apply_selection(exam, {course.pk: posted}, courses=[course],
+                                   versions=None if version is None else {course.pk: version})
+        except SelectionConflict:
+            messages.warning(request, "Bu dersin seçimi siz düzenlerken başka bir kullanıcı tarafından değiştirildi. "
+                                      "Sizin seçiminiz korunarak sayfa yenilendi; kontrol edip tekrar kaydedin.")
+            return self.render_to_response(self.get_context_data(pending_ids=posted), status=409)
+        result = plan.courses[0]
+        to_add, to_remove, blocked_new, required = result.added, result.removed, result.blocked, result.required
 
         base_msg = f"{course.name}: {len(to_add)} eklendi, {len(to_remove)} kaldırıldı."
         if blocked_new:
@@ -1,15 +1,23 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
+from django.utils.formats import date_format
+from django.utils.html import format_html
+from django.utils.timezone import template_localtime
 from django.views.decorators.http import require_POST
 from django.views.generic import ListView, DetailView, CreateView, UpdateView
 
 from ..models.course_question_depot import CourseQuestionDepot
-from ..models.course_master import CourseMaster
 from ..forms import CourseQuestionDepotForm
+from ..search import search_questions
+from ..pagination import KeysetPaginationMixin
+from ..access import scope_questions
+from ..facets import FACET_FIELDS, question_facets
+from ..similarity import similar_questions
+from ..exposure import filter_usage
+from ..datatables import Column, DataTable, DataTablesMixin
 
 def _can_edit(user, obj=None):
     if not user.is_authenticated:
@@ -23,71 +31,89 @@ def _can_edit(user, obj=None):
 class QuestionBase(LoginRequiredMixin):
     model = CourseQuestionDepot
 
-class QuestionListView(QuestionBase, ListView):
+def _active_badge(active: bool):
+    if active:
+        return format_html('<span class="badge bg-success">Aktif</span>')
+    return format_html('<span class="badge bg-secondary">Pasif</span>')
+
+def _question_actions(q, ctx):
+    return format_html(
+        '<a class="btn btn-sm btn-outline-primary" href="{}">Düzenle</a> '
+        '<button type="button" class="btn btn-sm btn-outline-danger" data-bs-toggle="modal" '
+        'data-bs-target="#deleteConfirmModal" data-delete-url="{}" data-item-name="{}">Sil</button>',
+        reverse("qbank:question_update", args=[q.pk]), reverse("qbank:question_delete", args=[q.pk]), q.name,
+    )
+
+QUESTION_TABLE = DataTable([
+    Column("name", ("name",),
+           lambda q, ctx: format_html('<a href="{}">{}</a>', reverse("qbank:question_detail", args=[q.pk]), q.name)),
+    Column("master", ("master__name",), lambda q, ctx: format_html("{}", q.master.name)),
+    Column("lecturer", ("lecturer__user__first_name", "lecturer__user__last_name"),
+           lambda q, ctx: format_html("{}", q.lecturer.user.get_full_name())),
+    Column("type", ("type",)),
+    Column("active", ("active",), lambda q, ctx: _active_badge(q.active)),
+    Column("updated_at", ("updated_at",),
+           lambda q, ctx: date_format(template_localtime(q.updated_at), "d.m.Y H:i")),
+    Column("actions", render=_question_actions, class_name="text-end"),
+], search=search_questions)
+
+class QuestionListView(QuestionBase, DataTablesMixin, KeysetPaginationMixin, ListView):
     template_name = "qbank/question_list.html"
     context_object_name = "questions"
     paginate_by = 20
+    keyset_ordering = ("-updated_at", "-id")
+    datatable = QUESTION_TABLE
 
-    def _role_scoped_qs(self, qs):
-        user = self.request.user
-        if getattr(user, "is_superuser", False):
-            return qs
-        try:
-            fp_id = user.facultyprofile.id
-        except Exception:
-            return qs.none()
+    def use_keyset(self):
+        # search results are ranked, so they keep page numbers
+        return super().use_keyset() and not self.request.GET.get("q")
 
-        chair_q = Q(master__committee__chair_id=fp_id)
-        owner_q = Q(master__lecturer__user_id=user.id)
-        return qs.filter(chair_q | owner_q).distinct()
-
-    def get_queryset(self):
+    def get_base_queryset(self):
+        """Scope and search only; the filters below are the facets."""
         qs = (CourseQuestionDepot.objects
               .select_related("master", "lecturer__user")
               .order_by("-updated_at", "-id"))
 
-        qs = self._role_scoped_qs(qs)
+        qs = scope_questions(qs, self.request.user)
         q = self.request.GET.get("q")
+        if q:
+            # full-text index; best matches first
+            qs = search_questions(qs, q).order_by("-search_rank", "-updated_at", "-id")
+        return qs
+
+    def get_queryset(self):
+        qs = self.get_base_queryset()
         master_id = self.request.GET.get("master")
         qtype = self.request.GET.get("type")
         active = self.request.GET.get("active")
+        hidden = self.request.GET.get("hidden")
+        lecturer_id = self.request.GET.get("lecturer")
+        usage = self.request.GET.get("usage")
 
-        if q:
-            qs = qs.filter(
-                Q(name__icontains=q) |
-                Q(question_text__icontains=q) |
-                Q(tag_1__icontains=q) |
-                Q(tag_2__icontains=q)
-            )
         if master_id:
             qs = qs.filter(master_id=master_id)
         if qtype:
             qs = qs.filter(type=qtype)
         if active in ("0", "1"):
             qs = qs.filter(active=(active == "1"))
+        if hidden in ("0", "1"):
+            qs = qs.filter(hidden=(hidden == "1"))
+        if lecturer_id:
+            qs = qs.filter(lecturer_id=lecturer_id)
+        if usage:
+            qs = filter_usage(qs, usage)
 
         return qs
 
-    def _role_scoped_masters(self):
-        """Masters list for the dropdown must respect the same scope."""
-        user = self.request.user
-        base = CourseMaster.objects.order_by("name")
-        if getattr(user, "is_superuser", False):
-            return base
-        try:
-            fp_id = user.facultyprofile.id
-        except Exception:
-            return base.none()
-
-        chair_q = Q(committee__chair_id=fp_id)
-        owner_q = Q(lecturer__user_id=user.id)
-        return base.filter(chair_q | owner_q).distinct()
-
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         selected = self.request.GET.get("master")  
         ctx["selected_master"] = str(selected) if selected else ""
-        ctx["masters"] = self._role_scoped_masters()
+        ctx["facets"] = question_facets(
+            self.get_base_queryset(), self.request.user,
+            search=self.request.GET.get("q") or "",
+            selected={name: self.request.GET.get(name, "") for name in FACET_FIELDS},
+        )
         return ctx
 
 class QuestionListByMasterView(QuestionListView):
@@ -108,6 +134,13 @@ class QuestionDetailView(QuestionBase, DetailView):
     template_name = "qbank/question_detail.html"
     context_object_name = "question"
 
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        # near-duplicates the user is allowed to see
+        ctx["similar_questions"] = similar_questions(
+            self.object, qs=scope_questions(CourseQuestionDepot.objects.all(), self.request.user))
+        return ctx
+
 class QuestionCreateView(QuestionBase, CreateView):
     form_class = CourseQuestionDepotForm
     template_name = "qbank/question_form.html"
@@ -1,22 +1,34 @@
-import os, base64, xml.etree.ElementTree as ET
-from django.utils.html import escape
-from datetime import datetime, time
+import csv
+
 from django.utils import timezone
-import re
-from django.http import HttpResponse
-from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
+from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Case, F, FilteredRelation, IntegerField, Sum, When
+from django.db.models.functions import Coalesce
+from django.utils.html import format_html
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
 from django.views.decorators.http import require_POST
 from django.utils.decorators import method_decorator
 from django.views.generic import ListView, CreateView, UpdateView, DetailView
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.paginator import Paginator
 
 from ..models import ExamSetup, CourseMaster, CourseQuestionSelected
-from ..forms import ExamSetupForm
+from ..forms import ExamSetupForm, ExamAssemblyForm, ExamBookletForm, ExamScoringForm
+from ..assembly import assemble_exam
+from ..booklets import plan_variants, variants_outdated
+from ..scoring import iter_results_csv, iter_sheets, result_summary, score_exam
+from ..selection import exam_open_for_selection
+from ..exports.registry import EXPORTERS, get_exporter
+from ..exports.cache import cached_export_response
+from ..exports.bulk import filter_exams, iter_bulk_zip, parse_exam_filters
+from ..exports.booklet import iter_booklet_zip
+from ..access import scope_masters
+from ..datatables import Column, DataTable, is_datatables_request
+from .course_master_v import search_courses, _lecturer_name
 from faculty.models import Program, Committee  
 
 class ExamSetupListView(LoginRequiredMixin, ListView):
@@ -45,7 +57,12 @@ class ExamSetupListView(LoginRequiredMixin, ListView):
             qs = qs.filter(committee_id=committee)
         if locked in ("0", "1"):
             qs = qs.filter(locked=(locked == "1"))
-        return qs
+        try:
+            dates = parse_exam_filters({k: self.request.GET.get(k) for k in ("date_from", "date_to")})
+        except ValueError:
+            # the list just ignores a date it cannot read; the ZIP link rejects it
+            dates = {}
+        return filter_exams(qs, **dates)
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -79,14 +96,65 @@ class ExamSetupUpdateView(LoginRequiredMixin, SuperuserRequiredMixin, UpdateView
         resp = super().form_valid(form)
         return redirect(reverse("qbank:examsetup_list"))
 
-class ExamSetupDetailView(LoginRequiredMixin, DetailView):
-    model = ExamSetup
-    template_name = "qbank/examsetup_detail.html"
-    context_object_name = "exam"
-
-    def get_queryset(self):
-        return (ExamSetup.objects
-                .select_related("program", "committee"))
+def exam_course_queryset(exam, user, show_all: bool):
+    """
+    Courses of the exam's committee visible to the user, with question and
+    selection counts joined from the maintained counters (qbank.counters)
+    so the table can sort on them in the database.
+    """
+    base_qs = (CourseMaster.objects
+               .select_related("lecturer__user", "department", "type")
+               .filter(committee=exam.committee)
+               .order_by("name"))
+    courses = base_qs if show_all else scope_masters(base_qs, user)
+
+    return courses.annotate(
+        this_exam=FilteredRelation("exam_selections", condition=Q(exam_selections__exam=exam)),
+    ).annotate(
+        total_questions=Coalesce(F("question_total__questions"), 0),
+        selected_count=Coalesce(F("this_exam__selected"), 0),
+    ).annotate(status_rank=Case(
+        When(selected_count=F("question_set"), then=3),
+        When(selected_count__lt=F("question_set"), then=2),
+        default=1, output_field=IntegerField(),
+    ))
+
+
+def _exam_course_name(c, ctx):
+    return format_html(
+        '<a class="fw-semibold text-decoration-none" href="{}">{}</a>'
+        '<div class="small text-muted">Toplam soru: {}</div>',
+        reverse("qbank:course_master_question_select", args=[c.pk, ctx["exam"].pk]), c.name, c.total_questions,
+    )
+
+def _exam_course_selection(c, ctx):
+    selected = format_html('<span class="badge bg-primary">{}</span> / ', c.selected_count)
+    if ctx["can_edit_qset"]:
+        return selected + format_html(
+            '<input type="number" class="form-control form-control-sm d-inline-block text-center" '
+            'style="max-width: 90px;" name="qs_{}" value="{}" min="0" step="1" inputmode="numeric">',
+            c.pk, c.question_set)
+    return selected + format_html('<span class="text-muted">{}</span>', c.question_set)
+
+def _exam_course_status(c, ctx):
+    if c.selected_count == c.question_set:
+        return format_html('<span class="badge bg-success">Tamam</span>')
+    if c.selected_count < c.question_set:
+        return format_html('<span class="badge bg-warning text-dark">Eksik: {}</span>', c.question_set - c.selected_count)
+    return format_html('<span class="badge bg-danger">Fazla: {}</span>', c.selected_count - c.question_set)
+
+EXAM_COURSE_TABLE = DataTable([
+    Column("name", ("name",), _exam_course_name),
+    Column("lecturer", ("lecturer__user__first_name", "lecturer__user__last_name"), _lecturer_name),
+    Column("department", ("department__name",), lambda c, ctx: format_html("{}", c.department.name or "—")),
+    Column("type", ("type__name",), lambda c, ctx: format_html("{}", c.type.name or "—")),
+    Column("selection", ("selected_count", "question_set"), _exam_course_selection, class_name="text-center"),
+    Column("status", ("status_rank",), _exam_course_status, class_name="text-center"),
+], search=search_courses, page_length=100)
+
+
+class ExamAccessMixin:
+    """Chair / upcoming checks shared by the exam detail and assembly views."""
 
     def _is_exam_chair(self, user, exam) -> bool:
         if not user.is_authenticated:
@@ -114,68 +182,33 @@ class ExamSetupDetailView(LoginRequiredMixin, DetailView):
         return False
 
     def _is_upcoming_exam(self, exam) -> bool:
-        if getattr(exam, "locked", False):
-            return False
-        now = timezone.now()
-        start = getattr(exam, "start", None)
-        if start:
-            return start > now
-        exam_date = getattr(exam, "date", None)
-        if exam_date:
-            tz = timezone.get_current_timezone()
-            start_dt = timezone.make_aware(datetime.combine(exam_date, time.min), tz)
-            return start_dt > now
-        return False
+        return exam_open_for_selection(exam)
+
+    def _can_manage_exam(self, user, exam) -> bool:
+        return user.is_superuser or self._is_exam_chair(user, exam)
+
+
+class ExamSetupDetailView(LoginRequiredMixin, ExamAccessMixin, DetailView):
+    model = ExamSetup
+    template_name = "qbank/examsetup_detail.html"
+    context_object_name = "exam"
+
+    def get_queryset(self):
+        return (ExamSetup.objects
+                .select_related("program", "committee"))
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         exam = self.object
         user = self.request.user
 
-        base_qs = (CourseMaster.objects
-                   .select_related("lecturer__user", "department", "type")
-                   .filter(committee=exam.committee)
-                   .order_by("name"))
-
         show_all = user.is_superuser or self._is_exam_chair(user, exam)
+        courses = exam_course_queryset(exam, user, show_all)
+        totals = courses.aggregate(selected=Sum("selected_count"), required=Sum("question_set"), n=Count("id"))
+        selected_total = int(totals["selected"] or 0)
+        required_total = int(totals["required"] or 0)
 
-        if show_all:
-            courses = base_qs
-        else:
-            try:
-                fct = user.facultyprofile
-            except ObjectDoesNotExist:
-                courses = base_qs.none()
-            else:
-                lecturer_filter = Q(lecturer=fct)
-                courses = base_qs.filter(lecturer_filter).distinct()
-
-        courses = courses.annotate(total_questions=Count("questions", distinct=True))
-        selected_map = dict(
-            CourseQuestionSelected.objects
-            .filter(exam=exam, master_id__in=courses.values_list("id", flat=True))
-            .values_list("master_id")
-            .annotate(n=Count("id"))
-            .values_list("master_id", "n")
-        )
-
-        selected_total, required_total = 0, 0
-        for c in courses:
-            c.selected_count = int(selected_map.get(c.id, 0))
-            c.required = int(getattr(c, "question_set", 0) or 0)
-            c.remaining = max(c.required - c.selected_count, 0)
-            c.over = max(c.selected_count - c.required, 0)
-            if c.selected_count == c.required:
-                c.status = "ok"
-            elif c.selected_count < c.required:
-                c.status = "less"
-            else:
-                c.status = "more"
-            selected_total += c.selected_count
-            required_total += c.required
-
-        ctx["courses"] = courses
-        ctx["course_count"] = courses.count()
+        ctx["course_count"] = totals["n"]
         ctx["showing_all_courses"] = show_all
         ctx["selected_total"] = selected_total
         ctx["required_total"] = required_total
@@ -184,8 +217,19 @@ class ExamSetupDetailView(LoginRequiredMixin, DetailView):
         exam_upcoming = self._is_upcoming_exam(exam)
         ctx["exam_upcoming"] = exam_upcoming
         ctx["can_edit_qset"] = show_all and exam_upcoming
+        # first page server-rendered; DataTables fetches the rest from get()
+        ctx["datatable_rows"] = EXAM_COURSE_TABLE.rows(
+            courses[:EXAM_COURSE_TABLE.page_length], {"exam": exam, "can_edit_qset": ctx["can_edit_qset"]})
         return ctx
 
+    def get(self, request, *args, **kwargs):
+        if not is_datatables_request(request):
+            return super().get(request, *args, **kwargs)
+        exam = self.object = self.get_object()
+        show_all = request.user.is_superuser or self._is_exam_chair(request.user, exam)
+        ctx = {"exam": exam, "can_edit_qset": show_all and self._is_upcoming_exam(exam)}
+        return EXAM_COURSE_TABLE.response(request, exam_course_queryset(exam, request.user, show_all), ctx)
+
     def post(self, request, *args, **kwargs):
         self.object = self.get_object()
         exam = self.object
@@ -234,6 +278,173 @@ class ExamSetupDetailView(LoginRequiredMixin, DetailView):
 
         return redirect(reverse("qbank:examsetup_detail", args=[exam.pk]))
 
+class ExamAssemblyView(LoginRequiredMixin, ExamAccessMixin, DetailView):
+    """
+    Fill every course of the exam automatically (qbank.assembly).
+    GET with ?preview=1 shows a dry run; POST applies the same parameters,
+    so the seed shown in the preview is the exam that gets written.
+    """
+    model = ExamSetup
+    template_name = "qbank/examsetup_assemble.html"
+    context_object_name = "exam"
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        exam = self.get_object()
+        if not self._can_manage_exam(request.user, exam):
+            messages.error(request, "Bu işlem için yetkiniz yok.")
+            return redirect(reverse("qbank:examsetup_detail", args=[exam.pk]))
+        if not self._is_upcoming_exam(exam):
+            messages.error(request, "Sınav yaklaşmıyor veya kilitli. Değişiklik yapılamaz.")
+            return redirect(reverse("qbank:examsetup_detail", args=[exam.pk]))
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        form = kwargs.get("form") or ExamAssemblyForm(self.request.GET if "preview" in self.request.GET else None)
+        ctx["form"] = form
+        if form.is_bound and form.is_valid():
+            ctx["preview"] = assemble_exam(self.object, dry_run=True, **form.cleaned_data)
+        return ctx
+
+    def post(self, request, *args, **kwargs):
+        exam = self.object = self.get_object()
+        form = ExamAssemblyForm(request.POST)
+        if not form.is_valid():
+            return self.render_to_response(self.get_context_data(form=form))
+        result = assemble_exam(exam, **form.cleaned_data)
+        msg = (f"Otomatik seçim (tohum {result.seed}): {result.added} soru eklendi, "
+               f"{result.removed} soru kaldırıldı.")
+        if result.shortfall:
+            messages.warning(request, msg + f" {result.shortfall} soru için yeterli aday bulunamadı.")
+        else:
+            messages.success(request, msg)
+        return redirect(reverse("qbank:examsetup_detail", args=[exam.pk]))
+
+class ExamBookletView(LoginRequiredMixin, ExamAccessMixin, DetailView):
+    """
+    Printed booklets (qbank.booklets): POST replaces the exam's variants,
+    the page lists them with their keys, and GET with ?download=1 streams
+    the booklet and answer key DOCX files as one ZIP (one worker process
+    per booklet) as long as the booklets still match the exam. Once the
+    exam is scored the booklets are frozen and stay downloadable (the
+    page warns when questions were edited since).
+    """
+    model = ExamSetup
+    template_name = "qbank/examsetup_booklets.html"
+    context_object_name = "exam"
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        exam = self.get_object()
+        if not self._can_manage_exam(request.user, exam):
+            messages.error(request, "Bu işlem için yetkiniz yok.")
+            return redirect(reverse("qbank:examsetup_detail", args=[exam.pk]))
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        variants = list(self.object.variants.all())
+        ctx["form"] = kwargs.get("form") or ExamBookletForm()
+        ctx["variants"] = variants
+        ctx["variants_outdated"] = variants_outdated(self.object, variants)
+        ctx["has_results"] = self.object.results.exists()
+        return ctx
+
+    def get(self, request, *args, **kwargs):
+        if "download" not in request.GET:
+            return super().get(request, *args, **kwargs)
+        exam = self.object = self.get_object()
+        variants = list(exam.variants.all())
+        if not variants:
+            messages.error(request, "Önce kitapçıkları oluşturun.")
+            return redirect(reverse("qbank:examsetup_booklets", args=[exam.pk]))
+        if not exam.results.exists() and variants_outdated(exam, variants):
+            # the DOCX is built from the current questions but the key is frozen;
+            # after scoring it cannot be regenerated, so the frozen one is served
+            messages.error(request, "Kitapçıklar güncel değil; indirmeden önce yeniden oluşturun.")
+            return redirect(reverse("qbank:examsetup_booklets", args=[exam.pk]))
+        resp = StreamingHttpResponse(iter_booklet_zip(variants), content_type="application/zip")
+        resp["Content-Disposition"] = f'attachment; filename="exam_{exam.pk}_kitapciklar.zip"'
+        return resp
+
+    def post(self, request, *args, **kwargs):
+        exam = self.object = self.get_object()
+        if exam.locked or exam.results.exists():
+            messages.error(request, "Sınav kilitli ya da puanlanmış; kitapçıklar yeniden oluşturulamaz.")
+            return redirect(reverse("qbank:examsetup_booklets", args=[exam.pk]))
+        form = ExamBookletForm(request.POST)
+        if not form.is_valid():
+            return self.render_to_response(self.get_context_data(form=form))
+        plan = plan_variants(exam, **form.cleaned_data)
+        msg = (f"{len(plan.variants)} kitapçık oluşturuldu (tohum {plan.seed}), "
+               f"her birinde {plan.question_count} soru.")
+        if plan.skipped:
+            messages.warning(request, msg + f" {len(plan.skipped)} soru metni ya da doğru cevabı eksik olduğu için alınmadı.")
+        else:
+            messages.success(request, msg)
+        return redirect(reverse("qbank:examsetup_booklets", args=[exam.pk]))
+
+class ExamScoringView(LoginRequiredMixin, ExamAccessMixin, DetailView):
+    """
+    Optical answer sheet scoring (qbank.scoring): POST scores an uploaded
+    CSV / fixed-width file against the exam's booklets and replaces the
+    results; GET lists them, ?download=1 streams them as CSV.
+    """
+    model = ExamSetup
+    template_name = "qbank/examsetup_scoring.html"
+    context_object_name = "exam"
+    paginate_by = 100
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        exam = self.get_object()
+        if not self._can_manage_exam(request.user, exam):
+            messages.error(request, "Bu işlem için yetkiniz yok.")
+            return redirect(reverse("qbank:examsetup_detail", args=[exam.pk]))
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        results = self.object.results.all()
+        ctx["form"] = kwargs.get("form") or ExamScoringForm()
+        ctx["has_variants"] = self.object.variants.exists()
+        ctx["summary"] = result_summary(results)
+        ctx["page_obj"] = Paginator(results, self.paginate_by).get_page(self.request.GET.get("page"))
+        return ctx
+
+    def get(self, request, *args, **kwargs):
+        if "download" not in request.GET:
+            return super().get(request, *args, **kwargs)
+        exam = self.object = self.get_object()
+        resp = StreamingHttpResponse(iter_results_csv(exam.results.all()), content_type="text/csv; charset=utf-8")
+        resp["Content-Disposition"] = f'attachment; filename="exam_{exam.pk}_sonuclar.csv"'
+        return resp
+
+    def post(self, request, *args, **kwargs):
+        exam = self.object = self.get_object()
+        form = ExamScoringForm(request.POST, request.FILES)
+        if not form.is_valid():
+            return self.render_to_response(self.get_context_data(form=form))
+        try:
+            result = score_exam(exam, iter_sheets(form.cleaned_data["format"], form.cleaned_data["file"],
+                                                  form.layout()))
+        except (ValueError, UnicodeDecodeError, csv.Error) as exc:
+            form.add_error("file", f"Dosya okunamadı: {exc}")
+            return self.render_to_response(self.get_context_data(form=form))
+
+        if result.scored:
+            rule = "yanlış cezası uygulandı" if result.penalty_applied else "yanlış cezası uygulanmadı"
+            messages.success(request, f"{result.scored} öğrenci puanlandı ({rule}); ortalama {result.mean}.")
+        else:
+            messages.error(request, "Dosyada puanlanabilecek cevap kağıdı yok; mevcut sonuçlar korundu.")
+        if result.skipped:
+            messages.warning(request, f"{result.skipped} satır atlandı: " + "; ".join(result.problems[:10]))
+        return redirect(reverse("qbank:examsetup_scoring", args=[exam.pk]))
+
 @require_POST
 def examsetup_delete(request, pk: int):
     obj = get_object_or_404(ExamSetup, pk=pk)
@@ -276,141 +487,52 @@ class ExamSetupDetailQuestionListView(LoginRequiredMixin, DetailView):
         return ctx
 
 @login_required
-def export_exam_to_moodle_xml_light(request, pk: int):
+def export_exam(request, pk: int, fmt: str):
     """
-    Committee-only Moodle XML export for the light app.
-    Exports all selected MCQs for this ExamSetup into a <quiz> XML.
+    Seçili soruları kayıtlı herhangi bir formatta dışa aktarır
+    (moodle_xml, aiken, gift, qti21).
+    - Süperuser/staff: tüm seçili sorular
+    - Diğer kullanıcı: yalnızca kendi (lecturer=user) soruları
+    Tüm formatlar aynı satır kaynağından akıtılır ve dışa aktarma
+    önbelleğinden (304 / diskten) sunulur.
     """
+    try:
+        exporter = get_exporter(fmt)
+    except KeyError:
+        raise Http404("Bilinmeyen dışa aktarma formatı.")
     exam = get_object_or_404(ExamSetup, pk=pk)
+    return cached_export_response(request, exam, exporter)
 
-    if request.user.is_superuser or request.user.is_staff:
-        selected = (CourseQuestionSelected.objects
-                    .filter(exam=exam)
-                    .select_related("question", "master"))
-    else:
-        selected = (CourseQuestionSelected.objects
-                    .filter(exam=exam, question__lecturer__user=request.user)
-                    .select_related("question", "master"))
-
-    quiz = ET.Element("quiz")
-    cdata_replacements = []
-
-    for sel in selected:
-        q = sel.question
-        q_elem = ET.SubElement(quiz, "question", type="multichoice")
-
-        name_elem = ET.SubElement(q_elem, "name")
-        ET.SubElement(name_elem, "text").text = q.name or f"Q{q.pk}"
-
-        qt_elem = ET.SubElement(q_elem, "questiontext", format="html")
-        qt_text = ET.SubElement(qt_elem, "text")
-
-        placeholder = f"__QTEXT_PLACEHOLDER_{q.id}__"
-        qt_text.text = placeholder
-
-        stem_html = f"<p>{escape((q.question_text or '').strip())}</p>"
-
-        try:
-            pictures_rel = getattr(q, "pictures", None) or getattr(q, "picture_set", None)
-            pict_q = pictures_rel.filter(image_type="Q").first() if pictures_rel else None
-            if pict_q and pict_q.image and hasattr(pict_q.image, "path"):
-                filename = os.path.basename(pict_q.image.name)
-                stem_html = f'<p><img src="@@PLUGINFILE@@/{filename}" /></p>' + stem_html
-
-                file_elem = ET.SubElement(qt_elem, "file", name=filename, encoding="base64")
-                with open(pict_q.image.path, "rb") as fh:
-                    file_elem.text = base64.b64encode(fh.read()).decode("utf-8")
-        except Exception:
-            pass
-
-        cdata_replacements.append(
-            (f"<text>{placeholder}</text>", f"<text><![CDATA[{stem_html}]]></text>")
-        )
-
-        choices = [
-            ("A", q.answer_1_text),
-            ("B", q.answer_2_text),
-            ("C", q.answer_3_text),
-            ("D", q.answer_4_text),
-            ("E", q.answer_5_text),
-        ]
-        for label, text in choices:
-            if not text:
-                continue
-            fraction = "100" if (getattr(q, "correct_answer", None) == label) else "0"
-            ans = ET.SubElement(q_elem, "answer", fraction=fraction)
-            ET.SubElement(ans, "text").text = escape(text.strip())
-            ET.SubElement(ans, "feedback").text = ""  
-
-    if hasattr(ET, "indent"):
-        ET.indent(quiz, space="  ")
-
-    xml_str = ET.tostring(quiz, encoding="unicode")
-    for ph, cdata in cdata_replacements:
-        xml_str = xml_str.replace(ph, cdata)
+def export_exam_to_moodle_xml_light(request, pk: int):
+    """Committee-only Moodle XML export for the light app."""
+    return export_exam(request, pk, "moodle_xml")
 
-    resp = HttpResponse(xml_str, content_type="application/xml")
-    resp["Content-Disposition"] = f'attachment; filename="exam_{pk}_moodle.xml"'
-    return resp
+def export_exam_to_aiken_light(request, pk: int):
+    """Light sürüm için Aiken formatında dışa aktarma. Aiken görsel taşımaz."""
+    return export_exam(request, pk, "aiken")
 
-def _clean_line(s: str) -> str:
-    """Aiken sade metin çıktısı için tek satıra indir, boşlukları toparla."""
-    if not s:
-        return ""
-    s = re.sub(r'\s+', ' ', str(s)).strip()
-    return s
+def _is_staff(user):
+    return user.is_superuser or user.is_staff
 
 @login_required
-def export_exam_to_aiken_light(request, pk: int):
+@user_passes_test(_is_staff)
+def export_exams_bulk_zip(request):
     """
-    Light sürüm için Aiken formatında dışa aktarma.
-    - Süperuser/staff: tüm seçili sorular
-    - Diğer kullanıcı: yalnızca kendi (lecturer=user) soruları
-    Not: Aiken görsele dosya eklemeyi desteklemez.
+    Toplu dışa aktarma: filtreye uyan tüm sınavların dosyaları tek bir ZIP
+    olarak akıtılır (program, committee, date_from, date_to, type;
+    formats=moodle_xml,aiken,gift,qti21).
     """
-    exam = get_object_or_404(ExamSetup, pk=pk)
-
-    if request.user.is_superuser or request.user.is_staff:
-        selected_qs = (CourseQuestionSelected.objects
-                       .filter(exam=exam)
-                       .select_related("question", "question__master", "question__lecturer__user"))
-    else:
-        selected_qs = (CourseQuestionSelected.objects
-                       .filter(exam=exam, question__lecturer__user=request.user)
-                       .select_related("question", "question__master", "question__lecturer__user"))
-
-    lines = []
-    for sel in selected_qs:
-        q = sel.question
-        qtext = _clean_line(q.question_text)
-        if not qtext:
-            continue
-        lines.append(qtext)
-
-        options = [
-            ("A", _clean_line(q.answer_1_text)),
-            ("B", _clean_line(q.answer_2_text)),
-            ("C", _clean_line(q.answer_3_text)),
-            ("D", _clean_line(q.answer_4_text)),
-            ("E", _clean_line(q.answer_5_text)),
-        ]
-        for label, text in options:
-            if text:
-                lines.append(f"{label}. {text}")
-
-        correct = (q.correct_answer or "").strip().upper()[:1]
-        if correct not in ("A", "B", "C", "D", "E"):
-            while lines and lines[-1] != qtext:
-                lines.pop()
-            lines.pop()  
-            continue
-
-        lines.append(f"ANSWER: {correct}")
-
-        lines.append("")
-
-    content = "\n".join(lines).rstrip() + "\n"
-
-    resp = HttpResponse(content, content_type="text/plain; charset=utf-8")
-    resp["Content-Disposition"] = f'attachment; filename="exam_{pk}_aiken.txt"'
+    formats = [f for f in (request.GET.get("formats") or "moodle_xml,aiken").split(",") if f]
+    if not formats or set(formats) - set(EXPORTERS):
+        return HttpResponseBadRequest("Unsupported export format")
+
+    try:
+        filters = parse_exam_filters(request.GET)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    exams = filter_exams(ExamSetup.objects.all(), **filters)
+    exam_ids = list(exams.order_by("date", "id").values_list("id", flat=True))
+
+    resp = StreamingHttpResponse(iter_bulk_zip(exam_ids, formats), content_type="application/zip")
+    resp["Content-Disposition"] = f'attachment; filename="exams_{timezone.now():%Y%m%d_%H%M}.zip"'
     return resp
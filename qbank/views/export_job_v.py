@@ -0,0 +1,74 @@
+import os
+
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_POST
+
+from faculty.models import Committee
+from ..models import ExamSetup, ExportJob
+from ..exports.jobs import JOB_KINDS, enqueue_export
+
+
+def _job_payload(job: ExportJob) -> dict:
+    data = {
+        "id": job.pk,
+        "kind": job.kind,
+        "label": JOB_KINDS[job.kind].label if job.kind in JOB_KINDS else job.kind,
+        "status": job.status,
+        "progress": job.progress,
+        "total": job.total,
+        "percent": job.percent,
+        "error": job.error,
+        "status_url": reverse("qbank:export_job_status", args=[job.pk]),
+    }
+    if job.status == ExportJob.STATUS_DONE:
+        data["download_url"] = reverse("qbank:export_job_download", args=[job.pk])
+    return data
+
+
+def _get_own_job(request, job_id: int) -> ExportJob:
+    job = get_object_or_404(ExportJob, pk=job_id)
+    if not (request.user.is_superuser or job.requested_by_id == request.user.id):
+        raise Http404
+    return job
+
+
+@login_required
+@require_POST
+def export_job_start(request, kind: str, pk: int = None, committee_id: int = None):
+    """
+    Queue an export for the background worker and return its status URL.
+    Exam kinds are scoped by the requesting user like the direct downloads.
+    """
+    spec = JOB_KINDS.get(kind)
+    if spec is None:
+        return JsonResponse({"ok": False, "error": "Bilinmeyen dışa aktarma türü."}, status=400)
+
+    if spec.target == "exam":
+        if pk is None:
+            return JsonResponse({"ok": False, "error": "Sınav belirtilmedi."}, status=400)
+        job = enqueue_export(kind, request.user, exam=get_object_or_404(ExamSetup, pk=pk))
+    else:
+        if committee_id is None:
+            return JsonResponse({"ok": False, "error": "Kurul belirtilmedi."}, status=400)
+        params = {k: request.POST[k] for k in ("start", "end") if request.POST.get(k)}
+        job = enqueue_export(kind, request.user,
+                             committee=get_object_or_404(Committee, pk=committee_id), params=params)
+
+    return JsonResponse({"ok": True, **_job_payload(job)}, status=202)
+
+
+@login_required
+def export_job_status(request, job_id: int):
+    return JsonResponse(_job_payload(_get_own_job(request, job_id)))
+
+
+@login_required
+def export_job_download(request, job_id: int):
+    job = _get_own_job(request, job_id)
+    if job.status != ExportJob.STATUS_DONE or not os.path.exists(job.file_path):
+        raise Http404("Dosya henüz hazır değil.")
+    return FileResponse(open(job.file_path, "rb"), as_attachment=True,
+                        filename=job.filename, content_type=JOB_KINDS[job.kind].content_type)
@@ -32,3 +32,26 @@ def can_manage_course_questions(user, course, exam) -> bool:
         return True
 
     return False
+
+
+def can_add_course_questions(user, course) -> bool:
+    """
+    Derse soru ekleyebilir mi? (tek tek veya toplu içe aktarma)
+      - superuser
+      - dersin öğretim elemanı
+      - dersin bağlı olduğu kurulun başkanı
+    """
+    if not user.is_authenticated:
+        return False
+    if user.is_superuser:
+        return True
+
+    try:
+        fct = user.facultyprofile
+    except ObjectDoesNotExist:
+        return False
+
+    if getattr(course, "lecturer_id", None) == fct.id:
+        return True
+    cmt = getattr(course, "committee", None)
+    return bool(cmt and cmt.chair_id == fct.id)
@@ -0,0 +1,264 @@
+"""
+JSON data for the question selection page.
+
+The page itself only renders the shell; candidate rows come from
+course_candidate_questions (paginated, filtered on the server) and the
+stem/answers of a single question from course_question_answers when the
+user expands it. exam_selection reads and saves the selection of every
+course of an exam in one request.
+"""
+import json
+
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_http_methods
+from django.utils import timezone
+from django.utils.formats import date_format
+
+from faculty.text import fold_tr
+from ..models import CourseMaster, CourseQuestionDepot, CourseQuestionSelected, ExamSetup
+from ..exports.rows import ANSWER_LETTERS
+from ..exposure import academic_year, filter_usage, order_by_exposure
+from ..selection import (
+    SelectionConflict, apply_selection, current_selection, exam_open_for_selection, selection_versions,
+)
+from .permissions_v import can_manage_course_questions
+
+CANDIDATES_PER_PAGE = 50
+CANDIDATES_MAX_PER_PAGE = 200
+
+TYPE_LABELS = dict(CourseQuestionDepot.QUESTION_TYPES)
+# ?sort= values besides the default (name)
+EXPOSURE_SORTS = {
+    "use_count": ("use_count", False),
+    "-use_count": ("use_count", True),
+    "last_used": ("last_used_at", False),
+    "-last_used": ("last_used_at", True),
+}
+
+
+def _course_and_exam(request, pk, exam_id):
+    """(course, exam, None) or (None, None, error response)."""
+    course = get_object_or_404(CourseMaster, pk=pk)
+    exam = get_object_or_404(ExamSetup, pk=exam_id)
+    if not can_manage_course_questions(request.user, course, exam):
+        return None, None, JsonResponse({"ok": False, "error": "Yetkiniz yok."}, status=403)
+    return course, exam, None
+
+
+def _status(row) -> str:
+    if row["hidden"]:
+        return "hidden"
+    return "active" if row["active"] else "inactive"
+
+
+def filter_candidates(qs, params, selected_ids):
+    """Apply the page's filters (q, type, status, selected, usage) to a question queryset."""
+    q = (params.get("q") or "").strip()
+    if q:
+        # indexed prefix lookups, as in search_courses ("isik" finds "IŞIK")
+        f = fold_tr(q)
+        qs = qs.filter(
+            Q(name_norm__startswith=f) |
+            Q(lecturer__name_norm__startswith=f) |
+            Q(lecturer__last_name_norm__startswith=f)
+        )
+    qtype = params.get("type")
+    if qtype:
+        qs = qs.filter(type=qtype)
+    status = params.get("status")
+    if status == "active":
+        qs = qs.filter(active=True, hidden=False)
+    elif status == "inactive":
+        qs = qs.filter(active=False, hidden=False)
+    elif status == "hidden":
+        qs = qs.filter(hidden=True)
+    selected = params.get("selected")
+    if selected == "1":
+        qs = qs.filter(id__in=selected_ids)
+    elif selected == "0":
+        qs = qs.exclude(id__in=selected_ids)
+    return filter_usage(qs, params.get("usage"))
+
+
+@login_required
+def course_candidate_questions(request, pk: int, exam_id: int):
+    """
+    One page of a course's questions for the selection table.
+    ?ids=1 returns only the ids matching the filter ("tümünü işaretle").
+    """
+    course, exam, error = _course_and_exam(request, pk, exam_id)
+    if error:
+        return error
+
+    selected_ids = set(
+        CourseQuestionSelected.objects
+        .filter(exam=exam, master=course)
+        .values_list("question_id", flat=True)
+    )
+    qs = filter_candidates(
+        CourseQuestionDepot.objects.filter(master=course).order_by("name", "id"),
+        request.GET, selected_ids,
+    )
+
+    if request.GET.get("ids") == "1":
+        return JsonResponse({"ok": True, "ids": list(qs.values_list("id", flat=True))})
+    sort = EXPOSURE_SORTS.get(request.GET.get("sort"))
+    if sort:
+        qs = order_by_exposure(qs, *sort)
+
+    try:
+        per_page = min(max(int(request.GET.get("per_page") or CANDIDATES_PER_PAGE), 1), CANDIDATES_MAX_PER_PAGE)
+    except ValueError:
+        per_page = CANDIDATES_PER_PAGE
+    rows = qs.values(
+        "id", "name", "type", "active", "hidden",
+        "lecturer__user__first_name", "lecturer__user__last_name",
+        "exposure__use_count", "exposure__last_used_at", "exposure__last_exam__name", "exposure__year_counts",
+    )
+    page = Paginator(rows, per_page).get_page(request.GET.get("page"))
+
+    this_year = academic_year(timezone.now())
+    results = [{
+        "id": r["id"],
+        "name": r["name"],
+        "lecturer": f'{r["lecturer__user__first_name"] or ""} {r["lecturer__user__last_name"] or ""}'.strip(),
+        "type": r["type"],
+        "type_display": TYPE_LABELS.get(r["type"], r["type"]),
+        "status": _status(r),
+        "selected": r["id"] in selected_ids,
+        "use_count": r["exposure__use_count"] or 0,
+        "year_count": (r["exposure__year_counts"] or {}).get(this_year, 0),
+        "last_used": (date_format(timezone.localtime(r["exposure__last_used_at"]), "d.m.Y")
+                      if r["exposure__last_used_at"] else ""),
+        "last_exam": r["exposure__last_exam__name"] or "",
+    } for r in page.object_list]
+
+    return JsonResponse({
+        "ok": True,
+        "results": results,
+        "count": page.paginator.count,
+        "page": page.number,
+        "num_pages": page.paginator.num_pages,
+        "selected_count": len(selected_ids),
+        "required": int(course.question_set or 0),
+    })
+
+
+@login_required
+def course_question_answers(request, pk: int, exam_id: int, qid: int):
+    """Stem, answers and feedback of one question, loaded when its row is opened."""
+    course, exam, error = _course_and_exam(request, pk, exam_id)
+    if error:
+        return error
+    q = get_object_or_404(CourseQuestionDepot, pk=qid, master=course)
+
+    answers = []
+    for i, letter in enumerate(ANSWER_LETTERS, start=1):
+        text = getattr(q, f"answer_{i}_text") or ""
+        if not text:
+            continue
+        answers.append({
+            "letter": letter,
+            "text": text,
+            "correct": (getattr(q, f"answer_{i}_fraction") or 0) > 0,
+        })
+    return JsonResponse({
+        "ok": True,
+        "id": q.id,
+        "question_text": q.question_text or "",
+        "answers": answers,
+        "general_feedback": q.general_feedback or "",
+    })
+
+
+def _parse_selection(body: bytes, course_ids):
+    """
+    {"courses": {"<course id>": [question ids]}, "versions": {"<course id>": n}}
+    -> ({course_id: [int]}, {course_id: int}); ValueError if malformed.
+    """
+    data = json.loads(body or b"{}")
+    courses = data.get("courses") if isinstance(data, dict) else None
+    if not isinstance(courses, dict):
+        raise ValueError("'courses' nesnesi bekleniyor.")
+    desired = {}
+    for key, ids in courses.items():
+        course_id = int(key)
+        if course_id not in course_ids:
+            raise ValueError(f"{course_id} bu sınavın kuruluna ait bir ders değil.")
+        if not isinstance(ids, list):
+            raise ValueError(f"{course_id}: soru listesi bekleniyor.")
+        desired[course_id] = [int(qid) for qid in ids]
+    versions = data.get("versions") or {}
+    if not isinstance(versions, dict):
+        raise ValueError("'versions' nesnesi bekleniyor.")
+    return desired, {int(k): int(v) for k, v in versions.items()}
+
+
+@login_required
+@require_http_methods(["GET", "POST"])
+def exam_selection(request, exam_id: int):
+    """
+    Selection of all courses of an exam the user may manage.
+    GET returns {courses: [{id, name, required, selected, version}]}; POST
+    takes {"courses": {"<course id>": [question ids], ...}} (the full desired
+    set of each listed course; unlisted courses are untouched) and saves the
+    combined diff in one transaction. With "versions" ({"<course id>":
+    version from GET}) a course changed by someone else in the meantime
+    makes the whole request fail with 409 and the current versions, so the
+    client can reload those courses and retry.
+    """
+    exam = get_object_or_404(ExamSetup.objects.select_related("committee"), pk=exam_id)
+    committee_courses = list(CourseMaster.objects
+                             .filter(committee_id=exam.committee_id)
+                             .only("id", "name", "question_set", "lecturer_id")
+                             .order_by("name", "id"))
+    courses = [c for c in committee_courses if can_manage_course_questions(request.user, c, exam)]
+    if not courses:
+        return JsonResponse({"ok": False, "error": "Yetkiniz yok."}, status=403)
+    by_id = {c.pk: c for c in courses}
+
+    if request.method == "GET":
+        current = current_selection(exam, list(by_id))
+        versions = selection_versions(exam, list(by_id))
+        return JsonResponse({
+            "ok": True,
+            "open": exam_open_for_selection(exam),
+            "courses": [{
+                "id": c.pk,
+                "name": c.name,
+                "required": int(c.question_set or 0),
+                "selected": sorted(current[c.pk]),
+                "version": versions[c.pk],
+            } for c in courses],
+        })
+
+    if not exam_open_for_selection(exam):
+        return JsonResponse({"ok": False, "error": "Bu sınav için seçimler kapalı (kilitli ya da tarihi geçmiş)."},
+                            status=409)
+    try:
+        desired, versions = _parse_selection(request.body, {c.pk for c in committee_courses})
+    except (ValueError, TypeError) as exc:
+        return JsonResponse({"ok": False, "error": str(exc) or "Geçersiz istek."}, status=400)
+    if set(desired) - set(by_id):
+        return JsonResponse({"ok": False, "error": "Bu derslerin seçimini değiştirme yetkiniz yok."}, status=403)
+
+    try:
+        plan = apply_selection(exam, desired, courses=[by_id[pk] for pk in desired], versions=versions)
+    except SelectionConflict as exc:
+        return JsonResponse({
+            "ok": False,
+            "conflict": True,
+            "error": str(exc),
+            "versions": {str(pk): v for pk, v in exc.versions.items()},
+        }, status=409)
+    return JsonResponse({
+        "ok": True,
+        "added": plan.added,
+        "removed": plan.removed,
+        "blocked": plan.blocked,
+        "courses": [c.as_dict() for c in plan.courses],
+    })
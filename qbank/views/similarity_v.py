@@ -0,0 +1,37 @@
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponseForbidden
+from django.shortcuts import get_object_or_404, render
+
+from faculty.models import Committee
+from ..similarity import SIMILARITY_THRESHOLD, committee_duplicate_report
+
+
+def _can_view_committee_report(user, committee) -> bool:
+    if user.is_superuser:
+        return True
+    try:
+        return committee.chair_id == user.facultyprofile.id
+    except ObjectDoesNotExist:
+        return False
+
+
+@login_required
+def committee_duplicates(request, committee_id: int):
+    """Near-duplicate question pairs across all courses of a committee (chair/superuser)."""
+    committee = get_object_or_404(Committee, pk=committee_id)
+    if not _can_view_committee_report(request.user, committee):
+        return HttpResponseForbidden("Bu rapor için yetkiniz yok.")
+
+    try:
+        threshold = min(max(float(request.GET.get("threshold", SIMILARITY_THRESHOLD)), 0.3), 1.0)
+    except ValueError:
+        threshold = SIMILARITY_THRESHOLD
+    pairs, total, same_exam_count = committee_duplicate_report(committee, threshold)
+    return render(request, "qbank/committee_duplicates.html", {
+        "committee": committee,
+        "pairs": pairs,
+        "pair_count": total,
+        "threshold": threshold,
+        "same_exam_count": same_exam_count,
+    })